@@ -0,0 +1,43 @@
+"""
+Compares FeeCounter.calculate_seller_price called in a loop with
+FeeCounter.calculate_seller_prices and FeeTable lookups on the same array
+of buyer prices.
+
+Run from the repository root: python -m benchmarks.fee_counter
+"""
+import time
+
+import numpy as np
+
+from steamcom.fee_counter import FeeCounter, get_fee_table
+
+
+def measure(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    fee_counter = FeeCounter(market_minimum=79)
+    build_time = measure(get_fee_table, fee_counter)
+    fee_table = get_fee_table(fee_counter)
+    print(f'FeeTable for 1000000 totals built in {build_time * 1000:.0f} ms')
+    rng = np.random.default_rng(0)
+    for size in (1_000, 10_000, 100_000, 500_000):
+        prices = np.round(rng.uniform(0.5, 5000, size), 2)
+        price_list = prices.tolist()
+        scalar = measure(lambda: [fee_counter.calculate_seller_price(price)
+                                  for price in price_list])
+        batch = measure(fee_counter.calculate_seller_prices, prices)
+        table = measure(fee_table.calculate_seller_prices, prices)
+        table_loop = measure(lambda: [fee_table.calculate_seller_price(price)
+                                      for price in price_list])
+        print(f'{size:>7} prices: loop {scalar * 1000:9.1f} ms, '
+              f'numpy {batch * 1000:7.1f} ms, '
+              f'table {table * 1000:6.1f} ms, '
+              f'table loop {table_loop * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
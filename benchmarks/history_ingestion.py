@@ -0,0 +1,101 @@
+"""
+Measures how SteamMarket.get_my_history scales with the number of events.
+Pages are generated locally, every page repeats the last events of the
+previous one, like Steam does when new events arrive during the download.
+
+Run from the repository root: python -m benchmarks.history_ingestion
+"""
+import contextlib
+import io
+import time
+
+from steamcom.market import SteamMarket
+from steamcom.utils import get_history_event_key
+
+
+PAGE_SIZE = 500
+OVERLAP = 20
+
+
+def make_event(i: int) -> dict:
+    return {
+        'listingid': str(5152706284695898110 + i),
+        'purchaseid': str(5152706284695898111 + i),
+        'event_type': 3,
+        'time_event': 1665657537 - i,
+        'time_event_fraction': 310000000,
+        'steamid_actor': '76561199216758062',
+        'date_event': '13 Oct',
+        'price': 1.5,
+        'currency_id': '2005',
+        'asset': {'id': str(25979127616 + i), 'appid': 730}
+    }
+
+
+class LocalHistoryMarket(SteamMarket):
+
+    def __init__(self, events_value: int) -> None:
+        super().__init__()
+        self.events = [make_event(i) for i in range(events_value)]
+
+    def _get_market_history_page(self, start: int = 0,
+                                 count: int = PAGE_SIZE) -> list:
+        begin = max(0, start - OVERLAP)
+        return [dict(event) for event in self.events[begin:start + count]]
+
+
+def ingest(events_value: int) -> float:
+    market = LocalHistoryMarket(events_value)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        history = market.get_my_history(events_value, delay=0)
+    elapsed = time.perf_counter() - started
+    assert len(history) == events_value
+    return elapsed
+
+
+def ingest_with_list_scan(events_value: int) -> float:
+    """The previous implementation: `if event not in history`"""
+    market = LocalHistoryMarket(events_value)
+    started = time.perf_counter()
+    history = []
+    for start in range(0, events_value, PAGE_SIZE):
+        for event in market._get_market_history_page(start):
+            if event not in history:
+                history.append(event)
+    elapsed = time.perf_counter() - started
+    assert len(history) == events_value
+    return elapsed
+
+
+def ingest_with_index(events_value: int) -> float:
+    market = LocalHistoryMarket(events_value)
+    started = time.perf_counter()
+    history = []
+    history_keys = set()
+    for start in range(0, events_value, PAGE_SIZE):
+        for event in market._get_market_history_page(start):
+            event_key = get_history_event_key(event)
+            if event_key not in history_keys:
+                history_keys.add(event_key)
+                history.append(event)
+    elapsed = time.perf_counter() - started
+    assert len(history) == events_value
+    return elapsed
+
+
+def main() -> None:
+    print('get_my_history, events -> seconds (us per event)')
+    for events_value in (12_500, 25_000, 50_000, 100_000, 200_000):
+        elapsed = ingest(events_value)
+        per_event = elapsed / events_value * 1_000_000
+        print(f'{events_value:>8} -> {elapsed:.3f} s ({per_event:.2f} us)')
+    print('dedupe only, events -> list scan / index seconds')
+    for events_value in (2_500, 5_000, 10_000):
+        scan = ingest_with_list_scan(events_value)
+        index = ingest_with_index(events_value)
+        print(f'{events_value:>8} -> {scan:.3f} / {index:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Compares memory held by a parsed inventory snapshot: the previous
+copy-per-asset merge against shared descriptions with Asset views.
+30000 identical cases are split into pages of 2500 like Steam returns them.
+
+Run from the repository root: python -m benchmarks.inventory_memory
+"""
+import copy
+import json
+import tracemalloc
+
+from steamcom.models import DescriptionTable
+from steamcom.utils import (get_description_key,
+                            merge_items_with_descriptions_from_inventory)
+
+
+ASSETS_VALUE = 30000
+PAGE_SIZE = 2500
+DESCRIPTION = {
+    'appid': 730,
+    'classid': '3604678661',
+    'instanceid': '0',
+    'currency': 0,
+    'background_color': '',
+    'icon_url': '-9a81dlWLwJ2UUGcVs_nsVtzdOEdtWwKGZZLQHTxDZ7I56KU0Zwwo4NUX4'
+                'oFJZEHLbXH5ApeO4YmlhxYQknCRvCo04DEVlxkKgpot621FAR17PLfYQJD_'
+                '9W7m5a0mvLwOq7c2G4Hu8Qmjb6Xod6h2gDh-0U9YmGhJ9XEdlU3ZF7W8gW'
+                '3k7rq0ZW4tJ_IyHZn7yUrsyLZnRbjlxhOOuE5n',
+    'tradable': 1,
+    'name': 'Snakebite Case',
+    'name_color': 'D2D2D2',
+    'type': 'Base Grade Container',
+    'market_name': 'Snakebite Case',
+    'market_hash_name': 'Snakebite Case',
+    'commodity': 1,
+    'market_tradable_restriction': 7,
+    'market_marketable_restriction': 7,
+    'marketable': 1,
+    'descriptions': [{'type': 'html', 'value': ' '}],
+    'tags': [
+        {'category': 'Type', 'internal_name': 'CSGO_Type_WeaponCase',
+         'localized_category_name': 'Type',
+         'localized_tag_name': 'Container'},
+        {'category': 'Rarity', 'internal_name': 'Rarity_Common',
+         'localized_category_name': 'Quality',
+         'localized_tag_name': 'Base Grade', 'color': 'b0c3d9'}
+    ]
+}
+
+
+def make_pages() -> list:
+    pages = []
+    for start in range(0, ASSETS_VALUE, PAGE_SIZE):
+        assets = [{'appid': 730, 'contextid': '2',
+                   'assetid': str(30000000000 + i),
+                   'classid': '3604678661', 'instanceid': '0',
+                   'amount': '1'}
+                  for i in range(start, start + PAGE_SIZE)]
+        pages.append(json.dumps({'assets': assets,
+                                 'descriptions': [DESCRIPTION],
+                                 'total_inventory_count': ASSETS_VALUE,
+                                 'success': 1}))
+    return pages
+
+
+def merge_with_copies(response: dict, context_id: str) -> dict:
+    """The previous utils.merge_items behaviour"""
+    descriptions = {get_description_key(description): description
+                    for description in response['descriptions']}
+    merged_items = {}
+    for item in response['assets']:
+        description = copy.copy(descriptions[get_description_key(item)])
+        item_id = item['assetid']
+        description['contextid'] = item.get('contextid') or context_id
+        description['id'] = item_id
+        description['amount'] = item['amount']
+        merged_items[item_id] = description
+    return merged_items
+
+
+def measure(pages: list, shared: bool) -> int:
+    tracemalloc.start()
+    inventory = {}
+    description_table = DescriptionTable()
+    for page in pages:
+        response = json.loads(page)
+        if shared:
+            assets = merge_items_with_descriptions_from_inventory(
+                response, '2', description_table)
+        else:
+            assets = merge_with_copies(response, '2')
+        inventory.update(assets)
+        del response
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(inventory) == ASSETS_VALUE
+    return current
+
+
+def main() -> None:
+    pages = make_pages()
+    copied = measure(pages, shared=False)
+    shared = measure(pages, shared=True)
+    print(f'{ASSETS_VALUE} assets, bytes held by the snapshot')
+    print(f'copy per asset:      {copied:>12,}')
+    print(f'shared descriptions: {shared:>12,}')
+    print(f'ratio: {copied / shared:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
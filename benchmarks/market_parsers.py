@@ -0,0 +1,74 @@
+"""
+Compares market page parser backends on a /market page with many
+listings and on a mylistings/render chunk of 100 listings.
+The page is built from tests/fixtures by repeating listing rows.
+
+Run from the repository root: python -m benchmarks.market_parsers
+"""
+import os
+import re
+import time
+
+from steamcom.parsers import BeautifulSoupParser, LxmlParser
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures')
+LISTING_ROW = re.compile(
+    r'(\t\t\t<div class="market_listing_row market_recent_listing_row '
+    r'listing_3868053667603823025" id="mylisting_3868053667603823025">'
+    r'.*?\n\t\t\t</div>\n)', re.S)
+ORDER_ROW = re.compile(
+    r'(\t\t<div class="market_listing_row market_recent_listing_row" '
+    r'id="mybuyorder_5470862660">.*?\n\t\t</div>\n)', re.S)
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as file:
+        return file.read()
+
+
+def multiply_rows(html: str, regex: re.Pattern, row_id: str,
+                  value: int) -> str:
+    row = regex.search(html).group(1)
+    rows = ''.join(row.replace(row_id, str(int(row_id) + i))
+                   for i in range(value))
+    return html.replace(row, rows)
+
+
+def measure(parse, html: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse(html)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    market_page = read_fixture('market_page.html')
+    market_page = multiply_rows(market_page, LISTING_ROW,
+                                '3868053667603823025', 1000)
+    market_page = multiply_rows(market_page, ORDER_ROW, '5470862660', 200)
+    render_chunk = read_fixture('mylistings_render.html')
+    render_chunk = multiply_rows(render_chunk, re.compile(
+        r'(\t<div class="market_listing_row market_recent_listing_row '
+        r'listing_3868053667603823100" .*?\n\t</div>\n)', re.S),
+        '3868053667603823100', 100)
+    backends = {'BeautifulSoupParser': BeautifulSoupParser(),
+                'LxmlParser': LxmlParser()}
+    results = {}
+    for name, parser in backends.items():
+        results[name] = (
+            measure(parser.get_market_listings_from_html, market_page, 5),
+            measure(parser.get_market_sell_listings_from_api,
+                    render_chunk, 20))
+    assert backends['LxmlParser'].get_market_listings_from_html(
+        market_page) == backends['BeautifulSoupParser']\
+        .get_market_listings_from_html(market_page)
+    print(f'/market page {len(market_page):,} chars, '
+          f'render chunk {len(render_chunk):,} chars, ms per parse')
+    for name, (page_time, chunk_time) in results.items():
+        print(f'{name:<20} page {page_time * 1000:8.1f}   '
+              f'chunk {chunk_time * 1000:7.1f}')
+
+
+if __name__ == '__main__':
+    main()
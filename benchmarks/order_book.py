@@ -0,0 +1,66 @@
+"""
+Compares parse_orders_histogram plus a dict comparison of two snapshots
+with OrderBook.from_histogram plus OrderBook.diff on books of 100 levels
+per side, the most Steam sends.
+
+Run from the repository root: python -m benchmarks.order_book
+"""
+import random
+import time
+
+from steamcom.order_book import OrderBook
+from steamcom.utils import parse_orders_histogram
+
+
+def make_histogram(rng: random.Random) -> dict:
+    buy_order_graph, sell_order_graph = [], []
+    depth = 0
+    for level in range(100):
+        depth += rng.randint(1, 50)
+        price = round(10 - level * 0.01, 2)
+        buy_order_graph.append([price, depth, f'{depth} at {price}'])
+    depth = 0
+    for level in range(100):
+        depth += rng.randint(1, 50)
+        price = round(10.5 + level * 0.01, 2)
+        sell_order_graph.append([price, depth, f'{depth} at {price}'])
+    return {'buy_order_graph': buy_order_graph,
+            'sell_order_graph': sell_order_graph}
+
+
+def diff_dicts(parsed: dict, previous: dict) -> dict:
+    diff = {}
+    for graph in ('buy_order_graph', 'sell_order_graph'):
+        levels = {level['price']: level['quantity'] for level in parsed[graph]}
+        old_levels = {level['price']: level['quantity']
+                      for level in previous[graph]}
+        diff[graph] = {price: levels.get(price, 0) - old_levels.get(price, 0)
+                       for price in levels.keys() | old_levels.keys()
+                       if levels.get(price, 0) != old_levels.get(price, 0)}
+    return diff
+
+
+def main() -> None:
+    rng = random.Random(0)
+    histograms = [make_histogram(rng) for _ in range(5000)]
+    started = time.perf_counter()
+    previous = parse_orders_histogram(histograms[0])
+    for histogram in histograms[1:]:
+        parsed = parse_orders_histogram(histogram)
+        diff_dicts(parsed, previous)
+        previous = parsed
+    dicts_time = time.perf_counter() - started
+    started = time.perf_counter()
+    previous = OrderBook.from_histogram(histograms[0])
+    for histogram in histograms[1:]:
+        order_book = OrderBook.from_histogram(histogram)
+        order_book.diff(previous)
+        previous = order_book
+    books_time = time.perf_counter() - started
+    per_book = 1e6 / len(histograms)
+    print(f'dicts:      {dicts_time * per_book:6.1f} us per book')
+    print(f'OrderBook:  {books_time * per_book:6.1f} us per book')
+
+
+if __name__ == '__main__':
+    main()
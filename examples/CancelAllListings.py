@@ -1,7 +1,4 @@
-import time
-
 from steamcom.client import SteamClient
-from steamcom.exceptions import ApiException
 
 
 USERNAME = ''
@@ -15,10 +12,10 @@ steam_client = SteamClient(USERNAME, PASSWORD, SHARED_SECRET, IDENTITY_SECRET)
 steam_client.login()
 listings = steam_client.market.get_my_market_listings()
 
-for listing in listings['sell_listings']:
-    try:
-        steam_client.market.cancel_sell_order(listing)
-        print(f'{listing} canceled')
-    except ApiException as e:
-        print(f'ApiException when canceled {listing}: {e}')
-    time.sleep(DELAY)
\ No newline at end of file
+results = steam_client.market.cancel_many(listings['sell_listings'],
+                                          delay=DELAY)
+for listing_id, result in results['sell_listings'].items():
+    if result.success:
+        print(f'{listing_id} canceled')
+    else:
+        print(f'Failed to cancel {listing_id}: {result.error}')
@@ -1,9 +1,5 @@
-import time
-
 from steamcom.client import SteamClient
-from steamcom.models import ConfirmationType
-from steamcom.exceptions import ApiException
-from steamcom import fee_counter
+from steamcom.models import SellItem, SellStatus
 
 
 USERNAME = ''
@@ -24,30 +20,23 @@ steam_client = SteamClient(USERNAME, PASSWORD, SHARED_SECRET, IDENTITY_SECRET)
 steam_client.login()
 inventory = steam_client.get_my_inventory(APP_ID, CONTEXT_ID)['assets']
 
-can_sell = dict()
-for asset, asset_data in inventory.items():
-    if asset_data['marketable']:
-            can_sell[asset] = asset_data
-
-CONFIRM_COUNTER = 0
-for asset_id, asset_data in can_sell.items():
+sell_items = []
+for asset_id, asset_data in inventory.items():
     market_hash_name = asset_data['market_hash_name']
-    if market_hash_name in SELL_ITEMS\
+    if asset_data['marketable'] and market_hash_name in SELL_ITEMS\
             and SELL_ITEMS[market_hash_name]['value'] > 0:
         price = SELL_ITEMS[market_hash_name]['price']
-        seller_receive = fee_counter.count(price)['seller_receive']
-        try:
-            steam_client.market.create_sell_order(
-                asset_id, APP_ID, CONTEXT_ID, seller_receive)
-            SELL_ITEMS[market_hash_name]['value'] -= 1
-            CONFIRM_COUNTER += 1
-            print(f'{market_hash_name} listed')
-        except ApiException as e:
-            print(f'ApiException for listing {market_hash_name}: {e}')
-        if CONFIRM_COUNTER >= 100:
-            steam_client.confirmations.allow_all_confirmations([ConfirmationType.CREATE_LISTING])
-            CONFIRM_COUNTER = 0
-            print('Listings confirmed')
-        time.sleep(DELAY)
-steam_client.confirmations.allow_all_confirmations([ConfirmationType.CREATE_LISTING])
-print('Listings confirmed')
+        seller_receive = steam_client.fee_counter.calculate_seller_price(
+            price).seller_receive
+        sell_items.append(
+            SellItem(asset_id, APP_ID, CONTEXT_ID, seller_receive))
+        SELL_ITEMS[market_hash_name]['value'] -= 1
+
+results = steam_client.market.sell_many(
+    sell_items, confirm_batch_size=CONFIRM_VALUE, delay=DELAY)
+for asset_id, result in results.items():
+    market_hash_name = inventory[asset_id]['market_hash_name']
+    if result.status == SellStatus.FAILED:
+        print(f'ApiException for listing {market_hash_name}: {result.error}')
+    else:
+        print(f'{market_hash_name} {result.status.value}')
@@ -0,0 +1,231 @@
+import time
+from typing import AsyncIterator, Mapping
+from http.cookiejar import Cookie
+
+import httpx
+
+from steamcom.async_login import AsyncLoginExecutor
+from steamcom.async_confirmations import AsyncConfirmationExecutor
+from steamcom.async_market import AsyncSteamMarket
+from steamcom.client import DEFAULT_HEADERS
+from steamcom.utils import (login_required, async_api_request,
+                            merge_items_with_descriptions_from_inventory,
+                            get_wallet_info_from_html,
+                            async_wait_for_budget, get_steam_id_from_html)
+from steamcom.models import SteamUrl, WalletInfo, DescriptionTable
+from steamcom.exceptions import LoginFailed, SessionIsInvalid, ApiException
+from steamcom.fee_counter import FeeCounter
+from steamcom.rate_limiter import RateLimiter
+
+
+class AsyncSteamClient:
+
+    def __init__(self, username: str = '', password: str = '',
+                 shared_secret: str = '', identity_secret: str = '',
+                 session: httpx.AsyncClient = None,
+                 max_connections: int = 10,
+                 rate_limiter: RateLimiter = None) -> None:
+        self.username = username
+        self.password = password
+        self.shared_secret = shared_secret
+        self.identity_secret = identity_secret
+        if session is None:
+            limits = httpx.Limits(max_connections=max_connections,
+                                  max_keepalive_connections=max_connections)
+            session = httpx.AsyncClient(limits=limits, follow_redirects=True,
+                                        timeout=30)
+        self.session = session
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.rate_limiter = rate_limiter
+        self.steam_id = ''  # will be added after login
+        self.refresh_token = ''
+        self.currency_id = None  # will be added after login
+        self.was_login_executed = False
+        self.confirmations = None
+        self.market = None
+        self.fee_counter = None
+        self._session_check = None  # (is alive, time.monotonic())
+
+    def __str__(self) -> str:
+        if self.was_login_executed:
+            return f'AsyncSteamClient: {self.username}'
+        else:
+            return 'Empty AsyncSteamClient object'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> 'AsyncSteamClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.session.aclose()
+
+    async def login(self) -> None:
+        if self.was_login_executed:
+            raise LoginFailed('You alrady have a session')
+        login_executor = AsyncLoginExecutor(
+            self.username, self.password, self.shared_secret, self.session)
+        self.steam_id, self.refresh_token = await login_executor.login()
+        self.wallet_info = await self.get_wallet_info()
+        self.currency_id = self.wallet_info.currency
+        self._change_login_executed_fields(True)
+
+    @login_required
+    def extract_session(self) -> dict:
+        extracted_session = {
+            'steamid': self.steam_id,
+            'currencyid': self.currency_id,
+            'refresh_token': self.refresh_token,
+            'cookies': []
+        }
+        for cookie in self.session.cookies.jar:
+            cookie_dict = vars(cookie).copy()
+            cookie_dict['rest'] = cookie_dict.pop('_rest', {})
+            extracted_session['cookies'].append(cookie_dict)
+        return extracted_session
+
+    async def load_session(self,
+                           extracted_session: Mapping[str, str]) -> None:
+        if self.was_login_executed:
+            raise LoginFailed('You alrady have a session')
+        self._load_session(extracted_session)
+        self.was_login_executed = True
+        market_page = await self._get_market_page()
+        if not self._session_check[0]:
+            self.session.cookies.clear()
+            self.was_login_executed = False
+            raise SessionIsInvalid()
+        self.wallet_info = get_wallet_info_from_html(market_page)
+        self._change_login_executed_fields(True)
+
+    @login_required
+    async def is_session_alive(self, ttl: float = 0) -> bool:
+        """
+        ttl: how old the last check can be, by default a request is always
+            sent as in SteamClient.is_session_alive
+        """
+        if self._session_check is not None:
+            is_alive, checked_at = self._session_check
+            if time.monotonic() - checked_at < ttl:
+                return is_alive
+        await self._get_market_page()
+        return self._session_check[0]
+
+    async def _get_market_page(self) -> str:
+        response = await self.session.get(SteamUrl.COMMUNITY + '/market')
+        is_alive = bool(self.steam_id)\
+            and get_steam_id_from_html(response.text) == str(self.steam_id)
+        self._session_check = (is_alive, time.monotonic())
+        return response.text
+
+    def _load_session(self, extracted_session: Mapping[str, str]) -> None:
+        self.steam_id = extracted_session['steamid']
+        self.currency_id = extracted_session['currencyid']
+        self.refresh_token = extracted_session['refresh_token']
+        for c_dict in extracted_session['cookies']:
+            cookie = Cookie(**c_dict)
+            self.session.cookies.jar.set_cookie(cookie)
+
+    def _change_login_executed_fields(self, status: bool) -> None:
+        if status:
+            self.confirmations = AsyncConfirmationExecutor(
+                self.identity_secret, self.steam_id, self.session)
+            self.confirmations.was_login_executed = True
+            self.market = AsyncSteamMarket(self.steam_id, self.currency_id,
+                                           self.confirmations, self.session,
+                                           self.rate_limiter)
+            self.market.was_login_executed = True
+            self.fee_counter = FeeCounter(
+                self.wallet_info.fee_percent, self.wallet_info.market_minimum,
+                self.wallet_info.currency_increment,
+                self.wallet_info.publisher_fee_percent_default)
+        else:
+            self.confirmations = None
+            self.market = None
+            self.fee_counter = None
+        self.was_login_executed = status
+
+    async def get_wallet_info(self) -> WalletInfo:
+        return get_wallet_info_from_html(await self._get_market_page())
+
+    @login_required
+    async def get_my_inventory(self, app_id: str, context_id: str,
+                               delay: int = 3, attempts: int = 3) -> dict:
+        steam_id = self.steam_id
+        return await self.get_partner_inventory(steam_id, app_id, context_id,
+                                                delay, attempts)
+
+    async def get_partner_inventory(self, partner_steam_id: str, app_id: str,
+                                    context_id: str, delay: int = 3,
+                                    attempts: int = 3) -> dict:
+        full_inventory = {}
+        async for inventory in self.iter_inventory(
+                partner_steam_id, app_id, context_id, delay, attempts):
+            if not full_inventory:
+                full_inventory['assets'] = inventory['assets']
+                full_inventory['total_inventory_count']\
+                    = inventory['total_inventory_count']
+            else:
+                full_inventory['assets'].update(inventory['assets'])
+        return full_inventory
+
+    async def iter_inventory(self, steam_id: str, app_id: str,
+                             context_id: str, delay: int = 3,
+                             attempts: int = 3) -> AsyncIterator[dict]:
+        start_asset_id = None
+        description_table = DescriptionTable()
+        url = '/'.join([SteamUrl.COMMUNITY, 'inventory', steam_id])
+        while True:
+            if attempts > 0:
+                try:
+                    await async_wait_for_budget(self.rate_limiter, url,
+                                                delay)
+                    inventory = await self.get_inventory_page(
+                        steam_id, app_id, context_id,
+                        start_asset_id=start_asset_id,
+                        description_table=description_table)
+                except ApiException:
+                    attempts -= 1
+                    continue
+            else:
+                await async_wait_for_budget(self.rate_limiter, url, delay)
+                inventory = await self.get_inventory_page(
+                    steam_id, app_id, context_id,
+                    start_asset_id=start_asset_id,
+                    description_table=description_table)
+            yield inventory
+            if inventory['last_asset_id']:
+                start_asset_id = inventory['last_asset_id']
+            else:
+                return
+
+    async def get_inventory_page(self, partner_steam_id: str, app_id: str,
+                                 context_id: str, count: int = 2500,
+                                 start_asset_id: str = None,
+                                 description_table: DescriptionTable = None)\
+            -> dict:
+        url = '/'.join([SteamUrl.COMMUNITY, 'inventory', partner_steam_id,
+                        app_id, context_id])
+        params = {'l': 'english',
+                  'count': count,
+                  'start_assetid': start_asset_id}
+        response_dict = await async_api_request(self.session, url, params)
+        if 'success' not in response_dict or response_dict['success'] != 1:
+            raise ApiException('Success value should be 1.')
+        assets = merge_items_with_descriptions_from_inventory(
+            response_dict, context_id, description_table)
+        more_items = response_dict['more_items']\
+            if 'more_items' in response_dict else None
+        last_asset_id = response_dict['last_assetid']\
+            if 'last_assetid' in response_dict else None
+        inventory = {
+            'assets': assets,
+            'more_items': more_items,
+            'last_asset_id': last_asset_id,
+            'total_inventory_count': response_dict['total_inventory_count']
+        }
+        return inventory
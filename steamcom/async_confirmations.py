@@ -0,0 +1,86 @@
+from typing import Iterable
+
+import httpx
+
+from steamcom.confirmations import BaseConfirmationExecutor
+from steamcom.models import ConfirmationTag, Confirmation, ConfirmationType
+from steamcom.utils import login_required, async_api_request
+
+
+class AsyncConfirmationExecutor(BaseConfirmationExecutor):
+
+    def __init__(self, identity_secret: str, steam_id: str,
+                 session: httpx.AsyncClient) -> None:
+        super().__init__(identity_secret, steam_id, session)
+
+    @login_required
+    async def respond_to_confirmation(self, confirmation: Confirmation,
+                                      cancel: bool = False) -> bool:
+        tag = ConfirmationTag.ALLOW if cancel is False\
+            else ConfirmationTag.CANCEL
+        params = self._create_confirmation_params(tag)
+        params['op'] = tag
+        params['ck'] = confirmation.nonce
+        params['cid'] = confirmation.id
+        url = self.CONF_URL + '/ajaxop'
+        response = await async_api_request(self.session, url, params)
+        if response['success']:
+            self._index.pop(confirmation.creator_id, None)
+        return response['success']
+
+    @login_required
+    async def respond_to_confirmations(
+            self, confirmations: Iterable[Confirmation],
+            cancel: bool = False) -> bool:
+        confirmations = list(confirmations)
+        tag = ConfirmationTag.ALLOW if cancel is False\
+            else ConfirmationTag.CANCEL
+        params = self._create_confirmation_params(tag)
+        params['op'] = tag
+        params['ck[]'] = [i.nonce for i in confirmations]
+        params['cid[]'] = [i.id for i in confirmations]
+        response = await self.session.post(
+            self.CONF_URL + '/multiajaxop', data=params)
+        try:
+            status = response.json()['success']
+        except ValueError:
+            status = False
+        if status:
+            for confirmation in confirmations:
+                self._index.pop(confirmation.creator_id, None)
+        return status
+
+    @login_required
+    async def get_confirmations(self) -> list[Confirmation]:
+        confirmations_page = await self._fetch_confirmations_page()
+        confirmations = self._parse_confirmations_page(confirmations_page)
+        self._index = {confirmation.creator_id: confirmation
+                       for confirmation in confirmations}
+        return confirmations
+
+    @login_required
+    async def find_confirmations(self, creator_ids: Iterable[str])\
+            -> dict[str, Confirmation]:
+        creator_ids = [str(creator_id) for creator_id in creator_ids]
+        index = self._index
+        if any(creator_id not in index for creator_id in creator_ids):
+            await self.get_confirmations()
+            index = self._index
+        return {creator_id: index[creator_id] for creator_id in creator_ids
+                if creator_id in index}
+
+    async def _fetch_confirmations_page(self) -> dict:
+        url = self.CONF_URL + '/getlist'
+        tag = ConfirmationTag.CONF
+        params = self._create_confirmation_params(tag)
+        return await async_api_request(self.session, url, params=params)
+
+    @login_required
+    async def allow_all_confirmations(
+            self, types: Iterable[ConfirmationType]) -> None:
+        confirmations = await self.get_confirmations()
+        selected_confirmations = []
+        for confirmation in confirmations:
+            if confirmation.type in types:
+                selected_confirmations.append(confirmation)
+        await self.respond_to_confirmations(selected_confirmations)
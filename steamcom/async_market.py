@@ -0,0 +1,164 @@
+import urllib.parse
+from decimal import Decimal
+from typing import Union
+
+import httpx
+
+from steamcom.utils import (login_required, async_api_request, parse_graph,
+                            parse_orders_histogram)
+from steamcom.models import SteamUrl, Result
+from steamcom.exceptions import ApiException
+from steamcom.async_confirmations import AsyncConfirmationExecutor
+from steamcom.rate_limiter import RateLimiter
+
+
+class AsyncSteamMarket:
+
+    def __init__(self, steam_id: str, currency_id: int,
+                 confirmations: AsyncConfirmationExecutor,
+                 session: httpx.AsyncClient,
+                 rate_limiter: RateLimiter = None) -> None:
+        self.steam_id = steam_id
+        self.currency_id = currency_id
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.was_login_executed = False
+        self.confirmations = confirmations
+
+    @login_required
+    async def get_price_history(self, app_id: str, market_hash_name: str,
+                                raw: bool = False) -> Union[dict, list]:
+        url = SteamUrl.COMMUNITY + '/market/pricehistory/'
+        params = {'appid': app_id,
+                  'market_hash_name': market_hash_name}
+        response_json = await async_api_request(self.session, url, params)
+        if not response_json.get("success"):
+            text = 'Problem getting price history the order. success: '
+            raise ApiException(text + str(response_json.get("success")))
+        if raw:
+            return response_json['prices']
+        return parse_graph(response_json['prices'])
+
+    async def get_orders_histogram(self, item_name_id: str, app_id: str,
+                                   market_hash_name: str,
+                                   currency_id: int = None,
+                                   raw: bool = False) -> dict:
+        url = SteamUrl.COMMUNITY + '/market/itemordershistogram'
+        params = {
+            'country': 'RU',
+            'language': 'english',
+            'currency': self.currency_id if not currency_id else currency_id,
+            'item_nameid': item_name_id,
+            'two_factor': 0
+        }
+        url_name = urllib.parse.quote(market_hash_name)
+        referer = f'{SteamUrl.COMMUNITY}/market/listings/{app_id}/{url_name}'
+        headers = {
+            'Referer': referer
+        }
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async(url)
+        response = await async_api_request(self.session, url, params,
+                                           headers)
+        if 'buy_order_graph' not in response\
+                or 'sell_order_graph' not in response:
+            raise ApiException('Buy or sell order graph not in body')
+        if raw:
+            return response
+        return parse_orders_histogram(response)
+
+    @login_required
+    async def create_buy_order(self, app_id: str, market_hash_name: str,
+                               price_single_item: str, quantity: int,
+                               confirm: bool = True) -> dict:
+        if confirm and not self.confirmations.identity_secret:
+            raise ValueError('Cannot be confirmed without identity_secret')
+        data = {
+            'sessionid': self._get_session_id(),
+            'currency': self.currency_id,
+            'appid': app_id,
+            'market_hash_name': market_hash_name,
+            'price_total': str(Decimal(price_single_item) * Decimal(quantity)),
+            'tradefee_tax': 0,
+            'quantity': quantity,
+            'billing_state': '',
+            'save_my_address': 0,
+            'confirmation': 0
+        }
+        url_name = urllib.parse.quote(market_hash_name)
+        referer = f'{SteamUrl.COMMUNITY}/market/listings/{app_id}/{url_name}'
+        headers = {'Referer': referer}
+        url = SteamUrl.COMMUNITY + '/market/createbuyorder/'
+        response = await async_api_request(self.session, url,
+                                           headers=headers, data=data)
+        if response['success'] == Result.OK.value:
+            return response
+        elif response['success'] == Result.PENDING.value:
+            if confirm:
+                confirmation_id = response['confirmation']['confirmation_id']
+                confirmations = await self.confirmations.find_confirmations(
+                    [confirmation_id])
+                confirmation = confirmations.get(str(confirmation_id))
+                if confirmation is not None:
+                    conf_status = await self.confirmations\
+                        .respond_to_confirmation(confirmation)
+                    if not conf_status:
+                        raise ApiException('Confirmation failed')
+                data['confirmation'] = confirmation_id
+                response_after_conf = await async_api_request(
+                    self.session, url, headers=headers, data=data)
+                if response_after_conf['success'] == Result.OK.value:
+                    return response_after_conf
+                else:
+                    raise ApiException(response)
+            else:
+                return response
+        else:
+            raise ApiException(response)
+
+    @login_required
+    async def create_sell_order(self, asset_id: str, app_id: str,
+                                context_id: str, money_to_receive: str,
+                                amount: int = 1) -> dict:
+        data = {
+            'assetid': asset_id,
+            'sessionid': self._get_session_id(),
+            'contextid': context_id,
+            'appid': app_id,
+            'amount': amount,
+            'price': money_to_receive
+        }
+        referer = f'{SteamUrl.COMMUNITY}/profiles/{self.steam_id}/inventory'
+        headers = {'Referer': referer}
+        url = SteamUrl.COMMUNITY + '/market/sellitem/'
+        response = await async_api_request(self.session, url,
+                                           headers=headers, data=data)
+        if not response['success']:
+            raise ApiException(response['message'])
+        return response
+
+    @login_required
+    async def cancel_sell_order(self, sell_listing_id: str) -> None:
+        url = f'{SteamUrl.COMMUNITY}/market/removelisting/{sell_listing_id}'
+        data = {'sessionid': self._get_session_id()}
+        headers = {'Referer': SteamUrl.COMMUNITY + '/market/'}
+        response = await self.session.post(url, data=data, headers=headers)
+        if not response.is_success:
+            text = 'Problem removing the listing. http code: {}'
+            raise ApiException(text.format(response.status_code))
+
+    @login_required
+    async def cancel_buy_order(self, buy_order_id: str) -> dict:
+        data = {
+            'sessionid': self._get_session_id(),
+            'buy_orderid': buy_order_id
+        }
+        headers = {'Referer': SteamUrl.COMMUNITY + '/market'}
+        url = SteamUrl.COMMUNITY + '/market/cancelbuyorder/'
+        response = await async_api_request(self.session, url,
+                                           headers=headers, data=data)
+        return response
+
+    def _get_session_id(self) -> str:
+        return self.session.cookies.get('sessionid',
+                                        domain='steamcommunity.com')
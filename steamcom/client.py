@@ -1,48 +1,72 @@
 import re
-import time
 import json
-from typing import Mapping, Union
+from typing import Iterator, Mapping, Union
 import urllib.parse as urlparse
 from http.cookiejar import Cookie
 
 import requests
+from requests.adapters import BaseAdapter
 
 from steamcom.login import LoginExecutor
 from steamcom.confirmations import ConfirmationExecutor
 from steamcom.utils import (login_required, api_request,
                             merge_items_with_descriptions_from_inventory,
                             get_key_value_from_url, account_id_to_steam_id,
-                            create_offer_dict)
-from steamcom.models import SteamUrl, WalletInfo
+                            create_offer_dict, wait_for_budget)
+from steamcom.models import SteamUrl, WalletInfo, DescriptionTable
 from steamcom.exceptions import LoginFailed, SessionIsInvalid, ApiException
 from steamcom.market import SteamMarket
+from steamcom.market_page import MarketPage, MarketPageCache
 from steamcom.fee_counter import FeeCounter
+from steamcom.rate_limiter import RateLimiter
+from steamcom.session_store import SessionStore
+from steamcom.transport import mount_transport
+from steamcom.metrics import instrument_session
+from steamcom.tracing import span, traced
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Mobile Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Accept-Language": "en-US,en;q=0.9",
+    "sec-ch-ua": "\"Chromium\";v=\"140\", \"Not=A?Brand\";v=\"24\", \"Google Chrome\";v=\"140\"",
+    "sec-ch-ua-mobile": "?1",
+    "sec-ch-ua-platform": "\"Android\"",
+    "sec-fetch-dest": "document",
+    "sec-fetch-mode": "navigate",
+    "sec-fetch-site": "same-origin",
+    "sec-fetch-user": "?1",
+    "upgrade-insecure-requests": "1"
+}
 
 
 class SteamClient:
 
     def __init__(self, username: str = '', password: str = '',
                  shared_secret: str = '', identity_secret: str = '',
-                 session: requests.Session = requests.Session()) -> None:
+                 session: requests.Session = None,
+                 rate_limiter: RateLimiter = None,
+                 transport: BaseAdapter = None, metrics=None) -> None:
+        """
+        transport: requests adapter every request of the session goes
+            through, see steamcom.transport
+        metrics: sink that records every response, for example
+            metrics.InMemoryMetrics
+        """
         self.username = username
         self.password = password
         self.shared_secret = shared_secret
         self.identity_secret = identity_secret
+        if session is None:
+            session = requests.Session()
         self.session = session
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Mobile Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Accept-Language": "en-US,en;q=0.9",
-            "sec-ch-ua": "\"Chromium\";v=\"140\", \"Not=A?Brand\";v=\"24\", \"Google Chrome\";v=\"140\"",
-            "sec-ch-ua-mobile": "?1",
-            "sec-ch-ua-platform": "\"Android\"",
-            "sec-fetch-dest": "document",
-            "sec-fetch-mode": "navigate",
-            "sec-fetch-site": "same-origin",
-            "sec-fetch-user": "?1",
-            "upgrade-insecure-requests": "1"
-        })
+        if transport is not None:
+            mount_transport(self.session, transport)
+        if metrics is not None:
+            instrument_session(self.session, metrics)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.rate_limiter = rate_limiter
         self.steam_id = ''  # will be added after login
         self.refresh_token = ''
         self.currency_id = None  # will be added after login
@@ -50,6 +74,7 @@ class SteamClient:
         self.confirmations = None
         self.market = None
         self.fee_counter = None
+        self.market_page_cache = MarketPageCache(self.session)
 
     def __str__(self) -> str:
         if self.was_login_executed:
@@ -63,13 +88,15 @@ class SteamClient:
         else:
             return 'Empty SteamClient object'
 
+    @traced('steamcom.client.login')
     def login(self) -> None:
         if self.was_login_executed:
             raise LoginFailed('You alrady have a session')
         login_executor = LoginExecutor(
             self.username, self.password, self.shared_secret, self.session)
         self.steam_id, self.refresh_token = login_executor.login()
-        self.wallet_info = self.get_wallet_info()
+        with span('steamcom.client.get_wallet_info'):
+            self.wallet_info = self.get_wallet_info(max_age=0)
         self.currency_id = self.wallet_info.currency
         self._change_login_executed_fields(True)
 
@@ -92,18 +119,49 @@ class SteamClient:
             raise LoginFailed('You alrady have a session')
         self._load_session(extracted_session)
         self.was_login_executed = True
-        if not self.is_session_alive():
+        market_page = self.get_market_page(max_age=0)
+        if market_page.steam_id != str(self.steam_id):
             self.session.cookies.clear()
             self.was_login_executed = False
             raise SessionIsInvalid()
-        self.wallet_info = self.get_wallet_info()
+        self.wallet_info = market_page.wallet_info
         self._change_login_executed_fields(True)
 
+    def login_or_restore(self, session_store: SessionStore) -> bool:
+        """
+        Loads the saved session of the account, logs in and saves the new
+        session only if there is no saved one or it is invalid
+
+        Returns:
+        True if the saved session was restored
+        """
+        extracted_session = session_store.load(self.username)
+        if extracted_session is not None:
+            try:
+                self.load_session(extracted_session)
+                return True
+            except SessionIsInvalid:
+                session_store.delete(self.username)
+        self.login()
+        session_store.save(self.username, self.extract_session())
+        return False
+
     @login_required
-    def is_session_alive(self) -> bool:
-        steam_login = self.username
-        main_page_response = self.session.get(SteamUrl.COMMUNITY)
-        return steam_login.lower() in main_page_response.text.lower()
+    def is_session_alive(self, ttl: float = 0) -> bool:
+        """
+        ttl: how old the checked /market page can be, by default a request
+            is always sent
+        """
+        market_page = self.get_market_page(max_age=ttl)
+        return bool(self.steam_id)\
+            and market_page.steam_id == str(self.steam_id)
+
+    def get_market_page(self, max_age: float = None) -> MarketPage:
+        """
+        Returns the /market page snapshot shared with SteamMarket, it is
+        downloaded again when it is older than max_age seconds
+        """
+        return self.market_page_cache.get(max_age)
 
     def _load_session(self, extracted_session: Mapping[str, str]) -> None:
         self.steam_id = extracted_session['steamid']
@@ -119,7 +177,9 @@ class SteamClient:
                 self.identity_secret, self.steam_id, self.session)
             self.confirmations.was_login_executed = True
             self.market = SteamMarket(self.steam_id, self.currency_id,
-                                      self.confirmations, self.session)
+                                      self.confirmations, self.session,
+                                      self.rate_limiter,
+                                      self.market_page_cache)
             self.market.was_login_executed = True
             self.fee_counter = FeeCounter(
                 self.wallet_info.fee_percent, self.wallet_info.market_minimum,
@@ -137,33 +197,12 @@ class SteamClient:
         part_with_currency = re.search('wallet_currency":\\d+', response.text)
         return int(re.search('\\d+', part_with_currency[0])[0])
 
-    def get_wallet_info(self) -> WalletInfo:
-        market_page_response = self.session.get(SteamUrl.COMMUNITY + '/market')
-        pattern = r'var g_rgWalletInfo = (\{.*?\});'
-        match = re.search(pattern, market_page_response.text)
-        if not match:
-            raise ValueError('g_rgWalletInfo not found')
-        raw_wallet_info = json.loads(match.group(1))
-        return WalletInfo(
-            currency=raw_wallet_info['wallet_currency'],
-            country=raw_wallet_info['wallet_country'],
-            state=raw_wallet_info['wallet_state'],
-            fee=raw_wallet_info['wallet_fee'],
-            fee_minimum=int(raw_wallet_info['wallet_fee_minimum']),
-            fee_percent=float(raw_wallet_info['wallet_fee_percent']),
-            publisher_fee_percent_default=float(
-                raw_wallet_info['wallet_publisher_fee_percent_default']),
-            market_minimum=int(raw_wallet_info['wallet_market_minimum']),
-            currency_increment=int(raw_wallet_info['wallet_currency_increment']),
-            fee_base=int(raw_wallet_info['wallet_fee_base']),
-            balance=round(int(raw_wallet_info['wallet_balance']) / 100, 2),
-            delayed_balance=round(
-                int(raw_wallet_info['wallet_delayed_balance']) / 100, 2),
-            max_balance=round(
-                int(raw_wallet_info['wallet_max_balance']) / 100, 2),
-            trade_max_balance=round(
-                int(raw_wallet_info['wallet_trade_max_balance']) / 100, 2)
-        )
+    def get_wallet_info(self, max_age: float = 0) -> WalletInfo:
+        """
+        max_age: how old the cached /market page can be, the page is
+            downloaded again by default
+        """
+        return self.get_market_page(max_age).wallet_info
 
     @login_required
     def get_my_inventory(self, app_id: str, context_id: str,
@@ -175,40 +214,54 @@ class SteamClient:
     def get_partner_inventory(self, partner_steam_id: str, app_id: str,
                               context_id: str, delay: int = 3,
                               attempts: int = 3) -> dict:
-        start_asset_id = None
         full_inventory = {}
+        for inventory in self.iter_inventory(partner_steam_id, app_id,
+                                             context_id, delay, attempts):
+            if not full_inventory:
+                full_inventory['assets'] = inventory['assets']
+                full_inventory['total_inventory_count']\
+                    = inventory['total_inventory_count']
+            else:
+                full_inventory['assets'].update(inventory['assets'])
+        return full_inventory
+
+    def iter_inventory(self, steam_id: str, app_id: str, context_id: str,
+                       delay: int = 3, attempts: int = 3) -> Iterator[dict]:
+        """
+        Yields inventory pages in the get_inventory_page format as soon as
+        they are received, the next page is requested on the next iteration
+        """
+        start_asset_id = None
+        description_table = DescriptionTable()
+        url = '/'.join([SteamUrl.COMMUNITY, 'inventory', steam_id])
         while True:
             if attempts > 0:
                 try:
-                    time.sleep(delay)
+                    wait_for_budget(self.rate_limiter, url, delay)
                     inventory = self.get_inventory_page(
-                        partner_steam_id, app_id, context_id,
-                        start_asset_id=start_asset_id)
-                    print('Get inventory page')
+                        steam_id, app_id, context_id,
+                        start_asset_id=start_asset_id,
+                        description_table=description_table)
                 except ApiException:
                     attempts -= 1
                     continue
             else:
-                time.sleep(delay)
+                wait_for_budget(self.rate_limiter, url, delay)
                 inventory = self.get_inventory_page(
-                    partner_steam_id, app_id, context_id,
-                    start_asset_id=start_asset_id)
-                print('Get inventory page')
-            if not full_inventory:
-                full_inventory['assets'] = inventory['assets']
-                full_inventory['total_inventory_count']\
-                    = inventory['total_inventory_count']
-            else:
-                full_inventory['assets']\
-                    = full_inventory['assets'] | inventory['assets']
+                    steam_id, app_id, context_id,
+                    start_asset_id=start_asset_id,
+                    description_table=description_table)
+            yield inventory
             if inventory['last_asset_id']:
                 start_asset_id = inventory['last_asset_id']
             else:
-                return full_inventory
+                return
 
     def get_inventory_page(self, partner_steam_id: str, app_id: str,
                            context_id: str, count: int = 2500,
-                           start_asset_id: str = None) -> dict:
+                           start_asset_id: str = None,
+                           description_table: DescriptionTable = None)\
+            -> dict:
         url = '/'.join([SteamUrl.COMMUNITY, 'inventory', partner_steam_id,
                         app_id, context_id])
         params = {'l': 'english',
@@ -218,7 +271,7 @@ class SteamClient:
         if 'success' not in response_dict or response_dict['success'] != 1:
             raise ApiException('Success value should be 1.')
         assets = merge_items_with_descriptions_from_inventory(
-            response_dict, context_id)
+            response_dict, context_id, description_table)
         more_items = response_dict['more_items']\
             if 'more_items' in response_dict else None
         last_asset_id = response_dict['last_assetid']\
@@ -232,14 +285,16 @@ class SteamClient:
         return inventory
 
     @login_required
-    def get_wallet_balance(self, full_data: bool = False) -> Union[float, dict]:
-        market_page_response = self.session.get(SteamUrl.COMMUNITY + '/market')
-        pattern = r'var g_rgWalletInfo = (\{.*?\});'
-        match = re.search(pattern, market_page_response.text)
-        balance_data = json.loads(match.group(1))
+    def get_wallet_balance(self, full_data: bool = False,
+                           max_age: float = 0) -> Union[float, dict]:
+        """
+        max_age: how old the cached /market page can be, the page is
+            downloaded again by default
+        """
+        market_page = self.get_market_page(max_age)
         if full_data:
-            return balance_data
-        return round(int(balance_data['wallet_balance']) / 100, 2)
+            return market_page.raw_wallet_info
+        return market_page.balance
 
     @login_required
     def send_offer_with_url(self, my_assets: dict, them_assets: dict,
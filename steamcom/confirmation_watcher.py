@@ -0,0 +1,162 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterable, Union
+
+from steamcom.confirmations import ConfirmationExecutor
+from steamcom.exceptions import ApiException
+from steamcom.models import Confirmation, ConfirmationRule
+
+
+def rule_matches(rule: ConfirmationRule, confirmation: Confirmation) -> bool:
+    return ((rule.types is None or confirmation.type in rule.types)
+            and (rule.headline is None
+                 or rule.headline in confirmation.headline)
+            and (rule.creator_ids is None
+                 or confirmation.creator_id in rule.creator_ids))
+
+
+class ConfirmationWatcher:
+    """
+    Polls the confirmation list in a background thread and responds to
+    confirmations waited by creator_id or matched by rules, all decisions
+    of one poll are sent in batched multiajaxop requests
+    """
+
+    def __init__(self, confirmations: ConfirmationExecutor,
+                 rules: Iterable[ConfirmationRule] = (),
+                 min_interval: float = 1, max_interval: float = 30,
+                 batch_size: int = 100,
+                 on_error: Callable[[Exception], None] = None) -> None:
+        """
+        rules: the first matched rule decides, confirmations without a rule
+            and a waiter are left as is
+        min_interval: seconds between polls while something is waited or
+            was found, doubled after every empty poll up to max_interval
+        """
+        self.confirmations = confirmations
+        self.rules = list(rules)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.interval = min_interval
+        self._waiters = {}  # creator_id: (future, cancel)
+        self._handled = set()  # ids responded while still in the list
+        self._condition = threading.Condition()
+        self._woken = False
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> 'ConfirmationWatcher':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def wait_for(self, creator_id: str, cancel: bool = False) -> Future:
+        """
+        creator_id: id of the trade offer, listing or buy order
+
+        Returns:
+        Future with the Confirmation, set after it was allowed (cancelled
+        if cancel is True), ApiException if steam refused
+        """
+        future = Future()
+        with self._condition:
+            self._waiters[str(creator_id)] = (future, cancel)
+            self.interval = self.min_interval
+            self._woken = True
+            self._condition.notify()
+        return future
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='ConfirmationWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Cancels futures of confirmations that were not found"""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None and wait:
+            self._thread.join()
+        with self._condition:
+            for future, _ in self._waiters.values():
+                future.cancel()
+            self._waiters.clear()
+
+    def poll(self) -> int:
+        """
+        Fetches the confirmation list once and responds to it
+
+        Returns:
+        How many confirmations were responded
+        """
+        confirmations = self.confirmations.get_confirmations()
+        allowed, cancelled = [], []
+        with self._condition:
+            self._handled &= {confirmation.id for confirmation in confirmations}
+            for creator_id, (future, _) in list(self._waiters.items()):
+                if future.cancelled():
+                    del self._waiters[creator_id]
+            for confirmation in confirmations:
+                if confirmation.id in self._handled:
+                    continue
+                cancel = self._decide(confirmation)
+                if cancel is not None:
+                    (cancelled if cancel else allowed).append(confirmation)
+        return self._respond(allowed, False) + self._respond(cancelled, True)
+
+    def _decide(self, confirmation: Confirmation) -> Union[bool, None]:
+        """Returns cancel flag, None if the confirmation must be left"""
+        waiter = self._waiters.get(confirmation.creator_id)
+        if waiter is not None:
+            return waiter[1]
+        for rule in self.rules:
+            if rule_matches(rule, confirmation):
+                return rule.cancel
+        return None
+
+    def _respond(self, confirmations: list[Confirmation],
+                 cancel: bool) -> int:
+        responded = 0
+        for start in range(0, len(confirmations), self.batch_size):
+            batch = confirmations[start:start + self.batch_size]
+            success = self.confirmations.respond_to_confirmations(
+                batch, cancel)
+            if success:
+                responded += len(batch)
+            with self._condition:
+                for confirmation in batch:
+                    if success:
+                        self._handled.add(confirmation.id)
+                    waiter = self._waiters.pop(confirmation.creator_id, None)
+                    if waiter is None or waiter[0].done():
+                        continue
+                    if success:
+                        waiter[0].set_result(confirmation)
+                    else:
+                        waiter[0].set_exception(
+                            ApiException('Confirmation failed'))
+        return responded
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                responded = self.poll()
+            except Exception as e:  # the thread must survive network errors
+                responded = 0
+                if self.on_error:
+                    self.on_error(e)
+            with self._condition:
+                if responded or self._waiters:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.interval * 2, self.max_interval)
+                self._condition.wait_for(
+                    lambda: self._woken or self._stopped.is_set(),
+                    self.interval)
+                self._woken = False
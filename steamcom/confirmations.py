@@ -7,19 +7,69 @@ from steamcom.guard import generate_confirmation_key, generate_device_id
 from steamcom.models import (ConfirmationTag, Confirmation, ConfirmationType,
                              SteamUrl)
 from steamcom.utils import login_required, api_request
+from steamcom.tracing import traced
 
 
-class ConfirmationExecutor:
+class BaseConfirmationExecutor:
+    """
+    State, request params and parsing shared by the sync and the async
+    executor, methods that make requests are defined in subclasses
+    """
     CONF_URL = SteamUrl.COMMUNITY + '/mobileconf'
 
-    def __init__(self, identity_secret: str, steam_id: str,
-                 session: requests.Session) -> None:
+    def __init__(self, identity_secret: str, steam_id: str, session) -> None:
         self.steam_id = steam_id
         self.identity_secret = identity_secret
         self.session = session
         self.was_login_executed = False
+        # confirmations of the last fetched list by creator_id
+        self._index = {}
+
+    def _parse_confirmations_page(self, confirmations_page: dict)\
+            -> list[Confirmation]:
+        confirmations: list[Confirmation] = []
+        for conf in confirmations_page['conf']:
+            confirmations.append(Confirmation(
+                type=ConfirmationType(int(conf['type'])),
+                type_name=conf['type_name'],
+                id=conf['id'],
+                creator_id=conf['creator_id'],
+                nonce=conf['nonce'],
+                creation_time=conf['creation_time'],
+                cancel=conf['cancel'],
+                accept=conf['accept'],
+                icon=conf['icon'],
+                multi=conf['multi'],
+                headline=conf['headline'],
+                summary=conf['summary'],
+                warn=conf['warn']
+            ))
+        return confirmations
+
+    def _create_confirmation_params(self, tag: str) -> dict[str, str]:
+        timestamp = int(time.time())
+        confirmation_key = generate_confirmation_key(
+            self.identity_secret, tag)
+        android_id = generate_device_id(self.steam_id)
+        params = {
+            'p': android_id,
+            'a': self.steam_id,
+            'k': confirmation_key,
+            't': timestamp,
+            'm': 'react',
+            'tag': tag
+        }
+        return params
+
+
+class ConfirmationExecutor(BaseConfirmationExecutor):
+
+    def __init__(self, identity_secret: str, steam_id: str,
+                 session: requests.Session) -> None:
+        super().__init__(identity_secret, steam_id, session)
 
     @login_required
+    @traced('steamcom.confirmations.ajaxop')
     def respond_to_confirmation(self, confirmation: Confirmation,
                                 cancel: bool = False) -> bool:
         tag = ConfirmationTag.ALLOW if cancel is False\
@@ -34,11 +84,15 @@ class ConfirmationExecutor:
             status = response['success']
         except requests.exceptions.JSONDecodeError:
             status = False
+        if status:
+            self._index.pop(confirmation.creator_id, None)
         return status
 
     @login_required
+    @traced('steamcom.confirmations.multiajaxop')
     def respond_to_confirmations(self, confirmations: Iterable[Confirmation],
                                  cancel: bool = False) -> bool:
+        confirmations = list(confirmations)
         tag = ConfirmationTag.ALLOW if cancel is False\
             else ConfirmationTag.CANCEL
         params = self._create_confirmation_params(tag)
@@ -51,51 +105,45 @@ class ConfirmationExecutor:
             status = response.json()['success']
         except requests.exceptions.JSONDecodeError:
             status = False
+        if status:
+            for confirmation in confirmations:
+                self._index.pop(confirmation.creator_id, None)
         return status
 
     @login_required
+    @traced('steamcom.confirmations.getlist')
     def get_confirmations(self) -> list[Confirmation]:
-        confirmations: list[Confirmation] = []
         confirmations_page = self._fetch_confirmations_page()
-        for conf in confirmations_page['conf']:
-            confirmations.append(Confirmation(
-                type=ConfirmationType(int(conf['type'])),
-                type_name=conf['type_name'],
-                id=conf['id'],
-                creator_id=conf['creator_id'],
-                nonce=conf['nonce'],
-                creation_time=conf['creation_time'],
-                cancel=conf['cancel'],
-                accept=conf['accept'],
-                icon=conf['icon'],
-                multi=conf['multi'],
-                headline=conf['headline'],
-                summary=conf['summary'],
-                warn=conf['warn']
-            ))
+        confirmations = self._parse_confirmations_page(confirmations_page)
+        self._index = {confirmation.creator_id: confirmation
+                       for confirmation in confirmations}
         return confirmations
 
+    @login_required
+    def find_confirmations(self, creator_ids: Iterable[str])\
+            -> dict[str, Confirmation]:
+        """
+        Looks creator_ids up in the last fetched list, the list is fetched
+        again only if some of them are missing there
+
+        Returns:
+        {creator_id: Confirmation}, creator_ids without a confirmation are
+        missing
+        """
+        creator_ids = [str(creator_id) for creator_id in creator_ids]
+        index = self._index
+        if any(creator_id not in index for creator_id in creator_ids):
+            self.get_confirmations()
+            index = self._index
+        return {creator_id: index[creator_id] for creator_id in creator_ids
+                if creator_id in index}
+
     def _fetch_confirmations_page(self) -> requests.Response:
         url = self.CONF_URL + '/getlist'
         tag = ConfirmationTag.CONF
         params = self._create_confirmation_params(tag)
         return api_request(self.session, url, params=params)
 
-    def _create_confirmation_params(self, tag: str) -> dict[str, str]:
-        timestamp = int(time.time())
-        confirmation_key = generate_confirmation_key(
-            self.identity_secret, tag)
-        android_id = generate_device_id(self.steam_id)
-        params = {
-            'p': android_id,
-            'a': self.steam_id,
-            'k': confirmation_key,
-            't': timestamp,
-            'm': 'react',
-            'tag': tag
-        }
-        return params
-
     @login_required
     def allow_all_confirmations(self, types: Iterable[ConfirmationType])\
             -> None:
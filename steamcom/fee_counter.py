@@ -1,4 +1,9 @@
-import math, warnings
+import math, os, threading, warnings
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only batch methods need it
+    np = None
 
 from steamcom.models import FeePrice
 
@@ -78,6 +83,231 @@ class FeeCounter:
         buyer_pay = self.get_total_with_fees(seller_receive)
         return FeePrice(buyer_pay, seller_receive)
 
+    def calculate_seller_prices(self, buyer_prices) -> FeePrice:
+        """
+        calculate_seller_price for an array of prices in one pass
+
+        Returns:
+        FeePrice of int64 arrays in minor units, the same as
+        calculate_seller_price returns for every price
+        """
+        int_buyer_prices = self.get_int_prices(buyer_prices)
+        seller_receive = self.get_item_prices_from_totals(int_buyer_prices)
+        buyer_pay = self.get_totals_with_fees(seller_receive)
+        return FeePrice(buyer_pay, seller_receive)
+
+    def get_int_prices(self, float_prices):
+        _require_numpy()
+        float_prices = np.asarray(float_prices, dtype=np.float64)
+        float_amounts = np.where(float_prices < 0.03, 0.03, float_prices) * 100
+        int_amounts = np.floor(float_amounts + 0.000001).astype(np.int64)
+        int_amounts = np.maximum(int_amounts, 0)
+        return np.where(float_prices == 0, 0, int_amounts)
+
+    def to_valid_market_prices(self, prices):
+        _require_numpy()
+        prices = np.asarray(prices, dtype=np.int64)
+        valid_prices = prices
+        if self.currency_increment > 1:
+            amounts = prices / self.currency_increment
+            valid_prices = (np.sign(amounts)
+                            * np.floor(np.abs(amounts) + 0.5)).astype(
+                                np.int64) * self.currency_increment
+        valid_prices = np.where(prices <= self.currency_increment,
+                                self.currency_increment, valid_prices)
+        return np.where(prices <= self.market_minimum, self.market_minimum,
+                        valid_prices)
+
+    def calculate_fees(self, prices, percent):
+        if percent <= 0:
+            return np.zeros(np.shape(prices), dtype=np.int64)
+        fees = np.floor(np.asarray(prices) * percent).astype(np.int64)
+        return self.to_valid_market_prices(fees)
+
+    def get_totals_with_fees(self, prices):
+        """get_total_with_fees for an array of prices in minor units"""
+        _require_numpy()
+        prices = np.asarray(prices, dtype=np.int64)
+        valid_market_prices = self.to_valid_market_prices(prices)
+        pub_fees = self.calculate_fees(prices,
+                                       self.publisher_fee_percent_default)
+        steam_fees = self.calculate_fees(prices, self.fee_percent)
+        return valid_market_prices + pub_fees + steam_fees
+
+    def get_item_prices_from_totals(self, total_prices):
+        """
+        get_item_price_from_total for an array of totals, every step of
+        the search runs only on the prices that are not found yet
+        """
+        _require_numpy()
+        total_prices = np.asarray(total_prices, dtype=np.int64)
+        shape = total_prices.shape
+        total_prices = total_prices.reshape(-1)
+        initial_guess = np.floor(total_prices / (
+            1.0 + self.publisher_fee_percent_default + self.fee_percent))
+        max_base = total_prices - (2 * self.market_minimum)
+        base_prices = self.to_valid_market_prices(
+            np.minimum(initial_guess.astype(np.int64), max_base))
+        found = np.zeros(total_prices.shape, dtype=bool)
+        active = np.arange(total_prices.size)
+        bases = base_prices
+        totals = total_prices
+        higher = np.zeros(total_prices.shape, dtype=bool)
+        for _ in range(30):
+            if not active.size:
+                break
+            calculated = self.get_totals_with_fees(bases)
+            equal = calculated == totals
+            lower = calculated < totals
+            upper = calculated > totals
+            at_minimum = bases <= self.market_minimum
+            stopped = equal | (lower & higher) | (upper & at_minimum)
+            going_up = lower & ~higher
+            going_down = upper & ~at_minimum
+            bases = bases + self.currency_increment * (
+                going_up.astype(np.int64) - going_down.astype(np.int64))
+            higher = higher | going_down
+            found[active[equal]] = True
+            base_prices[active] = bases
+            running = ~stopped
+            active = active[running]
+            bases = bases[running]
+            totals = totals[running]
+            higher = higher[running]
+        item_prices = np.where(found, base_prices,
+                               np.maximum(self.market_minimum, base_prices))
+        return item_prices.reshape(shape)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError('Batch fee methods require numpy package')
+
+
+class FeeTable:
+    """
+    Precomputed answers of FeeCounter for every total from 0 to max_total
+    minor units, lookups in both directions are one array index. Totals
+    out of the table are calculated by the FeeCounter
+    """
+
+    def __init__(self, fee_counter: FeeCounter, item_prices, totals) -> None:
+        """
+        item_prices: get_item_price_from_total of every total
+        totals: get_total_with_fees of every price
+        """
+        self.fee_counter = fee_counter
+        self.item_prices = item_prices
+        self.totals = totals
+
+    @classmethod
+    def build(cls, fee_counter: FeeCounter,
+              max_total: int = 1_000_000) -> 'FeeTable':
+        _require_numpy()
+        values = np.arange(max_total + 1, dtype=np.int64)
+        item_prices = fee_counter.get_item_prices_from_totals(values)
+        totals = fee_counter.get_totals_with_fees(values)
+        return cls(fee_counter, item_prices.astype(np.int32),
+                   totals.astype(np.int32))
+
+    @property
+    def key(self) -> tuple:
+        return get_fee_key(self.fee_counter)
+
+    def get_item_price_from_total(self, total_price: int) -> int:
+        if 0 <= total_price < len(self.item_prices):
+            return int(self.item_prices[total_price])
+        return self.fee_counter.get_item_price_from_total(total_price)
+
+    def get_total_with_fees(self, price: int) -> int:
+        if 0 <= price < len(self.totals):
+            return int(self.totals[price])
+        return self.fee_counter.get_total_with_fees(price)
+
+    def calculate_seller_price(self, buyer_price: float) -> FeePrice:
+        int_buyer_price = self.fee_counter.get_int_price(buyer_price)
+        seller_receive = self.get_item_price_from_total(int_buyer_price)
+        buyer_pay = self.get_total_with_fees(seller_receive)
+        return FeePrice(buyer_pay, seller_receive)
+
+    def get_item_prices_from_totals(self, total_prices):
+        return self._lookup(self.item_prices, total_prices,
+                            self.fee_counter.get_item_prices_from_totals)
+
+    def get_totals_with_fees(self, prices):
+        return self._lookup(self.totals, prices,
+                            self.fee_counter.get_totals_with_fees)
+
+    def calculate_seller_prices(self, buyer_prices) -> FeePrice:
+        int_buyer_prices = self.fee_counter.get_int_prices(buyer_prices)
+        seller_receive = self.get_item_prices_from_totals(int_buyer_prices)
+        buyer_pay = self.get_totals_with_fees(seller_receive)
+        return FeePrice(buyer_pay, seller_receive)
+
+    def save(self, path: str) -> None:
+        np.savez(path, key=np.array(self.key, dtype=np.float64),
+                 item_prices=self.item_prices, totals=self.totals)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeeTable':
+        _require_numpy()
+        with np.load(path) as data:
+            fee_percent, market_minimum, currency_increment,\
+                publisher_fee_percent_default = data['key'].tolist()
+            fee_counter = FeeCounter(fee_percent, int(market_minimum),
+                                     int(currency_increment),
+                                     publisher_fee_percent_default)
+            return cls(fee_counter, data['item_prices'], data['totals'])
+
+    @staticmethod
+    def _lookup(table, values, calculate):
+        values = np.asarray(values, dtype=np.int64)
+        in_table = (values >= 0) & (values < len(table))
+        if in_table.all():
+            return table[values].astype(np.int64)
+        result = np.empty(values.shape, dtype=np.int64)
+        result[in_table] = table[values[in_table]]
+        result[~in_table] = calculate(values[~in_table])
+        return result
+
+
+def get_fee_key(fee_counter: FeeCounter) -> tuple:
+    """The same fields of WalletInfo that FeeCounter is built from"""
+    return (fee_counter.fee_percent, fee_counter.market_minimum,
+            fee_counter.currency_increment,
+            fee_counter.publisher_fee_percent_default)
+
+
+_fee_tables = {}
+_fee_tables_lock = threading.Lock()
+
+
+def get_fee_table(fee_counter: FeeCounter, max_total: int = 1_000_000,
+                  directory: str = None) -> FeeTable:
+    """
+    Returns one FeeTable for all fee counters with the same fee fields, so
+    accounts with the same currency share it
+
+    directory: where tables are saved as .npz files and loaded from
+        instead of building them again
+    """
+    key = get_fee_key(fee_counter)
+    with _fee_tables_lock:
+        fee_table = _fee_tables.get((key, max_total))
+        if fee_table is not None:
+            return fee_table
+        path = None
+        if directory is not None:
+            name = 'fee_table_{}_{}_{}_{}_{}.npz'.format(*key, max_total)
+            path = os.path.join(directory, name)
+        if path is not None and os.path.exists(path):
+            fee_table = FeeTable.load(path)
+        else:
+            fee_table = FeeTable.build(fee_counter, max_total)
+            if path is not None:
+                fee_table.save(path)
+        _fee_tables[(key, max_total)] = fee_table
+        return fee_table
 
 
 class OldFeeCounter:
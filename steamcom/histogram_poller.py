@@ -0,0 +1,221 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Union
+
+from steamcom.market import SteamMarket
+from steamcom.models import WatchItem
+from steamcom.order_book import OrderBook
+from steamcom.rate_limiter import RateLimiter
+
+
+class PollStats(NamedTuple):
+    """
+    Delays are seconds from the moment the item became due to the moment
+    its order book was received, over the last delay samples
+    """
+    polls: int
+    errors: int
+    mean_delay: float
+    p95_delay: float
+    max_delay: float
+
+
+class HistogramPoller:
+    """
+    Refreshes order books of the watchlist items every item.interval
+    seconds, when there are more due items than the rate budget allows,
+    items with the lower priority number go first
+    """
+
+    def __init__(self, market: SteamMarket, watchlist: Iterable[WatchItem] = (),
+                 callback: Callable[[WatchItem, OrderBook], None] = None,
+                 result_queue: queue.Queue = None, workers: int = 4,
+                 rate_limiter: RateLimiter = None,
+                 on_error: Callable[[WatchItem, Exception], None] = None,
+                 delay_samples: int = 1000) -> None:
+        """
+        callback: called from worker threads with every received book
+        result_queue: gets (item, order_book) tuples
+        workers: how many histogram requests are sent at the same time
+        rate_limiter: global budget, market.rate_limiter by default, the
+            budget is taken before the next item is chosen
+        """
+        self.market = market
+        self.callback = callback
+        self.result_queue = result_queue
+        self.rate_limiter = rate_limiter or market.rate_limiter
+        self.on_error = on_error
+        self.workers = workers
+        self._items = {}  # item_name_id: (item, number of the heap entry)
+        self._heaps = {}  # priority: [(due_at, number, item)]
+        self._numbers = itertools.count()
+        self._condition = threading.Condition()
+        self._slots = threading.Semaphore(workers)
+        self._stopped = threading.Event()
+        self._executor = None
+        self._dispatcher = None
+        self._stats_lock = threading.Lock()
+        self._delays = {}
+        self._polls = {}
+        self._errors = {}
+        self.delay_samples = delay_samples
+        for item in watchlist:
+            self.add(item)
+
+    def __enter__(self) -> 'HistogramPoller':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def add(self, item: WatchItem, due_at: float = None) -> None:
+        """Adds or replaces the item, it is polled at once by default"""
+        with self._condition:
+            self._push(item, time.monotonic() if due_at is None else due_at)
+            self._condition.notify()
+
+    def remove(self, item_name_id: str) -> None:
+        with self._condition:
+            self._items.pop(item_name_id, None)
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='HistogramPoller')
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name='HistogramPollerDispatcher',
+            daemon=True)
+        self._dispatcher.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._dispatcher is not None and wait:
+            self._dispatcher.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> dict[int, PollStats]:
+        """
+        Returns:
+        {priority: PollStats}
+        """
+        stats = {}
+        with self._stats_lock:
+            for priority, delays in self._delays.items():
+                ordered = sorted(delays)
+                if ordered:
+                    p95_index = min(len(ordered) - 1,
+                                    int(len(ordered) * 0.95))
+                    mean_delay = sum(ordered) / len(ordered)
+                    p95_delay = ordered[p95_index]
+                    max_delay = ordered[-1]
+                else:
+                    mean_delay = p95_delay = max_delay = 0
+                stats[priority] = PollStats(
+                    self._polls[priority], self._errors[priority],
+                    mean_delay, p95_delay, max_delay)
+        return stats
+
+    def _push(self, item: WatchItem, due_at: float) -> None:
+        # Only the last pushed entry of the item is valid, older entries
+        # are dropped when they reach the top of the heap
+        number = next(self._numbers)
+        self._items[item.item_name_id] = (item, number)
+        heap = self._heaps.setdefault(item.priority, [])
+        heapq.heappush(heap, (due_at, number, item))
+
+    def _dispatch(self) -> None:
+        while not self._stopped.is_set():
+            self._slots.acquire()
+            if not self._wait_for_due_item():
+                self._slots.release()
+                return
+            if self.rate_limiter:
+                self.rate_limiter.acquire(self.market.HISTOGRAM_URL)
+            with self._condition:
+                entry = self._pop_due_item()
+            if entry is None:  # removed while waiting for the budget
+                self._slots.release()
+                continue
+            due_at, number, item = entry
+            future = self._executor.submit(self._poll, item)
+            future.add_done_callback(
+                lambda future, item=item, due_at=due_at, number=number:
+                    self._on_polled(future, item, due_at, number))
+
+    def _wait_for_due_item(self) -> bool:
+        with self._condition:
+            while not self._stopped.is_set():
+                next_due_at = self._get_next_due_at()
+                now = time.monotonic()
+                if next_due_at is not None and next_due_at <= now:
+                    return True
+                timeout = None if next_due_at is None else next_due_at - now
+                self._condition.wait(timeout)
+            return False
+
+    def _get_next_due_at(self) -> Union[float, None]:
+        next_due_at = None
+        for heap in self._heaps.values():
+            self._drop_removed(heap)
+            if heap and (next_due_at is None or heap[0][0] < next_due_at):
+                next_due_at = heap[0][0]
+        return next_due_at
+
+    def _pop_due_item(self) -> Union[tuple[float, int, WatchItem], None]:
+        now = time.monotonic()
+        for priority in sorted(self._heaps):
+            heap = self._heaps[priority]
+            self._drop_removed(heap)
+            if heap and heap[0][0] <= now:
+                return heapq.heappop(heap)
+        return None
+
+    def _is_valid(self, item: WatchItem, number: int) -> bool:
+        return self._items.get(item.item_name_id) == (item, number)
+
+    def _drop_removed(self, heap: list) -> None:
+        while heap and not self._is_valid(heap[0][2], heap[0][1]):
+            heapq.heappop(heap)
+
+    def _poll(self, item: WatchItem) -> OrderBook:
+        histogram = self.market.get_orders_histogram(
+            item.item_name_id, item.app_id, item.market_hash_name, raw=True,
+            wait=False)
+        return OrderBook.from_histogram(histogram)
+
+    def _on_polled(self, future: Future, item: WatchItem, due_at: float,
+                   number: int) -> None:
+        self._slots.release()
+        now = time.monotonic()
+        error = future.exception()
+        with self._stats_lock:
+            delays = self._delays.setdefault(
+                item.priority, deque(maxlen=self.delay_samples))
+            self._polls[item.priority] = self._polls.get(item.priority, 0) + 1
+            self._errors.setdefault(item.priority, 0)
+            if error is None:
+                delays.append(now - due_at)
+            else:
+                self._errors[item.priority] += 1
+        with self._condition:
+            if self._is_valid(item, number):
+                self._push(item, max(due_at + item.interval, now))
+                self._condition.notify()
+        if error is not None:
+            if self.on_error:
+                self.on_error(item, error)
+            return
+        order_book = future.result()
+        if self.callback:
+            self.callback(item, order_book)
+        if self.result_queue is not None:
+            self.result_queue.put((item, order_book))
@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Union
+
+import requests
+
+from steamcom.exceptions import ApiException
+from steamcom.market import SteamMarket
+from steamcom.session_store import SqliteStore
+
+
+class ItemNameIdResolver(SqliteStore):
+    """
+    Keeps item_nameid of every (app_id, market_hash_name) in a SQLite file,
+    the listings page is downloaded only for unknown items
+    """
+    SCHEMA = ('CREATE TABLE IF NOT EXISTS item_name_ids ('
+              'app_id TEXT NOT NULL, '
+              'market_hash_name TEXT NOT NULL, '
+              'item_name_id TEXT NOT NULL, '
+              'PRIMARY KEY (app_id, market_hash_name))')
+
+    def __init__(self, path: str, market: SteamMarket,
+                 timeout: float = 30) -> None:
+        super().__init__(path, timeout)
+        self.market = market
+        self._item_name_ids = {}
+        # SqliteStore._lock guards connections, this one the dict
+        self._cache_lock = threading.Lock()
+
+    def get(self, app_id: str, market_hash_name: str) -> Union[str, None]:
+        """Returns the saved id without requests, None if it is unknown"""
+        key = (str(app_id), market_hash_name)
+        item_name_id = self._item_name_ids.get(key)
+        if item_name_id is None:
+            row = self._connection().execute(
+                'SELECT item_name_id FROM item_name_ids '
+                'WHERE app_id = ? AND market_hash_name = ?', key).fetchone()
+            if row:
+                item_name_id = row[0]
+                with self._cache_lock:
+                    self._item_name_ids[key] = item_name_id
+        return item_name_id
+
+    def resolve(self, app_id: str, market_hash_name: str) -> str:
+        item_name_id = self.get(app_id, market_hash_name)
+        if item_name_id is None:
+            item_name_id = self.market.get_item_name_id(app_id,
+                                                        market_hash_name)
+            self._save([(str(app_id), market_hash_name, item_name_id)])
+        return item_name_id
+
+    def warm_up(self, items: Iterable[tuple[str, str]], concurrency: int = 1,
+                delay: float = 3) -> dict:
+        """
+        Resolves many items, only the unknown ones are downloaded
+
+        items: (app_id, market_hash_name) pairs
+        delay: seconds before every download if the market has no
+            rate_limiter
+
+        Returns:
+        {(app_id, market_hash_name): item_name_id}, None for items that
+        could not be resolved
+        """
+        keys = [(str(app_id), market_hash_name)
+                for app_id, market_hash_name in items]
+        self._load_all()
+        resolved = {key: self._item_name_ids.get(key) for key in keys}
+        missing = [key for key, item_name_id in resolved.items()
+                   if item_name_id is None]
+
+        def download(key: tuple[str, str]) -> Union[str, None]:
+            if self.market.rate_limiter is None:
+                time.sleep(delay)
+            try:
+                item_name_id = self.market.get_item_name_id(*key)
+            except (ApiException, requests.RequestException):
+                return None
+            self._save([key + (item_name_id,)])
+            return item_name_id
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for key, item_name_id in zip(missing,
+                                         executor.map(download, missing)):
+                resolved[key] = item_name_id
+        return resolved
+
+    def _load_all(self) -> None:
+        rows = self._connection().execute(
+            'SELECT app_id, market_hash_name, item_name_id '
+            'FROM item_name_ids').fetchall()
+        with self._cache_lock:
+            for app_id, market_hash_name, item_name_id in rows:
+                self._item_name_ids[(app_id, market_hash_name)] = item_name_id
+
+    def _save(self, rows: list[tuple[str, str, str]]) -> None:
+        with self._connection() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO item_name_ids VALUES (?, ?, ?)', rows)
+        with self._cache_lock:
+            for app_id, market_hash_name, item_name_id in rows:
+                self._item_name_ids[(app_id, market_hash_name)] = item_name_id
@@ -6,6 +6,7 @@ import requests
 from steamcom.guard import generate_one_time_code
 from steamcom.models import SteamUrl, IAuthenticationServiceEndpoint
 from steamcom.utils import api_request
+from steamcom.tracing import span, traced
 
 
 class LoginExecutor:
@@ -19,8 +20,10 @@ class LoginExecutor:
         self.refresh_token =  '' # Will be added during login
         self.session = session
 
+    @traced('steamcom.login')
     def login(self) -> tuple[str, str]:
-        self.session.get(SteamUrl.COMMUNITY)  # to get a cookies
+        with span('steamcom.login.get_cookies'):
+            self.session.get(SteamUrl.COMMUNITY)  # to get a cookies
         rsa_key, rsa_timestamp = self._fetch_rsa_params()
         encrypted_password = self._encrypt_password(rsa_key)
         client_id, request_id = self._request_auth(encrypted_password,
@@ -32,6 +35,7 @@ class LoginExecutor:
         self._set_sessionid_cookies()
         return self.steam_id, self.refresh_token
 
+    @traced('steamcom.login.fetch_rsa_params')
     def _fetch_rsa_params(self) -> tuple[rsa.PublicKey, str]:
         url = IAuthenticationServiceEndpoint.GetPasswordRSAPublicKey
         headers = {'Referer': f'{SteamUrl.COMMUNITY}/', 'Origin': SteamUrl.COMMUNITY}
@@ -42,11 +46,13 @@ class LoginExecutor:
         rsa_timestamp = key_response['response']['timestamp']
         return rsa.PublicKey(rsa_mod, rsa_exp), rsa_timestamp
 
+    @traced('steamcom.login.encrypt_password')
     def _encrypt_password(self, rsa_key: rsa.PublicKey) -> bytes:
         encoded_password = self.password.encode('utf-8')
         encrypted_rsa = rsa.encrypt(encoded_password, rsa_key)
         return base64.b64encode(encrypted_rsa)
 
+    @traced('steamcom.login.request_auth')
     def _request_auth(self, encrypted_password: bytes, rsa_timestamp: str)\
             -> tuple[str, str]:
         url = IAuthenticationServiceEndpoint.BeginAuthSessionViaCredentials
@@ -64,6 +70,7 @@ class LoginExecutor:
         request_id = request_auth_response['response']['request_id']
         return client_id, request_id
 
+    @traced('steamcom.login.send_steam_guard_code')
     def _send_steam_guard_code(self, client_id: str) -> None:
         url =\
             IAuthenticationServiceEndpoint.UpdateAuthSessionWithSteamGuardCode
@@ -80,6 +87,7 @@ class LoginExecutor:
         }
         api_request(self.session, url, headers=headers, data=update_data)
 
+    @traced('steamcom.login.request_refresh_token')
     def _request_refresh_token(self, client_id: str, request_id: str) -> None:
         url = IAuthenticationServiceEndpoint.PollAuthSessionStatus
         headers = {'Referer': f'{SteamUrl.COMMUNITY}/', 'Origin': SteamUrl.COMMUNITY}
@@ -90,6 +98,7 @@ class LoginExecutor:
         poll_response = api_request(self.session, url, headers=headers, data=pool_data)
         self.refresh_token = poll_response['response']['refresh_token']
 
+    @traced('steamcom.login.finalize_login')
     def _finalize_login(self) -> dict:
         redir_url = SteamUrl.COMMUNITY + '/login/home/?goto='
         finalize_url = SteamUrl.LOGIN + '/jwt/finalizelogin'
@@ -106,6 +115,7 @@ class LoginExecutor:
             finalize_url, headers=headers,files=finalize_data).json()
         return finalize_response
 
+    @traced('steamcom.login.send_transfer_info')
     def _send_transfer_info(self, finalize_response: dict) -> None:
         parameters = finalize_response['transfer_info']
         for pass_data in parameters:
@@ -114,8 +124,10 @@ class LoginExecutor:
                 key: (None, str(value))
                 for key, value in pass_data['params'].items()
             }
-            self.session.post(pass_data['url'], files=multipart_fields)
+            with span('steamcom.login.transfer_info', url=pass_data['url']):
+                self.session.post(pass_data['url'], files=multipart_fields)
 
+    @traced('steamcom.login.set_sessionid_cookies')
     def _set_sessionid_cookies(self) -> None:
         community_domain = SteamUrl.COMMUNITY[8:]
         store_domain = SteamUrl.STORE[8:]
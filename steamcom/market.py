@@ -1,37 +1,69 @@
 from datetime import datetime
-from typing import Union
+import contextvars
+from typing import Callable, Iterable, Iterator, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import json
 import time
+import random
 import urllib.parse
 import re
 from decimal import Decimal
 
-from steamcom.utils import (login_required, text_between,
+from steamcom.utils import (login_required,
                             get_listing_id_to_assets_address_from_html,
-                            get_market_listings_from_html,
                             merge_items_with_descriptions_from_listing,
                             get_market_sell_listings_from_api, parse_history,
                             parse_graph, parse_orders_histogram,
-                            api_request)
-from steamcom.models import SteamUrl, Result
+                            api_request, wait_for_budget,
+                            get_history_event_key,
+                            get_item_name_id_from_html, is_transient_error)
+from steamcom.models import (SteamUrl, Result, ConfirmationType, SellItem,
+                             SellStatus, SellResult, CancelResult, BuyOrder,
+                             BuyOrderStatus, BuyOrderResult)
 from steamcom.exceptions import ApiException, SessionIsInvalid
 from steamcom.confirmations import ConfirmationExecutor
+from steamcom.rate_limiter import RateLimiter
+from steamcom.market_page import MarketPage, MarketPageCache
+from steamcom.tracing import span, traced
 
 
 class SteamMarket:
+    HISTORY_URL = SteamUrl.COMMUNITY + '/market/myhistory/render/'
+    LISTINGS_URL = SteamUrl.COMMUNITY + '/market/mylistings/render/'
+    SELL_URL = SteamUrl.COMMUNITY + '/market/sellitem/'
+    REMOVE_LISTING_URL = SteamUrl.COMMUNITY + '/market/removelisting/'
+    CANCEL_BUY_ORDER_URL = SteamUrl.COMMUNITY + '/market/cancelbuyorder/'
+    HISTOGRAM_URL = SteamUrl.COMMUNITY + '/market/itemordershistogram'
+    ITEM_LISTINGS_URL = SteamUrl.COMMUNITY + '/market/listings/'
+    CREATE_BUY_ORDER_URL = SteamUrl.COMMUNITY + '/market/createbuyorder/'
 
     def __init__(self, steam_id: str = '', currency_id: int = None,
                  confirmations: ConfirmationExecutor = None,
-                 session: requests.Session = requests.Session()) -> None:
+                 session: requests.Session = None,
+                 rate_limiter: RateLimiter = None,
+                 market_page_cache: MarketPageCache = None) -> None:
         self.steam_id = steam_id
         self.currency_id = currency_id
+        if session is None:
+            session = requests.Session()
         self.session = session
+        self.rate_limiter = rate_limiter
+        if market_page_cache is None:
+            market_page_cache = MarketPageCache(session)
+        self.market_page_cache = market_page_cache
         self.was_login_executed = False
         self.confirmations = confirmations
+        # (app_id, market_hash_name): (monotonic time, order or None)
+        self._buy_order_statuses = {}
 
     @login_required
-    def get_price_history(self, app_id: str, market_hash_name: str) -> dict:
+    def get_price_history(self, app_id: str, market_hash_name: str,
+                          raw: bool = False) -> Union[dict, list]:
+        """
+        raw: return graph dots as Steam sends them,
+            [['Oct 05 2022 21: +0', 99.435, '43'], ...]
+        """
         url = SteamUrl.COMMUNITY + '/market/pricehistory/'
         params = {'appid': app_id,
                   'market_hash_name': market_hash_name}
@@ -39,12 +71,23 @@ class SteamMarket:
         if not response_json.get("success"):
             text = 'Problem getting price history the order. success: '
             raise ApiException(text + str(response_json.get("success")))
+        if raw:
+            return response_json['prices']
         return parse_graph(response_json['prices'])
 
     def get_orders_histogram(self, item_name_id: str, app_id: str,
                              market_hash_name: str,
-                             currency_id: int = None) -> dict:
-        url = SteamUrl.COMMUNITY + '/market/itemordershistogram'
+                             currency_id: int = None,
+                             raw: bool = False, wait: bool = True) -> dict:
+        """
+        raw: return the response as Steam sends it, graphs have cumulative
+            quantities, see order_book.OrderBook.from_histogram
+        wait: wait for rate_limiter of the market, False when the caller
+            keeps the request rate itself, as HistogramPoller does
+        """
+        if wait and self.rate_limiter:
+            self.rate_limiter.acquire(self.HISTOGRAM_URL)
+        url = self.HISTOGRAM_URL
         params = {
             'country': 'RU',
             'language': 'english',
@@ -61,95 +104,121 @@ class SteamMarket:
         if 'buy_order_graph' not in response\
                 or 'sell_order_graph' not in response:
             raise ApiException('Buy or sell order graph not in body')
+        if raw:
+            return response
         return parse_orders_histogram(response)
 
-    @login_required
-    def get_my_market_listings(self, delay: int = 3) -> dict:
-        response = self.session.get(SteamUrl.COMMUNITY + '/market')
+    def get_item_name_id(self, app_id: str, market_hash_name: str) -> str:
+        """
+        Downloads the item listings page, the id never changes, keep it in
+        item_name_ids.ItemNameIdResolver instead of calling it again
+        """
+        url = self.ITEM_LISTINGS_URL + '{}/{}'.format(
+            app_id, urllib.parse.quote(market_hash_name))
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        response = self.session.get(url)
         if response.status_code != 200:
-            text = 'Problem getting the listings. http code: {}'
+            text = 'Problem getting the item page. http code: {}'
             raise ApiException(text.format(response.status_code))
-        print('Received market page')
-        assets_descriptions = json.loads(
-            text_between(response.text, 'var g_rgAssets = ', ';\n'))
-        listing_id_to_assets_address = \
-            get_listing_id_to_assets_address_from_html(response.text)
-        listings = get_market_listings_from_html(response.text)
-        listings = merge_items_with_descriptions_from_listing(
-            listings, listing_id_to_assets_address, assets_descriptions)
-        listings_end = '<span id="tabContentsMyActiveMarketListings_end">'
-        listings_total = '<span id="tabContentsMyActiveMarketListings_total">'
-        if listings_end in response.text:
-            n_showing = int(text_between(response.text,
-                                         listings_end, '</span>'))
-            n_total = int(text_between(
-                response.text, listings_total, '</span>').replace(',', ''))
+        return get_item_name_id_from_html(response.text)
+
+    def get_market_page(self, max_age: float = None) -> MarketPage:
+        return self.market_page_cache.get(max_age)
+
+    @login_required
+    @traced('steamcom.market.get_my_market_listings')
+    def get_my_market_listings(self, delay: int = 3, concurrency: int = 1,
+                               page_size: int = 100,
+                               max_age: float = 0) -> dict:
+        """
+        concurrency: how many mylistings/render pages are downloaded at
+            the same time when there are more than 1000 listings, pages
+            are merged in order. Pass rate_limiter to SteamMarket to keep
+            the request rate, otherwise every page waits delay seconds
+        page_size: listings per page, Steam returns at most 100
+        max_age: how old the cached /market page can be, the page is
+            downloaded again by default, see get_market_page
+        """
+        with span('steamcom.market.get_market_page'):
+            market_page = self.get_market_page(max_age)
+        if market_page.status_code != 200:
+            text = 'Problem getting the listings. http code: {}'
+            raise ApiException(text.format(market_page.status_code))
+        with span('steamcom.market.parse_market_page'):
+            listings = market_page.listings
+        if market_page.listings_count:
+            n_showing, n_total = market_page.listings_count
             if n_showing < n_total < 1000:
                 listings_2 = self._parse_listings(n_showing, -1)
                 print('Received listings')
-                listings['sell_listings']\
-                    = listings['sell_listings'] | listings_2
-            else:
-                for i in range(0, n_total, 100):
-                    time.sleep(delay)
-                    listings_2 = self._parse_listings(n_showing + i, 100)
-                    print(f'Received listings {i}/{n_total}')
-                    listings['sell_listings']\
-                        = listings['sell_listings'] | listings_2
+                listings['sell_listings'].update(listings_2)
+            elif n_showing < n_total:
+                starts = range(n_showing, n_total, page_size)
+                pages = self._parse_listings_pages(starts, page_size, n_total,
+                                                   delay, concurrency)
+                for listings_2 in pages:
+                    listings['sell_listings'].update(listings_2)
         return listings
 
+    def _parse_listings_pages(self, starts: Iterable[int], count: int,
+                              n_total: int, delay: int,
+                              concurrency: int) -> Iterator[dict]:
+        def parse_page(start: int) -> dict:
+            wait_for_budget(self.rate_limiter, self.LISTINGS_URL, delay)
+            listings_2 = self._parse_listings(start, count)
+            print(f'Received listings {start}/{n_total}')
+            return listings_2
+
+        if concurrency <= 1:
+            return map(parse_page, starts)
+        # Every page gets a copy of the context to keep the current span
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(contextvars.copy_context().run,
+                                       parse_page, start)
+                       for start in starts]
+            return [future.result() for future in futures]
+
     def _parse_listings(self, start: int, count: int) -> dict:
-        url = '{}/market/mylistings/render/?query=&start={}&count={}'\
-            .format(SteamUrl.COMMUNITY, start, count)
-        jresp = api_request(self.session, url)
-        listing_id_to_assets_address =\
-            get_listing_id_to_assets_address_from_html(
-                jresp.get('hovers'))
-        listings_2 = get_market_sell_listings_from_api(
-            jresp.get('results_html'))
-        listings_2 = merge_items_with_descriptions_from_listing(
-            listings_2, listing_id_to_assets_address,
-            jresp.get('assets'))
+        url = '{}?query=&start={}&count={}'.format(self.LISTINGS_URL,
+                                                   start, count)
+        with span('steamcom.market.listings_page', start=start):
+            with span('steamcom.market.listings_page.request'):
+                jresp = api_request(self.session, url)
+            with span('steamcom.market.listings_page.parse'):
+                listing_id_to_assets_address =\
+                    get_listing_id_to_assets_address_from_html(
+                        jresp.get('hovers'))
+                listings_2 = get_market_sell_listings_from_api(
+                    jresp.get('results_html'))
+                listings_2 = merge_items_with_descriptions_from_listing(
+                    listings_2, listing_id_to_assets_address,
+                    jresp.get('assets'))
         return listings_2['sell_listings']
 
     @login_required
+    @traced('steamcom.market.create_buy_order')
     def create_buy_order(self, app_id: str, market_hash_name: str,
                          price_single_item: str, quantity: int,
                          confirm: bool = True) -> dict:
         if confirm and not self.confirmations.identity_secret:
             raise ValueError('Cannot be confirmed without identity_secret')
-        data = {
-            'sessionid': self.session.cookies.get_dict(domain='steamcommunity.com').get('sessionid'),
-            'currency': self.currency_id,
-            'appid': app_id,
-            'market_hash_name': market_hash_name,
-            'price_total': str(Decimal(price_single_item) * Decimal(quantity)),
-            'tradefee_tax': 0,
-            'quantity': quantity,
-            'billing_state': '',
-            'save_my_address': 0,
-            'confirmation': 0
-        }
-        url_name = urllib.parse.quote(market_hash_name)
-        referer = f'{SteamUrl.COMMUNITY}/market/listings/{app_id}/{url_name}'
-        headers = {'Referer': referer}
-        url = SteamUrl.COMMUNITY + '/market/createbuyorder/'
-        response = api_request(self.session, url, headers=headers, data=data)
+        order = BuyOrder(app_id, market_hash_name, price_single_item,
+                         quantity)
+        response = self._post_buy_order(order)
         if response['success'] == Result.OK.value:
             return response
         elif response['success'] == Result.PENDING.value:
             if confirm:
                 confirmation_id = response['confirmation']['confirmation_id']
-                confirmations = self.confirmations.get_confirmations()
-                for confirmation in confirmations:
-                    if confirmation.creator_id != confirmation_id:
-                        continue
+                confirmation = self.confirmations.find_confirmations(
+                    [confirmation_id]).get(str(confirmation_id))
+                if confirmation is not None:
                     conf_status = self.confirmations.respond_to_confirmation(confirmation)
                     if not conf_status:
                         raise ApiException('Confirmation failed')
                 print('Order confirmed')
-                data['confirmation'] = confirmation_id
-                response_after_conf = api_request(self.session, url, headers=headers, data=data)
+                response_after_conf = self._post_buy_order(order, confirmation_id)
                 if response_after_conf['success'] == Result.OK.value:
                     return response_after_conf
                 else:
@@ -159,6 +228,94 @@ class SteamMarket:
         else:
             raise ApiException(response)
 
+    @login_required
+    def create_buy_orders(self, orders: Iterable[BuyOrder],
+                          concurrency: int = 1, confirm: bool = True,
+                          delay: float = 1) -> list[BuyOrderResult]:
+        """
+        Places all orders, then confirms the pending ones together with one
+        confirmation list fetch and one multiajaxop request
+
+        orders: BuyOrder or tuples with the same fields
+        concurrency: how many createbuyorder requests are sent at the same
+            time, pass rate_limiter to SteamMarket to keep the request
+            rate, otherwise every request waits delay seconds
+
+        Returns:
+        BuyOrderResult for every order in the same order
+        """
+        if confirm and not self.confirmations.identity_secret:
+            raise ValueError('Cannot be confirmed without identity_secret')
+        orders = [BuyOrder(*order) for order in orders]
+
+        def place(order: BuyOrder, confirmation_id: str = None)\
+                -> BuyOrderResult:
+            wait_for_budget(self.rate_limiter, self.CREATE_BUY_ORDER_URL,
+                            delay)
+            try:
+                response = self._post_buy_order(order, confirmation_id)
+            except (ApiException, requests.RequestException) as e:
+                return BuyOrderResult(order, BuyOrderStatus.FAILED,
+                                      error=str(e))
+            if response['success'] == Result.OK.value:
+                return BuyOrderResult(order, BuyOrderStatus.PLACED, response)
+            elif response['success'] == Result.PENDING.value:
+                return BuyOrderResult(
+                    order, BuyOrderStatus.PENDING_CONFIRMATION, response)
+            return BuyOrderResult(order, BuyOrderStatus.FAILED, response,
+                                  response.get('message'))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(place, orders))
+            pending = {
+                i: str(result.response['confirmation']['confirmation_id'])
+                for i, result in enumerate(results)
+                if result.status == BuyOrderStatus.PENDING_CONFIRMATION}
+            if not confirm or not pending:
+                return results
+            found = self.confirmations.find_confirmations(pending.values())
+            if not found:
+                return results
+            confirmed = [i for i, confirmation_id in pending.items()
+                         if confirmation_id in found]
+            if not self.confirmations.respond_to_confirmations(
+                    found.values()):
+                # orders without a found confirmation stay pending
+                for i in confirmed:
+                    results[i] = results[i]._replace(
+                        status=BuyOrderStatus.FAILED,
+                        error='Confirmation failed')
+                return results
+            placed = executor.map(
+                lambda i: place(results[i].order, pending[i]), confirmed)
+            for i, result in zip(confirmed, placed):
+                results[i] = result
+        return results
+
+    @traced('steamcom.market.createbuyorder')
+    def _post_buy_order(self, order: BuyOrder,
+                        confirmation_id: str = None) -> dict:
+        data = {
+            'sessionid': self.session.cookies.get_dict(domain='steamcommunity.com').get('sessionid'),
+            'currency': self.currency_id,
+            'appid': order.app_id,
+            'market_hash_name': order.market_hash_name,
+            'price_total': str(Decimal(order.price_single_item) * Decimal(order.quantity)),
+            'tradefee_tax': 0,
+            'quantity': order.quantity,
+            'billing_state': '',
+            'save_my_address': 0,
+            'confirmation': confirmation_id or 0
+        }
+        url_name = urllib.parse.quote(order.market_hash_name)
+        referer = f'{SteamUrl.COMMUNITY}/market/listings/{order.app_id}/{url_name}'
+        headers = {'Referer': referer}
+        response = api_request(self.session, self.CREATE_BUY_ORDER_URL,
+                               headers=headers, data=data)
+        self.market_page_cache.invalidate()
+        self._buy_order_statuses.clear()
+        return response
+
     @login_required
     def create_sell_order(self, asset_id: str, app_id: str, context_id: str,
                           money_to_receive: str, amount: int = 1) -> dict:
@@ -172,18 +329,116 @@ class SteamMarket:
         }
         referer = f'{SteamUrl.COMMUNITY}/profiles/{self.steam_id}/inventory'
         headers = {'Referer': referer}
-        url = SteamUrl.COMMUNITY + '/market/sellitem/'
+        url = self.SELL_URL
         response = api_request(self.session, url, headers=headers, data=data)
+        self.market_page_cache.invalidate()
         if not response['success']:
             raise ApiException(response['message'])
         return response
 
+    @login_required
+    def sell_many(self, items: Iterable[SellItem], concurrency: int = 1,
+                  confirm: bool = True, confirm_batch_size: int = 100,
+                  delay: float = 1) -> dict[str, SellResult]:
+        """
+        Lists items while confirming already created listings in batches
+        with one multiajaxop request. Steam does not tell which
+        confirmation belongs to which asset, so only listing confirmations
+        created after the call started are confirmed, listings created at
+        the same time by another program would be confirmed too
+
+        items: SellItem or tuples with the same fields
+        concurrency: how many sellitem requests are sent at the same time,
+            pass rate_limiter to SteamMarket to keep the request rate,
+            otherwise every request waits delay seconds
+
+        Returns:
+        SellResult by asset_id in the order the responses were received
+        """
+        if confirm and not self.confirmations.identity_secret:
+            raise ValueError('Cannot be confirmed without identity_secret')
+
+        def sell(item: SellItem) -> dict:
+            wait_for_budget(self.rate_limiter, self.SELL_URL, delay)
+            return self.create_sell_order(*item)
+
+        results = {}
+        pending = []
+        unbatched = 0
+        # confirmed listings not matched to a sellitem response yet
+        confirmed = 0
+        # confirmations that existed before the call belong to other listings
+        known_ids = self._get_listing_confirmation_ids() if confirm else set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {}
+            for item in items:
+                item = SellItem(*item)
+                futures[executor.submit(sell, item)] = item
+            for future in as_completed(futures):
+                asset_id = futures[future].asset_id
+                try:
+                    response = future.result()
+                except (ApiException, requests.RequestException) as e:
+                    results[asset_id] = SellResult(
+                        asset_id, SellStatus.FAILED, error=str(e))
+                    continue
+                status = SellStatus.LISTED
+                if response.get('requires_confirmation'):
+                    status = SellStatus.PENDING_CONFIRMATION
+                    pending.append(asset_id)
+                    unbatched += 1
+                results[asset_id] = SellResult(asset_id, status, response)
+                if confirm and unbatched >= confirm_batch_size:
+                    unbatched = 0
+                    confirmed = self._confirm_listings(
+                        pending, results, known_ids, confirmed)
+        if confirm and pending:
+            self._confirm_listings(pending, results, known_ids, confirmed)
+        return results
+
+    def _get_listing_confirmation_ids(self) -> set[str]:
+        return {confirmation.id
+                for confirmation in self.confirmations.get_confirmations()
+                if confirmation.type == ConfirmationType.CREATE_LISTING}
+
+    def _confirm_listings(self, pending: list[str],
+                          results: dict[str, SellResult],
+                          known_ids: set[str], confirmed: int) -> int:
+        """
+        Confirms listings created after known_ids were taken and marks as
+        many pending assets LISTED as there are confirmed listings, in the
+        order the responses were received. Confirmations of listings still
+        in flight are counted for their assets, assets whose confirmation
+        is not in the list yet stay PENDING_CONFIRMATION
+
+        confirmed: confirmed listings not matched to an asset before
+
+        Returns:
+        Confirmed listings that are still not matched to an asset
+        """
+        confirmations = [
+            confirmation
+            for confirmation in self.confirmations.get_confirmations()
+            if confirmation.type == ConfirmationType.CREATE_LISTING
+            and confirmation.id not in known_ids]
+        if confirmations\
+                and self.confirmations.respond_to_confirmations(confirmations):
+            known_ids.update(confirmation.id for confirmation in confirmations)
+            confirmed += len(confirmations)
+        listed = pending[:confirmed]
+        for asset_id in listed:
+            results[asset_id] = results[asset_id]._replace(
+                status=SellStatus.LISTED)
+        del pending[:len(listed)]
+        return confirmed - len(listed)
+
     @login_required
     def cancel_sell_order(self, sell_listing_id: str) -> None:
-        url = f'{SteamUrl.COMMUNITY}/market/removelisting/{sell_listing_id}'
+        url = self.REMOVE_LISTING_URL + sell_listing_id
         data = {'sessionid': self.session.cookies.get_dict(domain='steamcommunity.com').get('sessionid')}
         headers = {'Referer': SteamUrl.COMMUNITY + '/market/'}
         response = self.session.post(url, data=data, headers=headers)
+        self.market_page_cache.invalidate()
         if not response.ok:
             text = 'Problem removing the listing. http code: {}'
             raise ApiException(text.format(response.status_code))
@@ -195,10 +450,72 @@ class SteamMarket:
             'buy_orderid': buy_order_id
         }
         headers = {'Referer': SteamUrl.COMMUNITY + '/market'}
-        url = SteamUrl.COMMUNITY + '/market/cancelbuyorder/'
+        url = self.CANCEL_BUY_ORDER_URL
         response = api_request(self.session, url, headers=headers, data=data)
+        self.market_page_cache.invalidate()
+        self._buy_order_statuses.clear()
         return response
 
+    @login_required
+    def cancel_many(self, listing_ids: Iterable[str] = (),
+                    buy_order_ids: Iterable[str] = (), concurrency: int = 1,
+                    attempts: int = 3, delay: float = 1) -> dict:
+        """
+        Cancels sell listings and buy orders, cancellations failed by
+        network errors, 429 or 5xx http codes are retried up to attempts
+        times with a growing pause, other failures are not retried
+
+        concurrency: how many requests are sent at the same time, pass
+            rate_limiter to SteamMarket to keep the request rate,
+            otherwise every request waits delay seconds
+
+        Returns:
+        {'sell_listings': {id: CancelResult}, 'buy_orders': {id: CancelResult}}
+        """
+        def cancel_sell_order(listing_id: str) -> CancelResult:
+            return self._cancel_with_retries(
+                self.cancel_sell_order, listing_id, self.REMOVE_LISTING_URL,
+                attempts, delay)
+
+        def cancel_buy_order(buy_order_id: str) -> CancelResult:
+            return self._cancel_with_retries(
+                self._cancel_buy_order_or_raise, buy_order_id,
+                self.CANCEL_BUY_ORDER_URL, attempts, delay)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            sell_futures = [executor.submit(cancel_sell_order, listing_id)
+                            for listing_id in listing_ids]
+            buy_futures = [executor.submit(cancel_buy_order, buy_order_id)
+                           for buy_order_id in buy_order_ids]
+            sell_results = [future.result() for future in sell_futures]
+            buy_results = [future.result() for future in buy_futures]
+        return {
+            'sell_listings': {result.id: result for result in sell_results},
+            'buy_orders': {result.id: result for result in buy_results}
+        }
+
+    def _cancel_with_retries(self, cancel: Callable[[str], None],
+                             cancel_id: str, url: str, attempts: int,
+                             delay: float) -> CancelResult:
+        error = None
+        for attempt in range(1, attempts + 1):
+            wait_for_budget(self.rate_limiter, url, delay)
+            try:
+                cancel(cancel_id)
+                return CancelResult(cancel_id, True, attempt)
+            except (ApiException, requests.RequestException) as e:
+                error = f'{type(e).__name__}: {e}'
+                if not is_transient_error(e):
+                    return CancelResult(cancel_id, False, attempt, error)
+                if attempt < attempts:
+                    time.sleep(delay * attempt * random.uniform(0.5, 1.5))
+        return CancelResult(cancel_id, False, attempts, error)
+
+    def _cancel_buy_order_or_raise(self, buy_order_id: str) -> None:
+        response = self.cancel_buy_order(buy_order_id)
+        if response.get('success') != Result.OK.value:
+            raise ApiException(response)
+
     @login_required
     def check_placed_buy_order(self, app_id: str,
                                market_hash_name: str) -> Union[None, dict]:
@@ -223,16 +540,83 @@ class SteamMarket:
             'market_hash_name': order['hash_name']
         }
 
+    @login_required
+    def get_buy_order_statuses(self, items: Iterable[tuple[str, str]],
+                               max_age: float = None, fallback: bool = True,
+                               concurrency: int = 1, delay: float = 3)\
+            -> dict[tuple[str, str], Union[dict, None]]:
+        """
+        Looks placed buy orders of many items up in one /market page, item
+        pages are downloaded only for items that are missing there
+
+        items: (app_id, market_hash_name) pairs
+        max_age: how many seconds the page and results are reused,
+            market_page_cache.ttl by default
+        fallback: check items missing on the page with
+            check_placed_buy_order, every check waits delay seconds if
+            there is no rate_limiter. Errors of the checks are raised
+            except for items no one is selling
+
+        Returns:
+        {(app_id, market_hash_name): order as in check_placed_buy_order,
+        None if there is no order}
+        """
+        max_age = self.market_page_cache.ttl if max_age is None else max_age
+        keys = [(str(app_id), market_hash_name)
+                for app_id, market_hash_name in items]
+        statuses = {}
+        now = time.monotonic()
+        for key in keys:
+            cached = self._buy_order_statuses.get(key)
+            if cached is not None and now - cached[0] < max_age:
+                statuses[key] = cached[1]
+        missing = [key for key in keys if key not in statuses]
+        if not missing:
+            return statuses
+
+        page_orders = {}
+        for order in self.get_market_page(max_age).buy_orders.values():
+            app_id = order['item_link'].split('/')[-2]
+            page_orders[(app_id, order['market_hash_name'])] = order
+        not_on_page = []
+        for key in missing:
+            if key in page_orders:
+                statuses[key] = dict(page_orders[key])
+            elif fallback:
+                not_on_page.append(key)
+            else:
+                statuses[key] = None
+
+        def check(key: tuple[str, str]) -> Union[dict, None]:
+            wait_for_budget(self.rate_limiter, self.ITEM_LISTINGS_URL, delay)
+            try:
+                return self.check_placed_buy_order(*key)
+            except ApiException as e:
+                if str(e) != 'No one is selling this item':
+                    raise
+                return None
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for key, order in zip(not_on_page,
+                                  executor.map(check, not_on_page)):
+                statuses[key] = order
+        now = time.monotonic()
+        for key in missing:
+            self._buy_order_statuses[key] = (now, statuses[key])
+        return statuses
+
     def get_my_history(self, events_value: int = 5000, delay: int = 3,
                        attempts: int = 3) -> dict:
         pages = int(events_value/500)
         last_page_value = events_value % 500
         start = 0
         history = []
+        history_keys = set()
         while start-pages*500 < 0:
             if attempts > 0:
                 try:
-                    time.sleep(delay)
+                    wait_for_budget(self.rate_limiter, self.HISTORY_URL,
+                                    delay)
                     page = self._get_market_history_page(start)
                     text = 'History page {}/{} received'
                     print(text.format(int(start/500)+1,
@@ -243,20 +627,23 @@ class SteamMarket:
                     attempts -= 1
                     continue
             else:
-                time.sleep(delay)
+                wait_for_budget(self.rate_limiter, self.HISTORY_URL, delay)
                 page = self._get_market_history_page(start)
                 text = 'History page {}/{} received'
                 print(text.format(int(start/500)+1,
                       pages+min(last_page_value, 1)))
             start += 500
             for event in page:
-                if event not in history:
+                event_key = get_history_event_key(event)
+                if event_key not in history_keys:
+                    history_keys.add(event_key)
                     history.append(event)
         else:
             if last_page_value > 0:
                 while attempts > 0:
                     try:
-                        time.sleep(delay)
+                        wait_for_budget(self.rate_limiter, self.HISTORY_URL,
+                                        delay)
                         page = self._get_market_history_page(
                             start, last_page_value)
                         text = 'History page {}/{} received'
@@ -269,25 +656,30 @@ class SteamMarket:
                         attempts -= 1
                         continue
                 else:
-                    time.sleep(delay)
+                    wait_for_budget(self.rate_limiter, self.HISTORY_URL,
+                                    delay)
                     page = self._get_market_history_page(
                             start, last_page_value)
                     text = 'History page {}/{} received'
                     print(text.format(int(start/500)+1,
                           pages+min(last_page_value, 1)))
                 for event in page:
-                    if event not in history:
+                    event_key = get_history_event_key(event)
+                    if event_key not in history_keys:
+                        history_keys.add(event_key)
                         history.append(event)
         return history
 
     def get_my_history_up_to_date(self, date: datetime, delay: int = 3,
                                   attempts: int = 3) -> dict:
         history = []
+        history_keys = set()
         start = 0
         while True:
             if attempts > 0:
                 try:
-                    time.sleep(delay)
+                    wait_for_budget(self.rate_limiter, self.HISTORY_URL,
+                                    delay)
                     page = self._get_market_history_page(start)
                     print('History page received')
                 except (TypeError, ApiException) as e:
@@ -296,14 +688,16 @@ class SteamMarket:
                     attempts -= 1
                     continue
             else:
-                time.sleep(delay)
+                wait_for_budget(self.rate_limiter, self.HISTORY_URL, delay)
                 page = self._get_market_history_page(start)
                 print('History page received')
             start += 500
             for event in page:
                 event_time = datetime.fromtimestamp(event['time_event'])
-                if event not in history:
+                event_key = get_history_event_key(event)
+                if event_key not in history_keys:
                     if event_time >= date:
+                        history_keys.add(event_key)
                         history.append(event)
                     else:
                         return history
@@ -311,7 +705,7 @@ class SteamMarket:
 
     def _get_market_history_page(self, start: int = 0,
                                  count: int = 500) -> dict:
-        url = SteamUrl.COMMUNITY + '/market/myhistory/render/'
+        url = self.HISTORY_URL
         params = {
             'start': start,
             'count': count,
@@ -0,0 +1,145 @@
+import copy
+import json
+import threading
+import time
+from functools import cached_property
+from typing import Iterable, Union
+
+import requests
+
+from steamcom.utils import (text_between, get_steam_id_from_html,
+                            get_raw_wallet_info_from_html, create_wallet_info,
+                            get_market_listings_from_html,
+                            get_listing_id_to_assets_address_from_html,
+                            merge_items_with_descriptions_from_listing)
+from steamcom.models import SteamUrl, WalletInfo
+from steamcom.parsers import MarketHtmlParser
+
+
+def copy_listings(listings: Iterable[tuple[str, dict]]) -> dict:
+    return {listing_id: copy.deepcopy(listing)
+            for listing_id, listing in listings}
+
+
+class MarketPage:
+    """
+    Snapshot of the /market page, every part is parsed on the first access
+    and only once
+    """
+
+    def __init__(self, html: str, status_code: int = 200,
+                 parser: MarketHtmlParser = None) -> None:
+        self.html = html
+        self.status_code = status_code
+        self.parser = parser
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    @cached_property
+    def steam_id(self) -> Union[str, None]:
+        return get_steam_id_from_html(self.html)
+
+    @cached_property
+    def raw_wallet_info(self) -> dict:
+        return get_raw_wallet_info_from_html(self.html)
+
+    @cached_property
+    def wallet_info(self) -> WalletInfo:
+        return create_wallet_info(self.raw_wallet_info)
+
+    @property
+    def balance(self) -> float:
+        return self.wallet_info.balance
+
+    @property
+    def listings(self) -> dict:
+        """
+        Returns:
+        {'buy_orders': dict, 'sell_listings': dict} as on the page, sell
+        listings awaiting confirmation included. Listings are copies, the
+        page can be shared between threads
+        """
+        return {'buy_orders': self.buy_orders,
+                'sell_listings': copy_listings(
+                    self._listings['sell_listings'].items())}
+
+    @cached_property
+    def _listings(self) -> dict:
+        assets_descriptions = json.loads(
+            text_between(self.html, 'var g_rgAssets = ', ';\n'))
+        listing_id_to_assets_address = \
+            get_listing_id_to_assets_address_from_html(self.html)
+        listings = get_market_listings_from_html(self.html, self.parser)
+        return merge_items_with_descriptions_from_listing(
+            listings, listing_id_to_assets_address, assets_descriptions)
+
+    @property
+    def sell_listings(self) -> dict:
+        return copy_listings(
+            (listing_id, listing) for listing_id, listing
+            in self._listings['sell_listings'].items()
+            if not listing['need_confirmation'])
+
+    @property
+    def listings_to_confirm(self) -> dict:
+        return copy_listings(
+            (listing_id, listing) for listing_id, listing
+            in self._listings['sell_listings'].items()
+            if listing['need_confirmation'])
+
+    @property
+    def buy_orders(self) -> dict:
+        return copy_listings(self._listings['buy_orders'].items())
+
+    @cached_property
+    def listings_count(self) -> Union[tuple[int, int], None]:
+        """
+        Returns:
+        (listings on the page, all active listings) or None if the page
+        has no listings
+        """
+        listings_end = '<span id="tabContentsMyActiveMarketListings_end">'
+        listings_total = '<span id="tabContentsMyActiveMarketListings_total">'
+        if listings_end not in self.html:
+            return None
+        n_showing = int(text_between(self.html, listings_end, '</span>'))
+        n_total = int(text_between(
+            self.html, listings_total, '</span>').replace(',', ''))
+        return n_showing, n_total
+
+
+class MarketPageCache:
+    URL = SteamUrl.COMMUNITY + '/market'
+
+    def __init__(self, session: requests.Session, ttl: float = 60,
+                 parser: MarketHtmlParser = None) -> None:
+        """
+        ttl: how many seconds the downloaded page is reused
+        """
+        self.session = session
+        self.ttl = ttl
+        self.parser = parser
+        self.page = None
+        self._lock = threading.Lock()
+
+    def get(self, max_age: float = None) -> MarketPage:
+        """
+        max_age: ttl for this call, 0 to always download the page
+        """
+        max_age = self.ttl if max_age is None else max_age
+        # Threads that ask at the same time wait for one download
+        with self._lock:
+            page = self.page
+            if page is None or page.age >= max_age:
+                response = self.session.get(self.URL)
+                page = MarketPage(response.text, response.status_code,
+                                  self.parser)
+                if response.status_code == 200:
+                    self.page = page
+            return page
+
+    def invalidate(self) -> None:
+        self.page = None
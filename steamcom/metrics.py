@@ -0,0 +1,187 @@
+import re
+import threading
+from typing import NamedTuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+
+# url part to endpoint name, the longest matched part wins as in RateLimiter
+ENDPOINTS = {
+    '/inventory/': 'inventory',
+    '/market/myhistory': 'myhistory',
+    '/market/itemordershistogram': 'itemordershistogram',
+    '/market/sellitem': 'sellitem',
+    '/market/createbuyorder': 'createbuyorder',
+    '/market/mylistings': 'mylistings',
+    '/market/pricehistory': 'pricehistory',
+    '/market/listings/': 'listings',
+    '/mobileconf/': 'mobileconf',
+}
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SUCCESS_REGEX = re.compile(rb'\s*\{\s*"success"\s*:\s*(true|false|-?\d+)')
+
+
+class RequestMetric(NamedTuple):
+    endpoint: str
+    method: str
+    status_code: int
+    latency: float  # seconds until the response headers were received
+    size: int  # bytes of the body
+    success: Union[int, None] = None  # steam success code of json bodies
+
+
+def get_endpoint(url: str) -> str:
+    matched_part = ''
+    for part in ENDPOINTS:
+        if part in url and len(part) > len(matched_part):
+            matched_part = part
+    if matched_part:
+        return ENDPOINTS[matched_part]
+    return urlsplit(url).hostname or 'other'
+
+
+def get_success_code(content: bytes) -> Union[int, None]:
+    """
+    Reads success from the beginning of the body without parsing json,
+    steam puts it first in nearly every response
+    """
+    match = SUCCESS_REGEX.match(content[:64])
+    if not match:
+        return None
+    value = match.group(1)
+    if value == b'true':
+        return 1
+    if value == b'false':
+        return 0
+    return int(value)
+
+
+def instrument_session(session: requests.Session, sink) -> None:
+    """
+    Every response of the session is recorded with sink.record(metric),
+    sink must be thread-safe if the session is used from many threads
+    """
+    def record(response: requests.Response, *args, **kwargs)\
+            -> requests.Response:
+        if kwargs.get('stream'):
+            size = int(response.headers.get('Content-Length', 0))
+            success = None
+        else:
+            size = len(response.content)
+            success = get_success_code(response.content)
+        sink.record(RequestMetric(
+            get_endpoint(response.url), response.request.method,
+            response.status_code, response.elapsed.total_seconds(), size,
+            success))
+        return response
+
+    session.hooks['response'].append(record)
+
+
+class InMemoryMetrics:
+    """Aggregates metrics by endpoint, latencies in LATENCY_BUCKETS"""
+
+    def __init__(self) -> None:
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, metric: RequestMetric) -> None:
+        with self._lock:
+            stats = self._endpoints.get(metric.endpoint)
+            if stats is None:
+                stats = self._endpoints[metric.endpoint] = {
+                    'count': 0, 'latency_sum': 0.0, 'latency_max': 0.0,
+                    'latency_buckets': [0] * len(LATENCY_BUCKETS),
+                    'bytes': 0, 'status_codes': {}, 'success_codes': {}}
+            stats['count'] += 1
+            stats['latency_sum'] += metric.latency
+            stats['latency_max'] = max(stats['latency_max'], metric.latency)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if metric.latency <= bound:
+                    stats['latency_buckets'][i] += 1
+                    break
+            stats['bytes'] += metric.size
+            status_codes = stats['status_codes']
+            status_codes[metric.status_code] = \
+                status_codes.get(metric.status_code, 0) + 1
+            if metric.success is not None:
+                success_codes = stats['success_codes']
+                success_codes[metric.success] = \
+                    success_codes.get(metric.success, 0) + 1
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Returns:
+        {endpoint: {'count': int, 'latency_sum': float, 'latency_max': float,
+        'latency_buckets': [requests in every LATENCY_BUCKETS interval],
+        'bytes': int, 'status_codes': {code: count},
+        'success_codes': {code: count}}}
+        """
+        with self._lock:
+            return {endpoint: {
+                        **stats,
+                        'latency_buckets': list(stats['latency_buckets']),
+                        'status_codes': dict(stats['status_codes']),
+                        'success_codes': dict(stats['success_codes'])}
+                    for endpoint, stats in self._endpoints.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self, prefix: str = 'steamcom') -> str:
+        return export_prometheus(self.get_stats(), prefix)
+
+
+def export_prometheus(stats: dict[str, dict],
+                      prefix: str = 'steamcom') -> str:
+    """
+    stats: InMemoryMetrics.get_stats()
+
+    Returns:
+    Prometheus text exposition format
+    """
+    duration = f'{prefix}_request_duration_seconds'
+    lines = [f'# HELP {duration} Time until the response headers by endpoint',
+             f'# TYPE {duration} histogram']
+    for endpoint, endpoint_stats in sorted(stats.items()):
+        label = f'endpoint="{endpoint}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS,
+                                endpoint_stats['latency_buckets']):
+            cumulative += count
+            lines.append(f'{duration}_bucket{{{label},le="{bound}"}} '
+                         f'{cumulative}')
+        lines.append(f'{duration}_bucket{{{label},le="+Inf"}} '
+                     f'{endpoint_stats["count"]}')
+        lines.append(f'{duration}_sum{{{label}}} '
+                     f'{endpoint_stats["latency_sum"]}')
+        lines.append(f'{duration}_count{{{label}}} {endpoint_stats["count"]}')
+
+    response_bytes = f'{prefix}_response_bytes_total'
+    lines += [f'# HELP {response_bytes} Received body bytes by endpoint',
+              f'# TYPE {response_bytes} counter']
+    for endpoint, endpoint_stats in sorted(stats.items()):
+        lines.append(f'{response_bytes}{{endpoint="{endpoint}"}} '
+                     f'{endpoint_stats["bytes"]}')
+
+    responses = f'{prefix}_responses_total'
+    lines += [f'# HELP {responses} Responses by endpoint and HTTP status',
+              f'# TYPE {responses} counter']
+    for endpoint, endpoint_stats in sorted(stats.items()):
+        for status_code, count in sorted(
+                endpoint_stats['status_codes'].items()):
+            lines.append(f'{responses}{{endpoint="{endpoint}",'
+                         f'status="{status_code}"}} {count}')
+
+    success = f'{prefix}_steam_success_total'
+    lines += [f'# HELP {success} Json responses by endpoint and steam '
+              f'success code',
+              f'# TYPE {success} counter']
+    for endpoint, endpoint_stats in sorted(stats.items()):
+        for success_code, count in sorted(
+                endpoint_stats['success_codes'].items()):
+            lines.append(f'{success}{{endpoint="{endpoint}",'
+                         f'success="{success_code}"}} {count}')
+    return '\n'.join(lines) + '\n'
@@ -1,5 +1,6 @@
 import enum
-from typing import NamedTuple
+from collections.abc import Mapping
+from typing import Any, Iterator, NamedTuple
 
 
 class SteamUrl:
@@ -90,6 +91,130 @@ class FeePrice(NamedTuple):
     seller_receive: int
 
 
+class SellItem(NamedTuple):
+    asset_id: str
+    app_id: str
+    context_id: str
+    money_to_receive: str
+    amount: int = 1
+
+
+class SellStatus(enum.Enum):
+    LISTED = 'listed'
+    PENDING_CONFIRMATION = 'pending_confirmation'
+    FAILED = 'failed'
+
+
+class SellResult(NamedTuple):
+    asset_id: str
+    status: SellStatus
+    response: dict = None
+    error: str = None
+
+
+class BuyOrder(NamedTuple):
+    app_id: str
+    market_hash_name: str
+    price_single_item: str
+    quantity: int
+
+
+class BuyOrderStatus(enum.Enum):
+    PLACED = 'placed'
+    PENDING_CONFIRMATION = 'pending_confirmation'
+    FAILED = 'failed'
+
+
+class BuyOrderResult(NamedTuple):
+    order: BuyOrder
+    status: BuyOrderStatus
+    response: dict = None
+    error: str = None
+
+
+class CancelResult(NamedTuple):
+    id: str
+    success: bool
+    attempts: int
+    error: str = None
+
+
+class AccountResult(NamedTuple):
+    username: str
+    value: Any = None
+    error: Exception = None
+
+
+class WatchItem(NamedTuple):
+    item_name_id: str
+    app_id: str
+    market_hash_name: str
+    priority: int = 0  # 0 is the most important
+    interval: float = 60  # seconds between refreshes
+
+
+class ConfirmationRule(NamedTuple):
+    """
+    Matches a confirmation when every given condition is true, None means
+    any value
+    """
+    types: frozenset = None  # ConfirmationType values
+    headline: str = None  # substring of Confirmation.headline
+    creator_ids: frozenset = None
+    cancel: bool = False  # cancel matched confirmations instead of allowing
+
+
+class DescriptionTable(dict):
+    """
+    Inventory descriptions by classid_instanceid, every description is
+    stored once and shared by all assets with this key
+    """
+
+    def intern(self, description_key: str, description: dict) -> dict:
+        return self.setdefault(description_key, description)
+
+
+class Asset(Mapping):
+    """
+    Inventory item, read-only view over the shared description with
+    own id, amount and contextid. Use to_dict() to get a mutable copy
+    """
+    __slots__ = ('id', 'amount', 'contextid', 'description_key',
+                 'description')
+    OWN_FIELDS = ('contextid', 'id', 'amount')
+
+    def __init__(self, id: str, amount: str, contextid: str,
+                 description_key: str, description: dict) -> None:
+        self.id = id
+        self.amount = amount
+        self.contextid = contextid
+        self.description_key = description_key
+        self.description = description
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.OWN_FIELDS:
+            return getattr(self, key)
+        return self.description[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.description:
+            if key not in self.OWN_FIELDS:
+                yield key
+        yield from self.OWN_FIELDS
+
+    def __len__(self) -> int:
+        own_in_description = sum(
+            1 for key in self.OWN_FIELDS if key in self.description)
+        return len(self.description) + len(self.OWN_FIELDS)\
+            - own_in_description
+
+    def __repr__(self) -> str:
+        return f'Asset({self.to_dict()})'
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+
 class HistoryStatus(enum.IntEnum):
     LISTED = 1
     CANCELED = 2
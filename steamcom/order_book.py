@@ -0,0 +1,123 @@
+import time
+from typing import NamedTuple, Union
+
+import numpy as np
+
+
+class OrderBookDiff(NamedTuple):
+    """Changed levels, changes are new quantity minus previous quantity"""
+    bid_prices: np.ndarray
+    bid_changes: np.ndarray
+    ask_prices: np.ndarray
+    ask_changes: np.ndarray
+
+    @property
+    def is_empty(self) -> bool:
+        return not len(self.bid_prices) and not len(self.ask_prices)
+
+
+class OrderBook:
+    """
+    Buy orders (bids) sorted by price from the highest and sell listings
+    (asks) sorted from the lowest, kept as parallel price and quantity
+    arrays
+    """
+
+    def __init__(self, bid_prices: np.ndarray, bid_quantities: np.ndarray,
+                 ask_prices: np.ndarray, ask_quantities: np.ndarray,
+                 fetched_at: float = None) -> None:
+        self.bid_prices = bid_prices
+        self.bid_quantities = bid_quantities
+        self.ask_prices = ask_prices
+        self.ask_quantities = ask_quantities
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @classmethod
+    def from_histogram(cls, histogram: dict,
+                       fetched_at: float = None) -> 'OrderBook':
+        """
+        histogram: get_orders_histogram(..., raw=True) response
+        """
+        bid_prices, bid_quantities = _get_levels_from_graph(
+            histogram['buy_order_graph'])
+        ask_prices, ask_quantities = _get_levels_from_graph(
+            histogram['sell_order_graph'])
+        return cls(bid_prices, bid_quantities, ask_prices, ask_quantities,
+                   fetched_at)
+
+    @property
+    def best_bid(self) -> Union[float, None]:
+        return float(self.bid_prices[0]) if len(self.bid_prices) else None
+
+    @property
+    def best_ask(self) -> Union[float, None]:
+        return float(self.ask_prices[0]) if len(self.ask_prices) else None
+
+    @property
+    def spread(self) -> Union[float, None]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    def get_bid_quantity(self, price: float) -> int:
+        """Buy orders at exactly this price"""
+        index = np.searchsorted(-self.bid_prices, -price)
+        if index < len(self.bid_prices) and self.bid_prices[index] == price:
+            return int(self.bid_quantities[index])
+        return 0
+
+    def get_ask_quantity(self, price: float) -> int:
+        """Sell listings at exactly this price"""
+        index = np.searchsorted(self.ask_prices, price)
+        if index < len(self.ask_prices) and self.ask_prices[index] == price:
+            return int(self.ask_quantities[index])
+        return 0
+
+    def get_bid_depth(self, price: float) -> int:
+        """Buy orders at this price or higher"""
+        index = np.searchsorted(-self.bid_prices, -price, side='right')
+        return int(self.bid_quantities[:index].sum())
+
+    def get_ask_depth(self, price: float) -> int:
+        """Sell listings at this price or lower"""
+        index = np.searchsorted(self.ask_prices, price, side='right')
+        return int(self.ask_quantities[:index].sum())
+
+    def diff(self, previous: 'OrderBook') -> OrderBookDiff:
+        bid_prices, bid_changes = _diff_levels(
+            self.bid_prices[::-1], self.bid_quantities[::-1],
+            previous.bid_prices[::-1], previous.bid_quantities[::-1])
+        ask_prices, ask_changes = _diff_levels(
+            self.ask_prices, self.ask_quantities,
+            previous.ask_prices, previous.ask_quantities)
+        return OrderBookDiff(bid_prices[::-1], bid_changes[::-1],
+                             ask_prices, ask_changes)
+
+
+def _get_levels_from_graph(graph: list) -> tuple[np.ndarray, np.ndarray]:
+    # Graph levels are [price, cumulative quantity, label], np.diff with
+    # prepend is several times slower than the subtraction for such sizes
+    prices = np.array([level[0] for level in graph], dtype=np.float64)
+    depths = np.array([level[1] for level in graph], dtype=np.int64)
+    quantities = np.empty_like(depths)
+    quantities[:1] = depths[:1]
+    np.subtract(depths[1:], depths[:-1], out=quantities[1:])
+    return prices, quantities
+
+
+def _diff_levels(prices: np.ndarray, quantities: np.ndarray,
+                 previous_prices: np.ndarray,
+                 previous_quantities: np.ndarray)\
+        -> tuple[np.ndarray, np.ndarray]:
+    """Prices must be sorted from the lowest"""
+    if np.array_equal(prices, previous_prices):
+        changes = quantities - previous_quantities
+        changed = changes != 0
+        return prices[changed], changes[changed]
+    all_prices = np.union1d(prices, previous_prices)
+    changes = np.zeros(len(all_prices), dtype=np.int64)
+    changes[np.searchsorted(all_prices, prices)] += quantities
+    changes[np.searchsorted(all_prices, previous_prices)]\
+        -= previous_quantities
+    changed = changes != 0
+    return all_prices[changed], changes[changed]
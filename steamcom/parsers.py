@@ -0,0 +1,236 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+import urllib.parse as urlparse
+
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional, BeautifulSoupParser is used instead
+    lxml = None
+
+
+LISTING_ID_REGEX = re.compile('mylisting_\\d+')
+BUY_ORDER_ID_REGEX = re.compile('mybuyorder_\\d+')
+
+
+def parse_price(price_string: str) -> float:
+    price_string_without_space = price_string.replace(' ', '')
+    price_without_letters = re.sub(r"[^0-9,]", "", price_string_without_space)
+    price_with_dot_instead_comma = price_without_letters.replace(',', '.')
+    return float(price_with_dot_instead_comma)
+
+
+def create_sell_listing(listing_id: str, buyer_pay: str, you_receive: str,
+                        listed_date: str) -> dict:
+    datetime_now = datetime.now()
+    created_on = listed_date.strip() + f' {datetime_now.year}'
+    created_datetime = datetime.strptime(created_on, '%d %b %Y')
+    if created_datetime.month > datetime_now.month\
+        or (created_datetime.month == datetime_now.month
+            and created_datetime.day > datetime_now.day):
+        created_datetime = created_datetime.replace(
+            year=datetime_now.year-1)
+    timestamp = created_datetime.timestamp()
+    return {
+        'listing_id': listing_id,
+        'buyer_pay': parse_price(buyer_pay.strip()),
+        'you_receive': parse_price(you_receive.strip()[1:-1]),
+        'created_on': created_on,
+        'created_timestamp': int(timestamp),
+        'need_confirmation': False
+    }
+
+
+def create_buy_order(order_id: str, quantity_and_price: str, item_name: str,
+                     item_link: str) -> dict:
+    qnt_price_raw = quantity_and_price.split("@")
+    return {
+        'order_id': order_id,
+        'quantity': int(qnt_price_raw[0].strip()),
+        'price': parse_price(qnt_price_raw[1].strip()),
+        'item_name': item_name,
+        'item_link': item_link,
+        'market_hash_name': urlparse.unquote(
+            item_link.split('/')[-1], encoding='utf-8', errors='replace')
+    }
+
+
+def get_sell_listings_from_node(node: Tag) -> dict:
+    sell_listings_raw = node.find_all('div', {'id': LISTING_ID_REGEX})
+    sell_listings_dict = {}
+    for listing_raw in sell_listings_raw:
+        spans = listing_raw.select('span[title]')
+        if 'Sold!' in spans[0].text:
+            continue
+        created_date = listing_raw.find_all(
+                'div', {'class': 'market_listing_listed_date'})[0]
+        listing = create_sell_listing(
+            listing_raw.attrs['id'].replace('mylisting_', ''),
+            spans[0].text, spans[1].text, created_date.text)
+        sell_listings_dict[listing['listing_id']] = listing
+    return sell_listings_dict
+
+
+def get_buy_orders_from_node(node: Tag) -> dict:
+    buy_orders_raw = node.find_all('div', {'id': BUY_ORDER_ID_REGEX})
+    buy_orders_dict = {}
+    for order in buy_orders_raw:
+        qnt_price_raw = order.select('span[class=market_listing_price]')[0]
+        regex = 'a[class=market_listing_item_name_link]'
+        item_link = order.select(regex)[0]['href']
+        order = create_buy_order(
+            order.attrs['id'].replace('mybuyorder_', ''), qnt_price_raw.text,
+            order.a.text, item_link)
+        buy_orders_dict[order['order_id']] = order
+    return buy_orders_dict
+
+
+class MarketHtmlParser(ABC):
+    """
+    Parses /market page and mylistings/render chunks, every backend
+    returns the same dicts
+    """
+
+    @abstractmethod
+    def get_market_listings_from_html(self, html: str) -> dict:
+        pass
+
+    @abstractmethod
+    def get_market_sell_listings_from_api(self, html: str) -> dict:
+        pass
+
+
+class BeautifulSoupParser(MarketHtmlParser):
+
+    def get_market_listings_from_html(self, html: str) -> dict:
+        document = BeautifulSoup(html, 'html.parser')
+        nodes = document.select('div[id=myListings]')[0].find_all(
+            'div', {'class': 'market_home_listing_table'})
+        sell_listings_dict = {}
+        buy_orders_dict = {}
+        for node in nodes:
+            if node.select('#my_market_selllistings_number'):
+                sell_listings_dict = get_sell_listings_from_node(node)
+            elif node.select('#my_market_listingstoconfirm_number'):
+                sell_listings_awaiting_conf = get_sell_listings_from_node(node)
+                for listing in sell_listings_awaiting_conf.values():
+                    listing['need_confirmation'] = True
+                sell_listings_dict.update(sell_listings_awaiting_conf)
+            elif node.select('#my_market_buylistings_number'):
+                buy_orders_dict = get_buy_orders_from_node(node)
+        return {'buy_orders': buy_orders_dict,
+                'sell_listings': sell_listings_dict}
+
+    def get_market_sell_listings_from_api(self, html: str) -> dict:
+        document = BeautifulSoup(html, 'html.parser')
+        sell_listings_dict = get_sell_listings_from_node(document)
+        return {'sell_listings': sell_listings_dict}
+
+
+class LxmlParser(MarketHtmlParser):
+    """Several times faster than BeautifulSoupParser, needs lxml package"""
+
+    def __init__(self) -> None:
+        if lxml is None:
+            raise ImportError('LxmlParser requires lxml package')
+        self.html_parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def get_market_listings_from_html(self, html: str) -> dict:
+        document = self._parse(html)
+        my_listings = document.xpath('//div[@id="myListings"]')[0]
+        nodes = [node for node in my_listings.iterdescendants('div')
+                 if self._has_class(node, 'market_home_listing_table')]
+        sell_listings_dict = {}
+        buy_orders_dict = {}
+        for node in nodes:
+            if self._has_id(node, 'my_market_selllistings_number'):
+                sell_listings_dict = self._get_sell_listings(node)
+            elif self._has_id(node, 'my_market_listingstoconfirm_number'):
+                sell_listings_awaiting_conf = self._get_sell_listings(node)
+                for listing in sell_listings_awaiting_conf.values():
+                    listing['need_confirmation'] = True
+                sell_listings_dict.update(sell_listings_awaiting_conf)
+            elif self._has_id(node, 'my_market_buylistings_number'):
+                buy_orders_dict = self._get_buy_orders(node)
+        return {'buy_orders': buy_orders_dict,
+                'sell_listings': sell_listings_dict}
+
+    def get_market_sell_listings_from_api(self, html: str) -> dict:
+        if not html or not html.strip():
+            return {'sell_listings': {}}
+        document = self._parse(html)
+        return {'sell_listings': self._get_sell_listings(document)}
+
+    def _parse(self, html: str):
+        return lxml.html.document_fromstring(html.encode('utf-8'),
+                                             parser=self.html_parser)
+
+    def _get_sell_listings(self, node) -> dict:
+        sell_listings_dict = {}
+        for listing_raw in node.iterdescendants('div'):
+            listing_id = listing_raw.get('id')
+            if not listing_id or not LISTING_ID_REGEX.search(listing_id):
+                continue
+            spans = [span.text_content()
+                     for span in listing_raw.iterdescendants('span')
+                     if span.get('title') is not None]
+            if 'Sold!' in spans[0]:
+                continue
+            created_date = next(
+                div for div in listing_raw.iterdescendants('div')
+                if self._has_class(div, 'market_listing_listed_date'))
+            listing = create_sell_listing(
+                listing_id.replace('mylisting_', ''), spans[0], spans[1],
+                created_date.text_content())
+            sell_listings_dict[listing['listing_id']] = listing
+        return sell_listings_dict
+
+    def _get_buy_orders(self, node) -> dict:
+        buy_orders_dict = {}
+        for order in node.iterdescendants('div'):
+            order_id = order.get('id')
+            if not order_id or not BUY_ORDER_ID_REGEX.search(order_id):
+                continue
+            qnt_price_raw = next(
+                span for span in order.iterdescendants('span')
+                if self._class_equals(span, 'market_listing_price'))
+            item_link = next(
+                a for a in order.iterdescendants('a')
+                if self._class_equals(a, 'market_listing_item_name_link'))
+            first_link = next(order.iterdescendants('a'))
+            order = create_buy_order(
+                order_id.replace('mybuyorder_', ''),
+                qnt_price_raw.text_content(), first_link.text_content(),
+                item_link.get('href'))
+            buy_orders_dict[order['order_id']] = order
+        return buy_orders_dict
+
+    @staticmethod
+    def _has_class(node, class_name: str) -> bool:
+        return class_name in (node.get('class') or '').split()
+
+    @staticmethod
+    def _class_equals(node, class_value: str) -> bool:
+        return ' '.join((node.get('class') or '').split()) == class_value
+
+    @staticmethod
+    def _has_id(node, element_id: str) -> bool:
+        return bool(node.xpath('.//*[@id=$element_id]',
+                               element_id=element_id))
+
+
+_default_parser = None
+
+
+def get_default_parser() -> MarketHtmlParser:
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = LxmlParser() if lxml else BeautifulSoupParser()
+    return _default_parser
+
+
+def set_default_parser(parser: MarketHtmlParser) -> None:
+    global _default_parser
+    _default_parser = parser
@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Mapping
+
+from requests.adapters import BaseAdapter
+
+from steamcom.client import SteamClient
+from steamcom.models import AccountResult
+from steamcom.rate_limiter import RateLimiter
+from steamcom.session_store import SessionStore
+from steamcom.transport import create_transport
+
+
+class AccountPool:
+
+    def __init__(self, accounts: Iterable[Mapping[str, str]] = (),
+                 max_workers: int = 16, pool_connections: int = 4,
+                 pool_maxsize: int = 4,
+                 rate_limiter_factory: Callable[[], RateLimiter] = None,
+                 transport_factory: Callable[[], BaseAdapter] = None,
+                 metrics=None) -> None:
+        """
+        accounts: dicts with username, password, shared_secret and
+            identity_secret keys
+        max_workers: how many accounts are processed at the same time
+        pool_connections, pool_maxsize: connection pool of every account,
+            see transport.HttpTransport
+        rate_limiter_factory: called once per account, the budgets of
+            one account do not slow down the others
+        transport_factory: called once per account instead of using
+            pool_connections and pool_maxsize, see steamcom.transport
+        metrics: sink shared by all accounts, see steamcom.metrics
+        """
+        self.max_workers = max_workers
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter_factory = rate_limiter_factory
+        self.transport_factory = transport_factory
+        self.metrics = metrics
+        self.clients = {}
+        self._executor = None
+        for account in accounts:
+            self.add_account(**account)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __iter__(self) -> Iterator[SteamClient]:
+        return iter(list(self.clients.values()))
+
+    def __getitem__(self, username: str) -> SteamClient:
+        return self.clients[username]
+
+    def __enter__(self) -> 'AccountPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_account(self, username: str, password: str = '',
+                    shared_secret: str = '',
+                    identity_secret: str = '') -> SteamClient:
+        rate_limiter = self.rate_limiter_factory()\
+            if self.rate_limiter_factory else None
+        if self.transport_factory:
+            transport = self.transport_factory()
+        else:
+            transport = create_transport(self.pool_connections,
+                                         self.pool_maxsize, retries=0)
+        client = SteamClient(username, password, shared_secret,
+                             identity_secret, rate_limiter=rate_limiter,
+                             transport=transport, metrics=self.metrics)
+        self.clients[username] = client
+        return client
+
+    def map(self, func: Callable[[SteamClient], object],
+            usernames: Iterable[str] = None) -> dict[str, AccountResult]:
+        """
+        Calls func(client) for every account from the thread pool, an
+        exception of one account does not stop the others
+
+        Returns:
+        {username: AccountResult}, value is what func returned
+        """
+        if usernames is None:
+            usernames = list(self.clients)
+        clients = [self.clients[username] for username in usernames]
+        executor = self._get_executor()
+        futures = [(client.username, executor.submit(func, client))
+                   for client in clients]
+        results = {}
+        for username, future in futures:
+            try:
+                results[username] = AccountResult(username, future.result())
+            except Exception as e:
+                results[username] = AccountResult(username, error=e)
+        return results
+
+    def login_all(self) -> dict[str, AccountResult]:
+        return self.map(lambda client: client.login(),
+                        [client.username for client in self
+                         if not client.was_login_executed])
+
+    def restore_all(self, session_store: SessionStore)\
+            -> dict[str, AccountResult]:
+        """
+        Calls login_or_restore for every account without a session,
+        value is True if the saved session was restored
+        """
+        return self.map(lambda client: client.login_or_restore(session_store),
+                        [client.username for client in self
+                         if not client.was_login_executed])
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for client in self.clients.values():
+            client.session.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='AccountPool')
+        return self._executor
@@ -0,0 +1,138 @@
+import calendar
+import os
+import threading
+import urllib.parse
+from typing import Union
+
+import numpy as np
+
+from steamcom.market import SteamMarket
+
+
+PRICE_POINT_DTYPE = np.dtype([('timestamp', '<i8'), ('price', '<f8'),
+                              ('volume', '<i8')])
+MONTHS = {name: number for number, name in enumerate(calendar.month_abbr)
+          if name}
+
+
+def parse_price_points(graph: list) -> np.ndarray:
+    """
+    graph: get_price_history(..., raw=True) dots,
+        [['Oct 05 2022 21: +0', 99.435, '43'], ...]
+
+    Returns:
+    Structured array of PRICE_POINT_DTYPE sorted by timestamp, timestamps
+    are unix seconds in UTC
+    """
+    points = np.empty(len(graph), dtype=PRICE_POINT_DTYPE)
+    day_timestamps = {}
+    for i, dot in enumerate(graph):
+        # strptime is slow, the day part repeats 24 times in a row
+        day = dot[0][:11]
+        day_timestamp = day_timestamps.get(day)
+        if day_timestamp is None:
+            day_timestamp = calendar.timegm(
+                (int(day[7:11]), MONTHS[day[:3]], int(day[4:6]), 0, 0, 0))
+            day_timestamps[day] = day_timestamp
+        points[i] = (day_timestamp + int(dot[0][12:14]) * 3600, dot[1],
+                     int(dot[2]))
+    points.sort(order='timestamp', kind='stable')
+    return points
+
+
+class PriceHistoryStore:
+    """
+    Keeps price history of every item in its own append-only file of
+    PRICE_POINT_DTYPE records, files are read through np.memmap
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def get_path(self, app_id: str, market_hash_name: str) -> str:
+        file_name = urllib.parse.quote(market_hash_name, safe='') + '.bin'
+        return os.path.join(self.directory, str(app_id), file_name)
+
+    def load(self, app_id: str, market_hash_name: str) -> np.ndarray:
+        """
+        Returns:
+        Read-only memory-mapped array of PRICE_POINT_DTYPE, empty if the
+        item has no history, use ['timestamp'], ['price'] and ['volume']
+        to get the columns
+        """
+        path = self.get_path(app_id, market_hash_name)
+        n_points = self._count_points(path)
+        if not n_points:
+            return np.empty(0, dtype=PRICE_POINT_DTYPE)
+        return np.memmap(path, dtype=PRICE_POINT_DTYPE, mode='r',
+                         shape=(n_points,))
+
+    def get_last_timestamp(self, app_id: str,
+                           market_hash_name: str) -> Union[int, None]:
+        path = self.get_path(app_id, market_hash_name)
+        n_points = self._count_points(path)
+        if not n_points:
+            return None
+        with open(path, 'rb') as file:
+            file.seek((n_points - 1) * PRICE_POINT_DTYPE.itemsize)
+            last_point = np.frombuffer(
+                file.read(PRICE_POINT_DTYPE.itemsize), dtype=PRICE_POINT_DTYPE)
+        return int(last_point['timestamp'][0])
+
+    def append(self, app_id: str, market_hash_name: str,
+               points: np.ndarray) -> int:
+        """
+        Writes only the points newer than the last stored one
+
+        Returns:
+        How many points were written
+        """
+        path = self.get_path(app_id, market_hash_name)
+        with self._get_lock(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._drop_partial_point(path)
+            last_timestamp = self.get_last_timestamp(app_id, market_hash_name)
+            points = np.asarray(points, dtype=PRICE_POINT_DTYPE)
+            if last_timestamp is not None:
+                points = points[points['timestamp'] > last_timestamp]
+            if len(points):
+                with open(path, 'ab') as file:
+                    file.write(points.tobytes())
+            return len(points)
+
+    def update(self, market: SteamMarket, app_id: str,
+               market_hash_name: str) -> int:
+        """
+        Downloads the price history of the item and appends new points
+
+        Returns:
+        How many points were written
+        """
+        graph = market.get_price_history(app_id, market_hash_name, raw=True)
+        return self.append(app_id, market_hash_name,
+                           parse_price_points(graph))
+
+    def _get_lock(self, path: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    @staticmethod
+    def _count_points(path: str) -> int:
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+        return size // PRICE_POINT_DTYPE.itemsize
+
+    @staticmethod
+    def _drop_partial_point(path: str) -> None:
+        # A process killed while writing leaves a part of the last point
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size % PRICE_POINT_DTYPE.itemsize:
+            with open(path, 'r+b') as file:
+                file.truncate(size - size % PRICE_POINT_DTYPE.itemsize)
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from typing import Mapping, Union
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        """
+        rate: how many requests per second are allowed on average
+        capacity: how many requests can be sent in a burst
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError('rate must be positive and capacity at least 1')
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes tokens from the bucket, the balance can go below zero
+
+        Returns:
+        How many seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity,
+                               self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+
+    def __init__(self, budgets: Mapping[str, Union[TokenBucket, float]],
+                 default: Union[TokenBucket, float] = None) -> None:
+        """
+        budgets: url part to bucket, for example
+            {'/inventory/': TokenBucket(0.5), '/market/myhistory/render/': 0.3}
+            a float is treated as the rate of a bucket with capacity 1
+        default: bucket for urls without a budget, unlimited if None
+        """
+        self.budgets = {endpoint: self._to_bucket(bucket)
+                        for endpoint, bucket in budgets.items()}
+        self.default = self._to_bucket(default) if default else None
+
+    def get_bucket(self, url: str) -> Union[TokenBucket, None]:
+        matched_endpoint = ''
+        for endpoint in self.budgets:
+            if endpoint in url and len(endpoint) > len(matched_endpoint):
+                matched_endpoint = endpoint
+        if matched_endpoint:
+            return self.budgets[matched_endpoint]
+        return self.default
+
+    def reserve(self, url: str) -> float:
+        bucket = self.get_bucket(url)
+        if bucket is None:
+            return 0
+        return bucket.reserve()
+
+    def acquire(self, url: str) -> None:
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str) -> None:
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _to_bucket(bucket: Union[TokenBucket, float]) -> TokenBucket:
+        if isinstance(bucket, TokenBucket):
+            return bucket
+        return TokenBucket(bucket)
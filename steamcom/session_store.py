@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, Mapping, Union
+
+
+class SqliteStore:
+    """
+    SQLite file with a connection per thread, one store can be used from
+    many threads and processes
+    """
+    SCHEMA = ''
+
+    def __init__(self, path: str, timeout: float = 30) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []  # connections of every thread
+        self._generation = 0  # increased by close, older connections closed
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute(self.SCHEMA)
+
+    def close(self) -> None:
+        """
+        Closes connections of all threads, the store opens new ones when
+        it is used again
+        """
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._generation += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can not be used by many threads at once,
+        # check_same_thread is off only to close them from close()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None\
+                or self._local.generation != self._generation:
+            connection = sqlite3.connect(self.path, timeout=self.timeout,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with self._lock:
+                self._connections.append(connection)
+                self._local.generation = self._generation
+            self._local.connection = connection
+        return connection
+
+
+class SessionStore(SqliteStore):
+    """Keeps extracted sessions by username"""
+    SCHEMA = ('CREATE TABLE IF NOT EXISTS sessions ('
+              'username TEXT PRIMARY KEY, '
+              'session TEXT NOT NULL, '
+              'updated_at REAL NOT NULL)')
+
+    def save(self, username: str, extracted_session: Mapping) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)',
+                (username, json.dumps(extracted_session), time.time()))
+
+    def load(self, username: str) -> Union[dict, None]:
+        row = self._connection().execute(
+            'SELECT session FROM sessions WHERE username = ?',
+            (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_many(self, usernames: Iterable[str] = None) -> dict:
+        """
+        Returns:
+        {username: extracted_session}, all saved sessions if usernames is
+        None, usernames without a session are missing
+        """
+        rows = self._connection().execute(
+            'SELECT username, session FROM sessions').fetchall()
+        sessions = {username: json.loads(session)
+                    for username, session in rows}
+        if usernames is None:
+            return sessions
+        return {username: sessions[username] for username in usernames
+                if username in sessions}
+
+    def delete(self, username: str) -> None:
+        with self._connection() as connection:
+            connection.execute('DELETE FROM sessions WHERE username = ?',
+                               (username,))
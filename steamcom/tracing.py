@@ -0,0 +1,53 @@
+import functools
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
+
+
+class NoOpSpan:
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException, **kwargs) -> None:
+        pass
+
+
+class NoOpTracer:
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: dict = None,
+                              **kwargs) -> Iterator[NoOpSpan]:
+        yield NoOpSpan()
+
+
+_tracer = NoOpTracer()
+
+
+def set_tracer(tracer) -> None:
+    """
+    tracer: opentelemetry.trace.Tracer or any object with
+        start_as_current_span(name, attributes=...) context manager, None
+        to turn tracing off
+    """
+    global _tracer
+    _tracer = tracer if tracer is not None else NoOpTracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name: str, **attributes) -> ContextManager:
+    """Nested span of the current one, the tracer is read on every call"""
+    return _tracer.start_as_current_span(name, attributes=attributes or None)
+
+
+def traced(name: str) -> Callable:
+    """Runs every call of the decorated function in a span"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def func_wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return func_wrapper
+    return decorator
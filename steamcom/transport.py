@@ -0,0 +1,275 @@
+import email.message
+import json
+import random
+import socket
+import time
+from typing import Callable, Union
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+# HTTP/1.1 connection headers are not allowed in HTTP/2
+HOP_BY_HOP_HEADERS = frozenset({'connection', 'keep-alive', 'proxy-connection',
+                                'transfer-encoding', 'upgrade'})
+
+
+def get_backoff_time(retry_number: int, backoff_factor: float) -> float:
+    """
+    Exponential backoff multiplied by a random factor from 0.5 to 1.5, so
+    sessions that failed together do not retry at the same moment
+    """
+    if retry_number < 1:
+        return 0
+    return backoff_factor * 2 ** (retry_number - 1) * random.uniform(0.5, 1.5)
+
+
+class JitterRetry(Retry):
+
+    def get_backoff_time(self) -> float:
+        consecutive_errors = len(self.history)
+        for error in reversed(self.history):
+            if error.redirect_location:
+                consecutive_errors -= 1
+        backoff_max = getattr(self, 'backoff_max', self.DEFAULT_BACKOFF_MAX)
+        return min(backoff_max,
+                   get_backoff_time(consecutive_errors, self.backoff_factor))
+
+
+def create_retry(retries: int = 3, backoff_factor: float = 0.5) -> Retry:
+    """
+    Retries connection errors of every request, read errors and
+    RETRY_STATUSES only for idempotent methods, POST requests to steam
+    are never sent twice
+    """
+    return JitterRetry(total=retries, connect=retries, read=retries,
+                       status=retries,
+                       backoff_factor=backoff_factor,
+                       status_forcelist=RETRY_STATUSES,
+                       allowed_methods=IDEMPOTENT_METHODS,
+                       raise_on_status=False)
+
+
+class HttpTransport(HTTPAdapter):
+    """urllib3 connection pools with jittered retries of idempotent requests"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 4,
+                 retries: int = 3, backoff_factor: float = 0.5,
+                 pool_block: bool = False, tcp_keepalive: bool = False)\
+            -> None:
+        """
+        pool_connections: how many hosts keep their connections, steam uses
+            steamcommunity.com, store, login and api hosts
+        pool_maxsize: how many connections are kept open to one host
+        pool_block: wait for a free connection instead of opening one more
+            when pool_maxsize connections are busy
+        tcp_keepalive: keep idle connections alive with SO_KEEPALIVE, for
+            sessions that make a request once in minutes
+        """
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(pool_connections, pool_maxsize,
+                         create_retry(retries, backoff_factor), pool_block)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self.tcp_keepalive:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options\
+                + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _RawResponse:
+    """The part of urllib3 response requests reads to extract cookies"""
+
+    def __init__(self, headers: list[tuple[str, str]]) -> None:
+        self.msg = email.message.Message()
+        for name, value in headers:
+            self.msg[name] = value
+        self._original_response = self
+
+    def info(self) -> email.message.Message:
+        return self.msg
+
+    def release_conn(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def build_response(request: requests.PreparedRequest, status_code: int,
+                   content: bytes, headers: list[tuple[str, str]],
+                   adapter: BaseAdapter, reason: str = '')\
+        -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict()
+    for name, value in headers:
+        if name in response.headers:
+            response.headers[name] += ', ' + value
+        else:
+            response.headers[name] = value
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = content
+    response.raw = _RawResponse(headers)
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+class Http2Transport(BaseAdapter):
+    """
+    Sends requests of a requests.Session through httpx, requests to one
+    host are multiplexed over one HTTP/2 connection, needs httpx[http2]
+    """
+
+    def __init__(self, pool_maxsize: int = 4, retries: int = 3,
+                 backoff_factor: float = 0.5, keepalive_expiry: float = 60,
+                 transport: 'httpx.BaseTransport' = None) -> None:
+        """
+        transport: httpx transport to send requests with, cookies and
+            redirects are handled by requests.Session
+        """
+        if httpx is None:
+            raise ImportError('Http2Transport requires httpx, '
+                              'pip install steamcom[http2]')
+        super().__init__()
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        if transport is None:
+            limits = httpx.Limits(max_connections=pool_maxsize,
+                                  max_keepalive_connections=pool_maxsize,
+                                  keepalive_expiry=keepalive_expiry)
+            transport = httpx.HTTPTransport(http2=True, limits=limits)
+        self.transport = transport
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,
+             timeout: Union[float, tuple, None] = None, verify: bool = True,
+             cert=None, proxies=None) -> requests.Response:
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        else:
+            timeout = httpx.Timeout(timeout)
+        headers = [(name, value) for name, value in request.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS]
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+        for retry_number in range(retries + 1):
+            time.sleep(get_backoff_time(retry_number, self.backoff_factor))
+            httpx_request = httpx.Request(
+                request.method, request.url, headers=headers,
+                content=request.body,
+                extensions={'timeout': timeout.as_dict()})
+            try:
+                response = self.transport.handle_request(httpx_request)
+                try:
+                    response.read()
+                finally:
+                    response.close()
+            except httpx.TimeoutException as e:
+                if retry_number == retries:
+                    raise requests.Timeout(e, request=request)
+                continue
+            except httpx.TransportError as e:
+                if retry_number == retries:
+                    raise requests.ConnectionError(e, request=request)
+                continue
+            if response.status_code not in RETRY_STATUSES\
+                    or retry_number == retries:
+                break
+        return build_response(request, response.status_code, response.content,
+                              response.headers.multi_items(), self,
+                              response.reason_phrase)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class FakeTransport(BaseAdapter):
+    """
+    Answers from added responses without network and keeps every sent
+    request, the longest matched url prefix wins
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes = {}  # (method, url prefix): respond
+        self.requests = []
+
+    def add(self, method: str, url: str,
+            body: Union[str, bytes, dict, list, Callable] = '',
+            status_code: int = 200, headers: dict = None) -> None:
+        """
+        method: None to match every method
+        body: dicts and lists are sent as json, a callable gets the
+            PreparedRequest and returns (status_code, body, headers)
+        """
+        if callable(body):
+            self.routes[(method, url)] = body
+        else:
+            self.routes[(method, url)] = \
+                lambda request: (status_code, body, headers)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,
+             timeout: Union[float, tuple, None] = None, verify: bool = True,
+             cert=None, proxies=None) -> requests.Response:
+        self.requests.append(request)
+        matched = [(method, url) for method, url in self.routes
+                   if method in (None, request.method)
+                   and request.url.startswith(url)]
+        if not matched:
+            raise requests.ConnectionError(
+                f'No fake response for {request.method} {request.url}',
+                request=request)
+        route = max(matched, key=lambda route: len(route[1]))
+        status_code, body, headers = self.routes[route](request)
+        headers = list((headers or {}).items())
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+            headers.append(('Content-Type', 'application/json'))
+        if isinstance(body, str):
+            body = body.encode()
+        return build_response(request, status_code, body, headers, self)
+
+    def close(self) -> None:
+        pass
+
+
+def create_transport(pool_connections: int = 4, pool_maxsize: int = 4,
+                     retries: int = 3, backoff_factor: float = 0.5,
+                     http2: bool = False) -> BaseAdapter:
+    if http2:
+        return Http2Transport(pool_maxsize, retries, backoff_factor)
+    return HttpTransport(pool_connections, pool_maxsize, retries,
+                         backoff_factor)
+
+
+def mount_transport(session: requests.Session,
+                    transport: BaseAdapter) -> None:
+    """Every request of the session goes through the transport"""
+    session.mount('https://', transport)
+    session.mount('http://', transport)
+
+
+def create_session(pool_connections: int = 4, pool_maxsize: int = 4,
+                   retries: int = 0, backoff_factor: float = 0.5,
+                   http2: bool = False) -> requests.Session:
+    """
+    retries: how many times idempotent requests are retried, see
+        create_retry
+    """
+    session = requests.Session()
+    mount_transport(session, create_transport(
+        pool_connections, pool_maxsize, retries, backoff_factor, http2))
+    return session
@@ -1,16 +1,20 @@
-import copy
+import asyncio
 import re
+import json
+import time
 import struct
-from typing import List
-from datetime import datetime
+from typing import List, Union
 import urllib.parse as urlparse
 from http import HTTPStatus
 
-from bs4 import BeautifulSoup, Tag
-from requests import Session
+from requests import RequestException, Session
 
-from steamcom.models import HistoryStatus
+from steamcom.models import (HistoryStatus, WalletInfo, Asset,
+                             DescriptionTable)
 from steamcom.exceptions import LoginRequired, ApiException
+from steamcom.parsers import (MarketHtmlParser, get_default_parser,
+                              parse_price, get_sell_listings_from_node,
+                              get_buy_orders_from_node)
 
 
 def login_required(func):
@@ -22,15 +26,32 @@ def login_required(func):
     return func_wrapper
 
 
-def merge_items_with_descriptions_from_inventory(inventory_response: dict,
-                                                 context_id: str) -> dict:
+def wait_for_budget(rate_limiter, url: str, delay: float) -> None:
+    if rate_limiter is None:
+        time.sleep(delay)
+    else:
+        rate_limiter.acquire(url)
+
+
+async def async_wait_for_budget(rate_limiter, url: str, delay: float) -> None:
+    if rate_limiter is None:
+        await asyncio.sleep(delay)
+    else:
+        await rate_limiter.acquire_async(url)
+
+
+def merge_items_with_descriptions_from_inventory(
+        inventory_response: dict, context_id: str,
+        description_table: DescriptionTable = None) -> dict:
     inventory = inventory_response.get('assets', [])
     if not inventory:
         return {}
-    descriptions = {}
+    if description_table is None:
+        description_table = DescriptionTable()
     for description in inventory_response['descriptions']:
-        descriptions[get_description_key(description)] = description
-    return merge_items(inventory, descriptions, context_id=context_id)
+        description_table.intern(get_description_key(description),
+                                 description)
+    return merge_items(inventory, description_table, context_id=context_id)
 
 
 def merge_items_with_descriptions_from_listing(
@@ -47,13 +68,13 @@ def merge_items(items: List[dict], descriptions: dict, **kwargs) -> dict:
     merged_items = {}
     for item in items:
         description_key = get_description_key(item)
-        description = copy.copy(descriptions[description_key])
         item_id = item.get('id') or item['assetid']
-        description['contextid'] = item.get('contextid')\
-            or kwargs['context_id']
-        description['id'] = item_id
-        description['amount'] = item['amount']
-        merged_items[item_id] = description
+        merged_items[item_id] = Asset(
+            id=item_id,
+            amount=item['amount'],
+            contextid=item.get('contextid') or kwargs['context_id'],
+            description_key=description_key,
+            description=descriptions[description_key])
     return merged_items
 
 
@@ -61,13 +82,6 @@ def get_description_key(item: dict) -> str:
     return item['classid'] + '_' + item['instanceid']
 
 
-def parse_price(price_string: str) -> float:
-    price_string_without_space = price_string.replace(' ', '')
-    price_without_letters = re.sub(r"[^0-9,]", "", price_string_without_space)
-    price_with_dot_instead_comma = price_without_letters.replace(',', '.')
-    return float(price_with_dot_instead_comma)
-
-
 def text_between(text: str, begin: str, end: str) -> str:
     start = text.index(begin) + len(begin)
     end = text.index(end, start)
@@ -84,81 +98,64 @@ def get_listing_id_to_assets_address_from_html(html: str) -> dict:
     return listing_id_to_assets_address
 
 
-def get_market_listings_from_html(html: str) -> dict:
-    document = BeautifulSoup(html, 'html.parser')
-    nodes = document.select('div[id=myListings]')[0].findAll(
-        'div', {'class': 'market_home_listing_table'})
-    sell_listings_dict = {}
-    buy_orders_dict = {}
-    for node in nodes:
-        if node.select('#my_market_selllistings_number'):
-            sell_listings_dict = get_sell_listings_from_node(node)
-        elif node.select('#my_market_listingstoconfirm_number'):
-            sell_listings_awaiting_conf = get_sell_listings_from_node(node)
-            for listing in sell_listings_awaiting_conf.values():
-                listing['need_confirmation'] = True
-            sell_listings_dict.update(sell_listings_awaiting_conf)
-        elif node.select('#my_market_buylistings_number'):
-            buy_orders_dict = get_buy_orders_from_node(node)
-    return {'buy_orders': buy_orders_dict, 'sell_listings': sell_listings_dict}
-
-
-def get_market_sell_listings_from_api(html: str) -> dict:
-    document = BeautifulSoup(html, 'html.parser')
-    sell_listings_dict = get_sell_listings_from_node(document)
-    return {'sell_listings': sell_listings_dict}
-
-
-def get_sell_listings_from_node(node: Tag) -> dict:
-    sell_listings_raw = node.findAll('div',
-                                     {'id': re.compile('mylisting_\\d+')})
-    sell_listings_dict = {}
-    for listing_raw in sell_listings_raw:
-        spans = listing_raw.select('span[title]')
-        if 'Sold!' in spans[0].text:
-            continue
-        created_date = listing_raw.findAll(
-                'div', {'class': 'market_listing_listed_date'})[0]
-        datetime_now = datetime.now()
-        created_on = created_date.text.strip() + f' {datetime_now.year}'
-        created_datetime = datetime.strptime(created_on, '%d %b %Y')
-        if created_datetime.month > datetime_now.month\
-            or (created_datetime.month == datetime_now.month
-                and created_datetime.day > datetime_now.day):
-            created_datetime = created_datetime.replace(
-                year=datetime_now.year-1)
-        timestamp = created_datetime.timestamp()
-        listing = {
-            'listing_id': listing_raw.attrs['id'].replace('mylisting_', ''),
-            'buyer_pay': parse_price(spans[0].text.strip()),
-            'you_receive': parse_price(spans[1].text.strip()[1:-1]),
-            'created_on': created_on,
-            'created_timestamp': int(timestamp),
-            'need_confirmation': False
-        }
-        sell_listings_dict[listing['listing_id']] = listing
-    return sell_listings_dict
-
-
-def get_buy_orders_from_node(node: Tag) -> dict:
-    buy_orders_raw = node.findAll('div', {'id': re.compile('mybuyorder_\\d+')})
-    buy_orders_dict = {}
-    for order in buy_orders_raw:
-        qnt_price_raw = order.select('span[class=market_listing_price]')[0]\
-            .text.split("@")
-        regex = 'a[class=market_listing_item_name_link]'
-        item_link = order.select(regex)[0]['href']
-        order = {
-            'order_id': order.attrs['id'].replace('mybuyorder_', ''),
-            'quantity': int(qnt_price_raw[0].strip()),
-            'price': parse_price(qnt_price_raw[1].strip()),
-            'item_name': order.a.text,
-            'item_link': item_link,
-            'market_hash_name': urlparse.unquote(
-                item_link.split('/')[-1], encoding='utf-8', errors='replace')
-        }
-        buy_orders_dict[order['order_id']] = order
-    return buy_orders_dict
+def get_wallet_info_from_html(html: str) -> WalletInfo:
+    return create_wallet_info(get_raw_wallet_info_from_html(html))
+
+
+def get_raw_wallet_info_from_html(html: str) -> dict:
+    pattern = r'var g_rgWalletInfo = (\{.*?\});'
+    match = re.search(pattern, html)
+    if not match:
+        raise ValueError('g_rgWalletInfo not found')
+    return json.loads(match.group(1))
+
+
+def create_wallet_info(raw_wallet_info: dict) -> WalletInfo:
+    return WalletInfo(
+        currency=raw_wallet_info['wallet_currency'],
+        country=raw_wallet_info['wallet_country'],
+        state=raw_wallet_info['wallet_state'],
+        fee=raw_wallet_info['wallet_fee'],
+        fee_minimum=int(raw_wallet_info['wallet_fee_minimum']),
+        fee_percent=float(raw_wallet_info['wallet_fee_percent']),
+        publisher_fee_percent_default=float(
+            raw_wallet_info['wallet_publisher_fee_percent_default']),
+        market_minimum=int(raw_wallet_info['wallet_market_minimum']),
+        currency_increment=int(raw_wallet_info['wallet_currency_increment']),
+        fee_base=int(raw_wallet_info['wallet_fee_base']),
+        balance=round(int(raw_wallet_info['wallet_balance']) / 100, 2),
+        delayed_balance=round(
+            int(raw_wallet_info['wallet_delayed_balance']) / 100, 2),
+        max_balance=round(
+            int(raw_wallet_info['wallet_max_balance']) / 100, 2),
+        trade_max_balance=round(
+            int(raw_wallet_info['wallet_trade_max_balance']) / 100, 2)
+    )
+
+
+def get_steam_id_from_html(html: str) -> Union[str, None]:
+    # g_steamID is false on pages of a logged out session
+    match = re.search(r'g_steamID = "(\d+)";', html)
+    return match.group(1) if match else None
+
+
+def get_item_name_id_from_html(html: str) -> str:
+    match = re.search(r'Market_LoadOrderSpread\(\s*(\d+)\s*\)', html)
+    if not match:
+        raise ApiException('Market_LoadOrderSpread not found')
+    return match.group(1)
+
+
+def get_market_listings_from_html(html: str,
+                                  parser: MarketHtmlParser = None) -> dict:
+    parser = parser or get_default_parser()
+    return parser.get_market_listings_from_html(html)
+
+
+def get_market_sell_listings_from_api(html: str,
+                                      parser: MarketHtmlParser = None) -> dict:
+    parser = parser or get_default_parser()
+    return parser.get_market_sell_listings_from_api(html)
 
 
 def parse_history(history):
@@ -214,6 +211,11 @@ def parse_history(history):
     return history['events']
 
 
+def get_history_event_key(event: dict) -> tuple:
+    return (event['listingid'], event.get('purchaseid'),
+            event['event_type'], event['time_event'])
+
+
 def parse_graph(graph: list) -> dict:
     parsed_graph = {}
     for dot in reversed(graph):
@@ -271,6 +273,46 @@ def api_request(session: Session, url: str, params: dict = None,
     return response_json
 
 
+async def async_api_request(session, url: str, params: dict = None,
+                            headers: dict = None, data: dict = None) -> dict:
+    default_headers = {}
+    if headers:
+        default_headers.update(headers)
+    if params:
+        # httpx sends None as an empty value, requests drops it
+        params = {k: v for k, v in params.items() if v is not None}
+    if data:
+        response = await session.post(url, params=params,
+                                      headers=default_headers, data=data)
+    else:
+        response = await session.get(url, params=params,
+                                     headers=default_headers)
+    if response.status_code != HTTPStatus.OK:
+        if response.status_code != HTTPStatus.NOT_ACCEPTABLE and 'createbuyorder' not in url:
+            raise ApiException(f'HTTP status code: {response.status_code}')
+    if 'application/json' not in response.headers.get('Content-Type', ''):
+        raise ApiException('Not returned body')
+    response_json = response.json()
+    if not response_json:
+        raise ApiException('An empty response returned')
+    return response_json
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Network errors and 429 or 5xx http codes in ApiException messages of
+    api_request and cancel_sell_order are worth retrying, other errors
+    (steam success codes) are not
+    """
+    if isinstance(error, RequestException):
+        return True
+    match = re.search(r'code: (\d+)$', str(error))
+    if not match:
+        return False
+    status_code = int(match.group(1))
+    return status_code == HTTPStatus.TOO_MANY_REQUESTS or status_code >= 500
+
+
 def get_key_value_from_url(url: str, key: str, case_sensitive: bool = True)\
         -> str:
     params = urlparse.urlparse(url).query
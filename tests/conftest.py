@@ -0,0 +1,67 @@
+import os
+
+import pytest
+import requests
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class FakeResponse:
+
+    def __init__(self, text: str, status_code: int = 200) -> None:
+        self.text = text
+        self.status_code = status_code
+
+
+class FakeSession(requests.Session):
+    """Answers GET requests from pages by url and keeps requested urls"""
+
+    def __init__(self, pages: dict) -> None:
+        super().__init__()
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url: str, *args, **kwargs) -> FakeResponse:
+        self.requested.append(url)
+        return FakeResponse(self.pages[url])
+
+
+@pytest.fixture
+def read_fixture():
+    def read(name: str) -> str:
+        with open(os.path.join(FIXTURES, name), encoding='utf-8') as file:
+            return file.read()
+    return read
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession
+
+
+@pytest.fixture
+def extracted_session() -> dict:
+    return {'steamid': '76561199216758062', 'currencyid': 5,
+            'refresh_token': 'token', 'cookies': []}
+
+
+@pytest.fixture
+def inventory_page():
+    def make(asset_ids: list, last_asset_id: str = None,
+             total_inventory_count: int = 0) -> dict:
+        page = {
+            'success': 1,
+            'assets': [{'appid': 730, 'contextid': '2', 'assetid': asset_id,
+                        'classid': '3604678661', 'instanceid': '0',
+                        'amount': '1'} for asset_id in asset_ids],
+            'descriptions': [{'appid': 730, 'classid': '3604678661',
+                              'instanceid': '0', 'marketable': 1,
+                              'market_hash_name': 'Snakebite Case'}],
+            'total_inventory_count': total_inventory_count
+        }
+        if last_asset_id:
+            page['more_items'] = 1
+            page['last_assetid'] = last_asset_id
+        return page
+    return make
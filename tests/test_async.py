@@ -0,0 +1,146 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from steamcom.async_client import AsyncSteamClient  # noqa: E402
+from steamcom.models import ConfirmationType  # noqa: E402
+
+
+def make_confirmation(creator_id: str, type: int) -> dict:
+    return {'type': type, 'type_name': 'Market listing',
+            'id': 'c' + creator_id, 'creator_id': creator_id,
+            'nonce': 'n' + creator_id, 'creation_time': 0, 'cancel': 'Cancel',
+            'accept': 'Create Listing', 'icon': '', 'multi': False,
+            'headline': 'Snakebite Case', 'summary': [], 'warn': None}
+
+
+class Steam:
+    """Answers requests of httpx.MockTransport by path and keeps them"""
+
+    def __init__(self, market_page: str, inventory_page) -> None:
+        self.market_page = market_page
+        self.requests = []
+        self.inventory_pages = {
+            None: [inventory_page(['1', '2'], last_asset_id='2',
+                                  total_inventory_count=3)],
+            '2': [None, inventory_page(['3'])]  # the first one fails
+        }
+        self.confirmations = [make_confirmation('10', 3),
+                              make_confirmation('11', 2)]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == '/market':
+            return httpx.Response(200, text=self.market_page)
+        if path.startswith('/inventory/'):
+            start = request.url.params.get('start_assetid')
+            page = self.inventory_pages[start].pop(0)
+            if page is None:
+                return httpx.Response(500)
+            return httpx.Response(200, json=page)
+        if path == '/market/itemordershistogram':
+            return httpx.Response(200, json={
+                'success': 1, 'buy_order_graph': [[1.5, 2, ''], [1.4, 5, '']],
+                'sell_order_graph': [[1.6, 1, '']]})
+        if path == '/market/sellitem/':
+            return httpx.Response(200, json={'success': True,
+                                             'requires_confirmation': 1})
+        if path == '/mobileconf/getlist':
+            return httpx.Response(200, json={'success': True,
+                                             'conf': self.confirmations})
+        if path == '/mobileconf/multiajaxop':
+            return httpx.Response(200, json={'success': True})
+        return httpx.Response(404)
+
+
+async def load_client(steam: Steam,
+                      extracted_session: dict) -> AsyncSteamClient:
+    session = httpx.AsyncClient(transport=httpx.MockTransport(steam.handle))
+    client = AsyncSteamClient('user', identity_secret='c2VjcmV0',
+                              session=session)
+    await client.load_session(extracted_session)
+    return client
+
+
+def test_async_load_session_reads_wallet_from_market_page(
+        read_fixture, inventory_page, extracted_session):
+    steam = Steam(read_fixture('market_page.html'), inventory_page)
+
+    async def run():
+        async with await load_client(steam, extracted_session) as client:
+            assert client.wallet_info.currency == 5
+            assert client.market is not None
+            assert await client.is_session_alive(ttl=60)
+            assert len(steam.requests) == 1
+            assert await client.is_session_alive()
+
+    asyncio.run(run())
+    assert [request.url.path for request in steam.requests] == \
+        ['/market', '/market']
+
+
+def test_async_inventory_pages_are_retried_and_merged(
+        read_fixture, inventory_page, extracted_session):
+    steam = Steam(read_fixture('market_page.html'), inventory_page)
+
+    async def run():
+        async with await load_client(steam, extracted_session) as client:
+            return await client.get_my_inventory('730', '2', delay=0)
+
+    inventory = asyncio.run(run())
+    assert list(inventory['assets']) == ['1', '2', '3']
+    assert inventory['assets']['3']['market_hash_name'] == 'Snakebite Case'
+    assert inventory['total_inventory_count'] == 3
+    starts = [request.url.params.get('start_assetid')
+              for request in steam.requests
+              if request.url.path.startswith('/inventory/')]
+    assert starts == [None, '2', '2']
+
+
+def test_async_histogram_and_sell_order(
+        read_fixture, inventory_page, extracted_session):
+    steam = Steam(read_fixture('market_page.html'), inventory_page)
+
+    async def run():
+        async with await load_client(steam, extracted_session) as client:
+            histogram = await client.market.get_orders_histogram(
+                '175880240', '730', 'Snakebite Case')
+            response = await client.market.create_sell_order(
+                '1', '730', '2', '150')
+            return histogram, response
+
+    histogram, response = asyncio.run(run())
+    assert histogram['buy_order_graph'] == [{'price': 1.5, 'quantity': 2},
+                                            {'price': 1.4, 'quantity': 3}]
+    assert response['requires_confirmation'] == 1
+    histogram_request, sell_request = steam.requests[1:]
+    assert histogram_request.url.params['item_nameid'] == '175880240'
+    assert histogram_request.url.params['currency'] == '5'
+    assert histogram_request.headers['Referer'].endswith(
+        '/market/listings/730/Snakebite%20Case')
+    data = parse_qs(sell_request.content.decode())
+    assert data['assetid'] == ['1'] and data['price'] == ['150']
+
+
+def test_async_confirmations_are_awaited(
+        read_fixture, inventory_page, extracted_session):
+    steam = Steam(read_fixture('market_page.html'), inventory_page)
+
+    async def run():
+        async with await load_client(steam, extracted_session) as client:
+            found = await client.confirmations.find_confirmations(['11', '12'])
+            await client.confirmations.allow_all_confirmations(
+                [ConfirmationType.CREATE_LISTING])
+            return found
+
+    found = asyncio.run(run())
+    assert list(found) == ['11']
+    paths = [request.url.path for request in steam.requests]
+    assert paths == ['/market', '/mobileconf/getlist', '/mobileconf/getlist',
+                     '/mobileconf/multiajaxop']
+    data = parse_qs(steam.requests[-1].content.decode())
+    assert data['op'] == ['allow'] and data['cid[]'] == ['c10']
@@ -0,0 +1,100 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from steamcom.client import SteamClient
+from steamcom.exceptions import SessionIsInvalid
+from steamcom.market_page import MarketPage
+from steamcom.transport import FakeTransport
+
+
+MARKET_URL = 'https://steamcommunity.com/market'
+STEAM_ID = '76561199216758062'
+
+
+def test_load_session_checks_session_and_wallet_with_one_request(
+        read_fixture, fake_session, extracted_session):
+    session = fake_session({MARKET_URL: read_fixture('market_page.html')})
+    steam_client = SteamClient('user', session=session)
+    steam_client.load_session(extracted_session)
+    assert session.requested == [MARKET_URL]
+    assert steam_client.wallet_info.currency == 5
+    assert steam_client.is_session_alive(ttl=60)
+    assert session.requested == [MARKET_URL]
+    assert steam_client.is_session_alive()
+    assert session.requested == [MARKET_URL, MARKET_URL]
+
+
+def test_load_session_rejects_logged_out_page(
+        read_fixture, fake_session, extracted_session):
+    logged_out_page = read_fixture('market_page.html').replace(
+        f'g_steamID = "{STEAM_ID}";', 'g_steamID = false;')
+    session = fake_session({MARKET_URL: logged_out_page})
+    steam_client = SteamClient('user', session=session)
+    with pytest.raises(SessionIsInvalid):
+        steam_client.load_session(extracted_session)
+    assert not steam_client.was_login_executed
+
+
+def test_market_page_is_shared_between_client_and_market(
+        read_fixture, fake_session, extracted_session):
+    session = fake_session({MARKET_URL: read_fixture('market_page.html')})
+    steam_client = SteamClient('user', session=session)
+    steam_client.load_session(extracted_session)
+    listings = steam_client.market.get_my_market_listings(max_age=60)
+    balance = steam_client.get_wallet_balance(max_age=60)
+    assert balance == steam_client.get_wallet_info(max_age=60).balance
+    assert session.requested == [MARKET_URL]
+    market_page = steam_client.get_market_page()
+    assert len(market_page.listings_to_confirm) == 1
+    assert len(market_page.sell_listings) == 2
+    assert listings['buy_orders'] == market_page.buy_orders
+    steam_client.market.market_page_cache.invalidate()
+    steam_client.get_wallet_balance(max_age=60)
+    assert session.requested == [MARKET_URL, MARKET_URL]
+    steam_client.market.get_my_market_listings()
+    steam_client.get_wallet_balance()
+    steam_client.get_wallet_info()
+    assert session.requested == [MARKET_URL] * 5
+
+
+def test_market_page_hands_out_copies_of_listings(read_fixture):
+    market_page = MarketPage(read_fixture('market_page.html'))
+    listing_id, listing = next(iter(market_page.sell_listings.items()))
+    listing['need_confirmation'] = True
+    listing['description']['market_hash_name'] = 'Changed'
+    market_page.listings['sell_listings'].clear()
+    market_page.buy_orders.clear()
+    assert market_page.listings['buy_orders'] == market_page.buy_orders != {}
+    sell_listing = market_page.listings['sell_listings'][listing_id]
+    assert not sell_listing['need_confirmation']
+    assert sell_listing['description']['market_hash_name'] != 'Changed'
+
+
+def test_partner_inventory_retries_failed_page_and_merges_assets(
+        inventory_page):
+    pages = {
+        None: [inventory_page(['1', '2'], last_asset_id='2',
+                              total_inventory_count=5)],
+        '2': [None, inventory_page(['3', '4'], last_asset_id='4')],
+        '4': [inventory_page(['5'])]
+    }
+
+    def respond(request):
+        start = parse_qs(urlsplit(request.url).query).get('start_assetid')
+        page = pages[start[0] if start else None].pop(0)
+        if page is None:
+            return 500, '', None
+        return 200, page, None
+
+    transport = FakeTransport()
+    transport.add('GET', 'https://steamcommunity.com/inventory/' + STEAM_ID,
+                  respond)
+    steam_client = SteamClient(transport=transport)
+    inventory = steam_client.get_partner_inventory(STEAM_ID, '730', '2',
+                                                   delay=0)
+    assert list(inventory['assets']) == ['1', '2', '3', '4', '5']
+    assert inventory['assets']['5']['market_hash_name'] == 'Snakebite Case'
+    assert inventory['total_inventory_count'] == 5
+    assert len(transport.requests) == 4
+    assert not any(pages.values())
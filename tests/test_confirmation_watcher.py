@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from steamcom.confirmation_watcher import ConfirmationWatcher
+from steamcom.exceptions import ApiException
+from steamcom.models import Confirmation, ConfirmationRule, ConfirmationType
+
+
+def make_confirmation(i: int, type: ConfirmationType,
+                      headline: str = 'Snakebite Case') -> Confirmation:
+    return Confirmation(type, type.name, str(i), f'creator{i}', f'nonce{i}',
+                        '1665000000', 'Cancel', 'Confirm', None, False,
+                        headline, {}, False)
+
+
+class LocalConfirmations:
+
+    def __init__(self, confirmations: list, refused: set = ()) -> None:
+        self.list = confirmations
+        self.refused = refused
+        self.fetches = 0
+        self.responses = []
+        self.lock = threading.Lock()
+
+    def get_confirmations(self) -> list:
+        with self.lock:
+            self.fetches += 1
+            return list(self.list)
+
+    def respond_to_confirmations(self, confirmations: list,
+                                 cancel: bool = False) -> bool:
+        with self.lock:
+            self.responses.append(([c.id for c in confirmations], cancel))
+            if any(c.id in self.refused for c in confirmations):
+                return False
+            self.list = [c for c in self.list if c not in confirmations]
+            return True
+
+
+def test_poll_applies_rules_in_batches():
+    listings = [make_confirmation(i, ConfirmationType.CREATE_LISTING)
+                for i in range(5)]
+    trade = make_confirmation(5, ConfirmationType.TRADE, 'Trade with scammer')
+    purchase = make_confirmation(6, ConfirmationType.PURCHASE)
+    confirmations = LocalConfirmations(listings + [trade, purchase])
+    rules = [ConfirmationRule(headline='scammer', cancel=True),
+             ConfirmationRule(types={ConfirmationType.CREATE_LISTING,
+                                     ConfirmationType.TRADE})]
+    watcher = ConfirmationWatcher(confirmations, rules, batch_size=3)
+    assert watcher.poll() == 6
+    assert confirmations.responses == [(['0', '1', '2'], False),
+                                       (['3', '4'], False), (['5'], True)]
+    assert confirmations.list == [purchase]
+    assert watcher.poll() == 0
+
+
+def test_watcher_resolves_futures_by_creator_id():
+    confirmations = LocalConfirmations([], refused={'2'})
+    with ConfirmationWatcher(confirmations, min_interval=0.01) as watcher:
+        first = watcher.wait_for('creator1')
+        second = watcher.wait_for('creator2', cancel=True)
+        confirmations.list = [
+            make_confirmation(1, ConfirmationType.PURCHASE),
+            make_confirmation(2, ConfirmationType.PURCHASE)]
+        assert first.result(timeout=5).id == '1'
+        with pytest.raises(ApiException):
+            second.result(timeout=5)
+        never = watcher.wait_for('creator3')
+    assert never.cancelled()
+    assert confirmations.fetches >= 1
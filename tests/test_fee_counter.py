@@ -1,4 +1,6 @@
-from steamcom.fee_counter import FeeCounter
+import pytest
+
+from steamcom.fee_counter import FeeCounter, FeeTable, get_fee_table
 
 COMMISSION_TESTS = {
     "RUB": {
@@ -37,3 +39,57 @@ def test_calculate_seller_price():
             fee_price = fc.calculate_seller_price(price)
             assert fee_price.seller_receive == seller_receive
             assert fee_price.buyer_pay == buyer_pay
+
+
+def test_calculate_seller_prices_matches_scalar_cases():
+    np = pytest.importorskip('numpy')
+    for currency_data in COMMISSION_TESTS.values():
+        fc = FeeCounter(
+            market_minimum=currency_data["market_minimum"],
+            currency_increment=currency_data["currency_increment"],
+        )
+        prices, seller_receive, buyer_pay = zip(*currency_data["cases"])
+        fee_prices = fc.calculate_seller_prices(np.array(prices))
+        assert fee_prices.seller_receive.tolist() == list(seller_receive)
+        assert fee_prices.buyer_pay.tolist() == list(buyer_pay)
+
+
+def test_calculate_seller_prices_matches_scalar_oracle():
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(730)
+    for market_minimum, currency_increment, fee_percent, publisher_fee in [
+            (1, 1, 0.05, 0.1), (79, 1, 0.05, 0.1), (7, 1, 0.05, 0.15),
+            (20, 5, 0.05, 0.1), (100, 100, 0.05, 0.1), (3, 1, 0.05, 0)]:
+        fc = FeeCounter(fee_percent, market_minimum, currency_increment,
+                        publisher_fee)
+        prices = np.concatenate([
+            np.round(rng.uniform(-1, 20, 2000), 2),
+            np.round(rng.uniform(20, 20000, 2000), 2),
+            [0, 0.01, 0.03]])
+        fee_prices = fc.calculate_seller_prices(prices)
+        expected = [fc.calculate_seller_price(float(price))
+                    for price in prices]
+        assert fee_prices.seller_receive.tolist() == [
+            fee_price.seller_receive for fee_price in expected]
+        assert fee_prices.buyer_pay.tolist() == [
+            fee_price.buyer_pay for fee_price in expected]
+        totals = np.arange(0, 5000)
+        assert fc.get_totals_with_fees(totals).tolist() == [
+            fc.get_total_with_fees(int(total)) for total in totals]
+
+
+def test_fee_table_matches_fee_counter(tmp_path):
+    np = pytest.importorskip('numpy')
+    fc = FeeCounter(market_minimum=79)
+    fee_table = get_fee_table(fc, max_total=20000, directory=str(tmp_path))
+    assert get_fee_table(FeeCounter(market_minimum=79),
+                         max_total=20000) is fee_table
+    assert FeeTable.load(next(tmp_path.iterdir())).key == fee_table.key
+    for price, seller_receive, buyer_pay in COMMISSION_TESTS["RUB"]["cases"]:
+        fee_price = fee_table.calculate_seller_price(price)
+        assert fee_price == (buyer_pay, seller_receive)
+    totals = np.arange(0, 30000, 7)
+    assert fee_table.get_item_prices_from_totals(totals).tolist() == [
+        fc.get_item_price_from_total(int(total)) for total in totals]
+    assert fee_table.get_totals_with_fees(totals).tolist() == [
+        fc.get_total_with_fees(int(total)) for total in totals]
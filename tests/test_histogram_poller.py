@@ -0,0 +1,73 @@
+import queue
+import threading
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from steamcom.histogram_poller import HistogramPoller
+from steamcom.market import SteamMarket
+from steamcom.models import WatchItem
+from steamcom.rate_limiter import RateLimiter, TokenBucket
+
+
+HISTOGRAM = {'buy_order_graph': [[2.67, 1, ''], [2.66, 2, '']],
+             'sell_order_graph': [[3.24, 1, '']]}
+
+
+class LocalHistogramMarket(SteamMarket):
+
+    def get_orders_histogram(self, item_name_id: str, app_id: str,
+                             market_hash_name: str, currency_id: int = None,
+                             raw: bool = False, wait: bool = True) -> dict:
+        assert not wait  # the poller keeps the rate itself
+        with self.lock:
+            self.polled.append(item_name_id)
+        if item_name_id == 'broken':
+            raise ValueError('Buy or sell order graph not in body')
+        return HISTOGRAM
+
+
+def test_poller_serves_hot_items_first_and_reports_stats():
+    market = LocalHistogramMarket()
+    market.lock = threading.Lock()
+    market.polled = []
+    watchlist = [WatchItem(f'cold{i}', '730', f'Cold {i}', priority=1,
+                           interval=3600) for i in range(5)]
+    watchlist.append(WatchItem('broken', '730', 'Broken', 1, 3600))
+    watchlist.append(WatchItem('hot', '730', 'Hot', priority=0,
+                               interval=0.05))
+    results = queue.Queue()
+    errors = []
+    rate_limiter = RateLimiter({'/market/itemordershistogram':
+                                TokenBucket(rate=50, capacity=1)})
+    poller = HistogramPoller(market, watchlist, result_queue=results,
+                             workers=1, rate_limiter=rate_limiter,
+                             on_error=lambda item, e: errors.append(item))
+    with poller:
+        item, order_book = results.get(timeout=5)
+        assert item.item_name_id == 'hot'
+        assert order_book.best_bid == 2.67
+        while len(set(market.polled)) < 7 or market.polled.count('hot') < 3:
+            results.get(timeout=5)
+    assert market.polled[0] == 'hot'
+    assert market.polled.count('cold0') == 1
+    assert [error.item_name_id for error in errors] == ['broken']
+    stats = poller.get_stats()
+    assert stats[0].polls >= 3 and stats[0].errors == 0
+    assert stats[1].errors == 1
+    assert stats[0].max_delay >= stats[0].mean_delay >= 0
+
+
+def test_removed_items_are_not_polled():
+    market = LocalHistogramMarket()
+    market.lock = threading.Lock()
+    market.polled = []
+    poller = HistogramPoller(market, [WatchItem('1', '730', 'One'),
+                                      WatchItem('2', '730', 'Two')])
+    poller.remove('1')
+    results = queue.Queue()
+    poller.result_queue = results
+    with poller:
+        results.get(timeout=5)
+    assert market.polled == ['2']
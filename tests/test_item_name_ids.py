@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from steamcom.exceptions import ApiException
+from steamcom.item_name_ids import ItemNameIdResolver
+from steamcom.market import SteamMarket
+from steamcom.utils import get_item_name_id_from_html
+
+
+class LocalMarket(SteamMarket):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.downloads = []
+        self._lock = threading.Lock()
+
+    def get_item_name_id(self, app_id: str, market_hash_name: str) -> str:
+        with self._lock:
+            self.downloads.append(market_hash_name)
+        if market_hash_name == 'Missing':
+            raise ApiException('Market_LoadOrderSpread not found')
+        return str(len(market_hash_name))
+
+
+def test_get_item_name_id_from_html():
+    html = '<script>\n\t\t\tMarket_LoadOrderSpread( 176240926 );\t// initial load\n'
+    assert get_item_name_id_from_html(html) == '176240926'
+    with pytest.raises(ApiException):
+        get_item_name_id_from_html('<html></html>')
+
+
+def test_resolver_downloads_only_unknown_items(tmp_path):
+    path = str(tmp_path / 'item_name_ids.sqlite3')
+    market = LocalMarket()
+    resolver = ItemNameIdResolver(path, market)
+    assert resolver.get('730', 'Snakebite Case') is None
+    assert resolver.resolve('730', 'Snakebite Case') == '14'
+    assert resolver.resolve(730, 'Snakebite Case') == '14'
+    assert market.downloads == ['Snakebite Case']
+
+    resolver = ItemNameIdResolver(path, market)
+    items = [('730', 'Snakebite Case'), ('730', 'Danger Zone Case'),
+             ('730', 'Missing')]
+    resolved = resolver.warm_up(items, concurrency=2, delay=0)
+    assert resolved == {('730', 'Snakebite Case'): '14',
+                        ('730', 'Danger Zone Case'): '16',
+                        ('730', 'Missing'): None}
+    assert sorted(market.downloads) == ['Danger Zone Case', 'Missing',
+                                        'Snakebite Case']
+    assert ItemNameIdResolver(path, market).get(
+        '730', 'Danger Zone Case') == '16'
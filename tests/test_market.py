@@ -0,0 +1,380 @@
+import threading
+import time
+
+import pytest
+
+from steamcom.client import SteamClient
+from steamcom.confirmations import ConfirmationExecutor
+from steamcom.exceptions import ApiException
+from steamcom.market import SteamMarket
+from steamcom.models import (BuyOrder, BuyOrderStatus, Confirmation,
+                             ConfirmationType, SellItem, SellStatus)
+from steamcom.transport import FakeTransport
+
+
+def make_event(i: int, event_type: int = 3) -> dict:
+    return {'listingid': str(1000 + i), 'purchaseid': str(2000 + i),
+            'event_type': event_type, 'time_event': 1665657537 - i}
+
+
+class LocalHistoryMarket(SteamMarket):
+
+    def __init__(self, pages: list) -> None:
+        super().__init__()
+        self.pages = pages
+
+    def _get_market_history_page(self, start: int = 0,
+                                 count: int = 500) -> list:
+        return [dict(event) for event in self.pages[start // 500]]
+
+
+def test_get_my_history_drops_repeated_events():
+    first_page = [make_event(i) for i in range(500)]
+    # new events shifted the second page, so it repeats two old ones
+    second_page = [make_event(i) for i in range(498, 600)]
+    second_page.append(make_event(599, event_type=1))
+    market = LocalHistoryMarket([first_page, second_page])
+    history = market.get_my_history(1000, delay=0)
+    assert len(history) == 601
+    assert history[:600] == [make_event(i) for i in range(600)]
+    assert history[-1] == make_event(599, event_type=1)
+
+
+class LocalListingsMarket(SteamMarket):
+
+    def _parse_listings(self, start: int, count: int) -> dict:
+        listing_ids = range(start, min(start + count, 1250))
+        return {str(i): {'listing_id': str(i)} for i in listing_ids}
+
+
+def test_get_my_market_listings_concurrent_pages_are_merged_in_order(
+        read_fixture, fake_session):
+    market_page = read_fixture('market_page.html').replace(
+        '<span id="tabContentsMyActiveMarketListings_total">3</span>',
+        '<span id="tabContentsMyActiveMarketListings_total">1,250</span>')
+    session = fake_session({'https://steamcommunity.com/market': market_page})
+    market = LocalListingsMarket(session=session)
+    market.was_login_executed = True
+    listings = market.get_my_market_listings(delay=0, concurrency=4)
+    sell_listings = list(listings['sell_listings'])
+    assert sell_listings[:3] == ['3868053667603823025', '3868053667603823026',
+                                 '3868053667603823027']
+    assert sell_listings[3:] == [str(i) for i in range(3, 1250)]
+    description = listings['sell_listings']['3868053667603823027']\
+        ['description']
+    assert description['market_hash_name'] == 'Golden Moth'
+
+
+class RecordingLimiter:
+
+    def __init__(self) -> None:
+        self.acquired = []
+
+    def acquire(self, url: str) -> None:
+        self.acquired.append(url)
+
+
+def test_rate_limiter_replaces_delay_of_paginators(
+        read_fixture, fake_session, monkeypatch):
+    def sleep(seconds):
+        raise AssertionError(f'slept {seconds} seconds')
+
+    monkeypatch.setattr(time, 'sleep', sleep)
+    limiter = RecordingLimiter()
+    history_market = LocalHistoryMarket(
+        [[make_event(i) for i in range(500)],
+         [make_event(i) for i in range(500, 1000)]])
+    history_market.rate_limiter = limiter
+    assert len(history_market.get_my_history(1000, delay=60)) == 1000
+
+    market_page = read_fixture('market_page.html').replace(
+        '<span id="tabContentsMyActiveMarketListings_total">3</span>',
+        '<span id="tabContentsMyActiveMarketListings_total">1,250</span>')
+    session = fake_session({'https://steamcommunity.com/market': market_page})
+    listings_market = LocalListingsMarket(session=session,
+                                          rate_limiter=limiter)
+    listings_market.was_login_executed = True
+    listings = listings_market.get_my_market_listings(delay=60)
+    assert len(listings['sell_listings']) == 1250
+
+    inventory_url = 'https://steamcommunity.com/inventory/76561199216758062'
+    transport = FakeTransport()
+    transport.add('GET', inventory_url, {
+        'success': 1, 'assets': [], 'descriptions': [],
+        'total_inventory_count': 0})
+    client = SteamClient(transport=transport, rate_limiter=limiter)
+    client.get_partner_inventory('76561199216758062', '730', '2', delay=60)
+
+    assert limiter.acquired == [SteamMarket.HISTORY_URL] * 2 \
+        + [SteamMarket.LISTINGS_URL] * 13 + [inventory_url]
+
+
+class FakeConfirmations:
+    identity_secret = 'secret'
+
+    def __init__(self, waiting: list = (), refuse: bool = False) -> None:
+        self.waiting = list(waiting)
+        self.refuse = refuse
+        self.batches = []
+
+    def get_confirmations(self) -> list:
+        return list(self.waiting)
+
+    def respond_to_confirmations(self, confirmations: list) -> bool:
+        self.batches.append(len(confirmations))
+        if self.refuse:
+            return False
+        self.waiting = [c for c in self.waiting if c not in confirmations]
+        return True
+
+
+def make_listing_confirmation(creator_id: str) -> Confirmation:
+    return Confirmation(
+        ConfirmationType.CREATE_LISTING, 'Market Listing', 'c' + creator_id,
+        creator_id, 'nonce', '0', 'Cancel', 'Create Listing', '', False,
+        'Sell - Snakebite Case', ['100'], None)
+
+
+class LocalSellMarket(SteamMarket):
+
+    def create_sell_order(self, asset_id: str, app_id: str, context_id: str,
+                          money_to_receive: str, amount: int = 1) -> dict:
+        if asset_id == 'broken':
+            raise ApiException('The item specified is no longer in your '
+                               'inventory or is not allowed to be traded')
+        confirmation = make_listing_confirmation(asset_id)
+        with self.lock:
+            self.confirmations.waiting.append(confirmation)
+        return {'success': True, 'requires_confirmation': 1}
+
+
+def test_sell_many_confirms_in_batches():
+    market = LocalSellMarket(confirmations=FakeConfirmations())
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    items = [SellItem(str(i), '730', '2', '100') for i in range(25)]
+    items.append(('broken', '730', '2', '100'))
+    results = market.sell_many(items, concurrency=4, confirm_batch_size=10,
+                               delay=0)
+    assert len(results) == 26
+    assert results['broken'].status == SellStatus.FAILED
+    assert 'no longer in your inventory' in results['broken'].error
+    listed = [result for result in results.values()
+              if result.status == SellStatus.LISTED]
+    assert len(listed) == 25
+    assert sum(market.confirmations.batches) == 25
+    assert len(market.confirmations.batches) < 25
+
+
+def test_sell_many_leaves_foreign_confirmations():
+    foreign = [make_listing_confirmation('foreign1'),
+               make_listing_confirmation('foreign2')]
+    market = LocalSellMarket(confirmations=FakeConfirmations(foreign))
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    items = [SellItem(str(i), '730', '2', '100') for i in range(7)]
+    results = market.sell_many(items, concurrency=3, confirm_batch_size=5,
+                               delay=0)
+    assert all(result.status == SellStatus.LISTED
+               for result in results.values())
+    assert market.confirmations.waiting == foreign
+    assert sum(market.confirmations.batches) == 7
+
+
+def test_sell_many_keeps_pending_if_confirmation_failed():
+    market = LocalSellMarket(confirmations=FakeConfirmations(refuse=True))
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    items = [SellItem(str(i), '730', '2', '100') for i in range(7)]
+    results = market.sell_many(items, confirm_batch_size=5, delay=0)
+    assert all(result.status == SellStatus.PENDING_CONFIRMATION
+               for result in results.values())
+    assert len(market.confirmations.waiting) == 7
+
+
+class LaggingConfirmations(FakeConfirmations):
+    """Confirmations of lagging creator_ids are missing in getlist"""
+
+    def __init__(self, lagging: set) -> None:
+        super().__init__()
+        self.lagging = lagging
+
+    def get_confirmations(self) -> list:
+        return [confirmation for confirmation in self.waiting
+                if confirmation.creator_id not in self.lagging]
+
+
+def test_sell_many_keeps_pending_while_getlist_lags():
+    lagging = LaggingConfirmations({'0', '1', '2'})
+    market = LocalSellMarket(confirmations=lagging)
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    items = [SellItem(str(i), '730', '2', '100') for i in range(3)]
+    results = market.sell_many(items, delay=0)
+    assert all(result.status == SellStatus.PENDING_CONFIRMATION
+               for result in results.values())
+    assert market.confirmations.batches == []
+
+    market.confirmations = LaggingConfirmations({'0', '1'})
+    results = market.sell_many(items, delay=0)
+    statuses = [result.status for result in results.values()]
+    assert statuses.count(SellStatus.LISTED) == 1
+    assert statuses.count(SellStatus.PENDING_CONFIRMATION) == 2
+    assert market.confirmations.batches == [1]
+
+
+class LocalCancelMarket(SteamMarket):
+
+    def cancel_sell_order(self, sell_listing_id: str) -> None:
+        with self.lock:
+            self.calls.append(sell_listing_id)
+            failures_left = self.flaky.get(sell_listing_id, 0)
+            self.flaky[sell_listing_id] = failures_left - 1
+        if sell_listing_id == 'removed':
+            raise ApiException('Problem removing the listing. http code: 404')
+        if failures_left > 0:
+            raise ApiException('Problem removing the listing. http code: 502')
+
+    def cancel_buy_order(self, buy_order_id: str) -> dict:
+        with self.lock:
+            self.calls.append(buy_order_id)
+        return {'success': 1 if buy_order_id != 'unknown' else 29}
+
+
+def test_cancel_many_retries_and_reports_every_id():
+    market = LocalCancelMarket()
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    market.calls = []
+    market.flaky = {'2': 1, 'dead': 10}
+    results = market.cancel_many(['1', '2', 'dead', 'removed'],
+                                 ['7', 'unknown'], concurrency=3, attempts=3,
+                                 delay=0)
+    sell_results = results['sell_listings']
+    assert sell_results['1'].success and sell_results['1'].attempts == 1
+    assert sell_results['2'].success and sell_results['2'].attempts == 2
+    assert not sell_results['dead'].success
+    assert sell_results['dead'].attempts == 3
+    assert 'http code: 502' in sell_results['dead'].error
+    assert market.calls.count('dead') == 3
+    assert not sell_results['removed'].success
+    assert sell_results['removed'].attempts == 1
+    assert results['buy_orders']['7'].success
+    assert not results['buy_orders']['unknown'].success
+    assert results['buy_orders']['unknown'].attempts == 1
+    assert market.calls.count('unknown') == 1
+
+
+class LocalConfirmationExecutor(ConfirmationExecutor):
+
+    def __init__(self) -> None:
+        super().__init__('secret', '76561199216758000', None)
+        self.was_login_executed = True
+        self.waiting = []
+        self.fetches = 0
+        self.batches = []
+        self.refuse = False
+
+    def _fetch_confirmations_page(self) -> dict:
+        self.fetches += 1
+        return {'conf': [dict(conf) for conf in self.waiting]}
+
+    def respond_to_confirmations(self, confirmations, cancel=False) -> bool:
+        creator_ids = [c.creator_id for c in confirmations]
+        self.batches.append(creator_ids)
+        if self.refuse:
+            return False
+        self.waiting = [conf for conf in self.waiting
+                        if conf['creator_id'] not in creator_ids]
+        return True
+
+
+class LocalBuyMarket(SteamMarket):
+
+    def _post_buy_order(self, order: BuyOrder,
+                        confirmation_id: str = None) -> dict:
+        with self.lock:
+            if order.market_hash_name == 'Unknown':
+                return {'success': 8, 'message': 'Invalid item'}
+            if confirmation_id:
+                return {'success': 1, 'buy_orderid': confirmation_id}
+            self.number += 1
+            creator_id = str(self.number)
+            if order.market_hash_name == 'Hidden':
+                return {'success': 22,
+                        'confirmation': {'confirmation_id': creator_id}}
+            self.confirmations.waiting.append({
+                'type': 12, 'type_name': 'Market purchase',
+                'id': 'c' + creator_id, 'creator_id': creator_id,
+                'nonce': 'nonce', 'creation_time': 0, 'cancel': 'Cancel',
+                'accept': 'Confirm', 'icon': '', 'multi': False,
+                'headline': order.market_hash_name, 'summary': [],
+                'warn': None})
+            return {'success': 22,
+                    'confirmation': {'confirmation_id': creator_id}}
+
+
+def test_create_buy_orders_confirms_with_one_fetch():
+    market = LocalBuyMarket(confirmations=LocalConfirmationExecutor())
+    market.was_login_executed = True
+    market.lock = threading.Lock()
+    market.number = 0
+    orders = [BuyOrder('730', f'Case {i}', '0.03', 1) for i in range(20)]
+    orders.append(('730', 'Unknown', '0.03', 1))
+    results = market.create_buy_orders(orders, concurrency=4, delay=0)
+    assert [result.order.market_hash_name for result in results] == \
+        [order[1] for order in orders]
+    assert all(result.status == BuyOrderStatus.PLACED
+               for result in results[:20])
+    assert results[20].status == BuyOrderStatus.FAILED
+    assert results[20].error == 'Invalid item'
+    assert market.confirmations.fetches == 1
+    assert len(market.confirmations.batches) == 1
+    assert len(market.confirmations.batches[0]) == 20
+
+
+def test_create_buy_orders_fails_only_found_confirmations():
+    market = LocalBuyMarket(confirmations=LocalConfirmationExecutor())
+    market.was_login_executed = True
+    market.confirmations.refuse = True
+    market.lock = threading.Lock()
+    market.number = 0
+    orders = [BuyOrder('730', 'Case', '0.03', 1),
+              BuyOrder('730', 'Hidden', '0.03', 1)]
+    found, hidden = market.create_buy_orders(orders, delay=0)
+    assert found.status == BuyOrderStatus.FAILED
+    assert found.error == 'Confirmation failed'
+    assert hidden.status == BuyOrderStatus.PENDING_CONFIRMATION
+    assert market.confirmations.batches == [['1']]
+
+
+class LocalStatusMarket(SteamMarket):
+
+    def check_placed_buy_order(self, app_id: str, market_hash_name: str):
+        self.checked.append(market_hash_name)
+        if market_hash_name == 'Not Sold':
+            raise ApiException('No one is selling this item')
+        if market_hash_name == 'Broken':
+            raise ApiException('HTTP status code: 502')
+        return None
+
+
+def test_get_buy_order_statuses_uses_one_page_and_cache(
+        read_fixture, fake_session):
+    session = fake_session({'https://steamcommunity.com/market':
+                           read_fixture('market_page.html')})
+    market = LocalStatusMarket(session=session)
+    market.was_login_executed = True
+    market.checked = []
+    items = [('570', 'Seething Orbit'), ('570', 'Golden Moth'),
+             ('730', 'Not Sold')]
+    statuses = market.get_buy_order_statuses(items, delay=0)
+    assert statuses[('570', 'Seething Orbit')]['order_id'] == '5470862660'
+    assert statuses[('570', 'Golden Moth')] is None
+    assert statuses[('730', 'Not Sold')] is None
+    assert market.checked == ['Golden Moth', 'Not Sold']
+    session.pages = {}
+    assert market.get_buy_order_statuses(items, delay=0) == statuses
+    assert len(market.checked) == 2
+    with pytest.raises(ApiException, match='502'):
+        market.get_buy_order_statuses([('730', 'Broken')], delay=0)
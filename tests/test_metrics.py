@@ -0,0 +1,49 @@
+from steamcom.client import SteamClient
+from steamcom.metrics import (InMemoryMetrics, get_endpoint,
+                              get_success_code)
+from steamcom.transport import FakeTransport
+
+
+def test_get_endpoint_and_success_code():
+    assert get_endpoint('https://steamcommunity.com/inventory/765/730/2'
+                        '?l=english') == 'inventory'
+    assert get_endpoint('https://steamcommunity.com/market/listings/730/'
+                        'Snakebite%20Case') == 'listings'
+    assert get_endpoint('https://steamcommunity.com/mobileconf/getlist') == \
+        'mobileconf'
+    assert get_endpoint('https://api.steampowered.com/IAuthenticationService'
+                        '/PollAuthSessionStatus/v1') == 'api.steampowered.com'
+    assert get_success_code(b'{"success":1,"results_html":""}') == 1
+    assert get_success_code(b'{ "success": false }') == 0
+    assert get_success_code(b'{"success":-2}') == -2
+    assert get_success_code(b'<html></html>') is None
+
+
+def test_client_requests_are_recorded_by_endpoint():
+    transport = FakeTransport()
+    transport.add('GET', 'https://steamcommunity.com/market/pricehistory/',
+                  {'success': True, 'prices': []})
+    transport.add('POST', 'https://steamcommunity.com/market/sellitem/',
+                  {'success': False, 'message': 'Item not found'},
+                  status_code=502)
+    metrics = InMemoryMetrics()
+    client = SteamClient(transport=transport, metrics=metrics)
+    for _ in range(3):
+        client.session.get('https://steamcommunity.com/market/pricehistory/')
+    client.session.post('https://steamcommunity.com/market/sellitem/')
+    stats = metrics.get_stats()
+    assert stats['pricehistory']['count'] == 3
+    assert stats['pricehistory']['bytes'] == 3 * len(
+        '{"success": true, "prices": []}')
+    assert stats['pricehistory']['success_codes'] == {1: 3}
+    assert stats['sellitem']['status_codes'] == {502: 1}
+    assert stats['sellitem']['success_codes'] == {0: 1}
+    text = metrics.to_prometheus()
+    assert 'steamcom_request_duration_seconds_count{endpoint="pricehistory"} 3'\
+        in text
+    assert 'steamcom_request_duration_seconds_bucket{endpoint="sellitem",' \
+        'le="+Inf"} 1' in text
+    assert 'steamcom_responses_total{endpoint="sellitem",status="502"} 1' \
+        in text
+    assert 'steamcom_steam_success_total{endpoint="pricehistory",' \
+        'success="1"} 3' in text
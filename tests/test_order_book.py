@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from steamcom.order_book import OrderBook
+from steamcom.utils import parse_orders_histogram
+
+
+HISTOGRAM = {
+    'buy_order_graph': [[2.67, 1, '1 buy orders at 2.67 or higher'],
+                        [2.66, 2, '2 buy orders at 2.66 or higher'],
+                        [2.6, 6, '6 buy orders at 2.60 or higher']],
+    'sell_order_graph': [[3.24, 1, '1 sell orders at 3.24 or lower'],
+                         [3.25, 2, '2 sell orders at 3.25 or lower'],
+                         [3.28, 6, '6 sell orders at 3.28 or lower']]
+}
+
+
+def test_order_book_levels_match_parsed_histogram():
+    order_book = OrderBook.from_histogram(HISTOGRAM)
+    parsed = parse_orders_histogram(HISTOGRAM)
+    assert order_book.bid_prices.tolist() == [
+        level['price'] for level in parsed['buy_order_graph']]
+    assert order_book.bid_quantities.tolist() == [
+        level['quantity'] for level in parsed['buy_order_graph']]
+    assert order_book.ask_quantities.tolist() == [
+        level['quantity'] for level in parsed['sell_order_graph']]
+    assert order_book.best_bid == 2.67
+    assert order_book.best_ask == 3.24
+    assert order_book.spread == pytest.approx(0.57)
+    assert order_book.get_bid_quantity(2.6) == 4
+    assert order_book.get_bid_quantity(2.65) == 0
+    assert order_book.get_ask_quantity(3.28) == 4
+    assert order_book.get_bid_depth(2.66) == 2
+    assert order_book.get_bid_depth(3) == 0
+    assert order_book.get_ask_depth(3.26) == 2
+    assert order_book.get_ask_depth(10) == 6
+    empty = OrderBook.from_histogram({'buy_order_graph': [],
+                                      'sell_order_graph': []})
+    assert empty.best_bid is None and empty.spread is None
+
+
+def test_order_book_diff():
+    previous = OrderBook.from_histogram(HISTOGRAM)
+    assert previous.diff(previous).is_empty
+    histogram = {
+        'buy_order_graph': [[2.68, 3, ''], [2.67, 4, ''], [2.6, 8, '']],
+        'sell_order_graph': [[3.24, 1, ''], [3.25, 2, ''], [3.28, 7, '']]
+    }
+    diff = OrderBook.from_histogram(histogram).diff(previous)
+    assert diff.bid_prices.tolist() == [2.68, 2.66]
+    assert diff.bid_changes.tolist() == [3, -1]
+    assert diff.ask_prices.tolist() == [3.28]
+    assert diff.ask_changes.tolist() == [1]
@@ -0,0 +1,58 @@
+import pytest
+
+from steamcom.parsers import BeautifulSoupParser, LxmlParser, MarketHtmlParser
+
+
+def test_market_page_backends_are_identical(read_fixture):
+    html = read_fixture('market_page.html')
+    listings = BeautifulSoupParser().get_market_listings_from_html(html)
+    assert LxmlParser().get_market_listings_from_html(html) == listings
+    sell_listings = listings['sell_listings']
+    # Sold! listing is skipped
+    assert list(sell_listings) == ['3868053667603823025',
+                                   '3868053667603823026',
+                                   '3868053667603823027']
+    listing = sell_listings['3868053667603823026']
+    assert listing['buyer_pay'] == 1150.09
+    assert listing['you_receive'] == 1000.09
+    assert listing['created_on'].startswith('28 Feb ')
+    assert not listing['need_confirmation']
+    assert sell_listings['3868053667603823027']['need_confirmation']
+    assert listings['buy_orders']['5470862661'] == {
+        'order_id': '5470862661',
+        'quantity': 120,
+        'price': 0.87,
+        'item_name': 'StatTrak™ AK-47 | Redline (Field-Tested)',
+        'item_link': 'https://steamcommunity.com/market/listings/730/'
+                     'StatTrak%E2%84%A2%20AK-47%20%7C%20Redline%20%28'
+                     'Field-Tested%29',
+        'market_hash_name': 'StatTrak™ AK-47 | Redline (Field-Tested)'
+    }
+
+
+def test_render_chunk_backends_are_identical(read_fixture):
+    html = read_fixture('mylistings_render.html')
+    listings = BeautifulSoupParser().get_market_sell_listings_from_api(html)
+    assert LxmlParser().get_market_sell_listings_from_api(html) == listings
+    sell_listings = listings['sell_listings']
+    assert sell_listings['3868053667603823101']['buyer_pay'] == 1234.56
+    assert sell_listings['3868053667603823101']['you_receive'] == 1073.53
+    assert len(sell_listings) == 2
+
+
+def test_empty_render_chunk():
+    for parser in (BeautifulSoupParser(), LxmlParser()):
+        assert parser.get_market_sell_listings_from_api('') == {
+            'sell_listings': {}}
+
+
+def test_parsers_must_implement_both_methods():
+    class PageOnlyParser(MarketHtmlParser):
+
+        def get_market_listings_from_html(self, html: str) -> dict:
+            return {}
+
+    with pytest.raises(TypeError):
+        MarketHtmlParser()
+    with pytest.raises(TypeError):
+        PageOnlyParser()
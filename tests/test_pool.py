@@ -0,0 +1,30 @@
+from steamcom.client import SteamClient
+from steamcom.market import SteamMarket
+from steamcom.pool import AccountPool
+from steamcom.rate_limiter import RateLimiter
+
+
+def test_clients_do_not_share_sessions():
+    assert SteamClient().session is not SteamClient().session
+    assert SteamMarket().session is not SteamMarket().session
+
+
+def test_account_pool_isolates_accounts_and_collects_errors():
+    accounts = [{'username': f'user{i}'} for i in range(5)]
+    with AccountPool(accounts, max_workers=3, pool_maxsize=2,
+                     rate_limiter_factory=lambda: RateLimiter({})) as pool:
+        sessions = {id(client.session) for client in pool}
+        limiters = {id(client.rate_limiter) for client in pool}
+        assert len(sessions) == len(limiters) == 5
+        adapter = pool['user0'].session.get_adapter('https://steamcommunity.com')
+        assert adapter._pool_maxsize == 2
+
+        def work(client: SteamClient) -> str:
+            if client.username == 'user3':
+                raise ValueError('broken account')
+            return client.username.upper()
+
+        results = pool.map(work)
+    assert list(results) == [f'user{i}' for i in range(5)]
+    assert results['user1'].value == 'USER1'
+    assert isinstance(results['user3'].error, ValueError)
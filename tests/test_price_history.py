@@ -0,0 +1,38 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from steamcom.price_history import PriceHistoryStore, parse_price_points
+
+
+GRAPH = [
+    ['Dec 31 2022 23: +0', 99.435, '43'],
+    ['Jan 01 2023 00: +0', 139.317, '270'],
+    ['Jan 01 2023 01: +0', 162.369, '480'],
+]
+
+
+def test_parse_price_points():
+    points = parse_price_points(GRAPH)
+    assert points['timestamp'].tolist() == [1672527600, 1672531200,
+                                            1672534800]
+    assert points['price'].tolist() == [99.435, 139.317, 162.369]
+    assert points['volume'].tolist() == [43, 270, 480]
+
+
+def test_store_appends_only_new_points(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    name = 'StatTrak™ AK-47 | Redline (Field-Tested)'
+    assert len(store.load('730', name)) == 0
+    assert store.append('730', name, parse_price_points(GRAPH[:2])) == 2
+    assert store.append('730', name, parse_price_points(GRAPH)) == 1
+    assert store.append('730', name, parse_price_points(GRAPH)) == 0
+    with open(store.get_path('730', name), 'ab') as file:
+        file.write(b'\0' * 5)  # interrupted write
+    points = store.load('730', name)
+    assert isinstance(points, np.memmap)
+    assert points['volume'].tolist() == [43, 270, 480]
+    new_graph = GRAPH + [['Jan 01 2023 02: +0', 150.0, '7']]
+    assert store.append('730', name, parse_price_points(new_graph)) == 1
+    assert store.get_last_timestamp('730', name) == 1672538400
+    assert store.load('730', name)['price'].tolist()[-1] == 150.0
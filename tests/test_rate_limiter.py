@@ -0,0 +1,30 @@
+from steamcom.rate_limiter import TokenBucket, RateLimiter
+
+
+def test_token_bucket_spends_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert 0.19 < bucket.reserve() <= 0.2
+
+
+def test_rate_limiter_picks_longest_matching_endpoint():
+    inventory = TokenBucket(1)
+    history = TokenBucket(2)
+    market = TokenBucket(3)
+    limiter = RateLimiter({'/inventory/': inventory, '/market/': market,
+                           '/market/myhistory/render/': history})
+    url = 'https://steamcommunity.com/market/myhistory/render/'
+    assert limiter.get_bucket(url) is history
+    url = 'https://steamcommunity.com/inventory/7656/730/2'
+    assert limiter.get_bucket(url) is inventory
+    assert limiter.get_bucket('https://steamcommunity.com/market') is None
+    assert limiter.get_bucket('https://steamcommunity.com/market/') is market
+    assert limiter.reserve('https://store.steampowered.com') == 0
+
+
+def test_rate_limiter_accepts_plain_rates():
+    limiter = RateLimiter({'/inventory/': 0.5}, default=4)
+    assert limiter.budgets['/inventory/'].rate == 0.5
+    assert limiter.default.rate == 4
@@ -0,0 +1,68 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from steamcom.client import SteamClient
+from steamcom.exceptions import SessionIsInvalid
+from steamcom.session_store import SessionStore
+
+
+def make_session(i: int) -> dict:
+    return {'steamid': str(76561199216758000 + i), 'currencyid': 5,
+            'refresh_token': f'token{i}', 'cookies': []}
+
+
+def test_session_store_is_shared_between_threads(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.sqlite3'))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: store.save(f'user{i}', make_session(i)),
+                          range(50)))
+    store.save('user0', make_session(100))
+    assert store.load('user0')['refresh_token'] == 'token100'
+    assert store.load('nobody') is None
+    sessions = store.load_many(['user1', 'user2', 'nobody'])
+    assert sessions == {'user1': make_session(1), 'user2': make_session(2)}
+    store.delete('user1')
+    assert len(SessionStore(store.path).load_many()) == 49
+
+
+class LocalClient(SteamClient):
+
+    def load_session(self, extracted_session: dict) -> None:
+        if extracted_session['refresh_token'] == 'expired':
+            raise SessionIsInvalid()
+        self.refresh_token = extracted_session['refresh_token']
+
+    def login(self) -> None:
+        self.refresh_token = 'fresh'
+
+    def extract_session(self) -> dict:
+        return {'refresh_token': self.refresh_token}
+
+
+def test_login_or_restore_logs_in_only_without_valid_session(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.sqlite3'))
+    store.save('alive', {'refresh_token': 'saved'})
+    store.save('expired', {'refresh_token': 'expired'})
+    assert LocalClient('alive').login_or_restore(store)
+    assert not LocalClient('expired').login_or_restore(store)
+    assert not LocalClient('new').login_or_restore(store)
+    assert store.load('expired') == {'refresh_token': 'fresh'}
+    assert store.load('new') == {'refresh_token': 'fresh'}
+    assert store.load('alive') == {'refresh_token': 'saved'}
+
+
+def test_close_closes_connections_of_all_threads(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.sqlite3'))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: store.save(f'user{i}', make_session(i)),
+                          range(20)))
+    connections = list(store._connections)
+    assert len(connections) > 1
+    store.close()
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute('SELECT 1')
+    assert store.load('user1') == make_session(1)
+    store.close()
@@ -0,0 +1,61 @@
+import contextvars
+from contextlib import contextmanager
+
+from steamcom import tracing
+from steamcom.client import SteamClient
+from steamcom.market import SteamMarket
+from steamcom.transport import FakeTransport
+
+
+class RecordingTracer:
+
+    def __init__(self) -> None:
+        self.spans = []
+        self.current = contextvars.ContextVar('span', default=None)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: dict = None,
+                              **kwargs):
+        self.spans.append((name, self.current.get(), attributes))
+        token = self.current.set(name)
+        try:
+            yield tracing.NoOpSpan()
+        finally:
+            self.current.reset(token)
+
+
+def test_noop_tracer_is_default():
+    with tracing.span('steamcom.test', a=1) as span:
+        span.set_attribute('b', 2)
+    assert isinstance(tracing.get_tracer(), tracing.NoOpTracer)
+
+
+def test_listings_pages_are_nested_in_threads(read_fixture):
+    market_page = read_fixture('market_page.html').replace(
+        '<span id="tabContentsMyActiveMarketListings_total">3</span>',
+        '<span id="tabContentsMyActiveMarketListings_total">1,250</span>')
+    transport = FakeTransport()
+    transport.add('GET', 'https://steamcommunity.com/market', market_page)
+    transport.add('GET', SteamMarket.LISTINGS_URL, {
+        'success': True, 'hovers': '', 'assets': {}, 'results_html': ''})
+    client = SteamClient(transport=transport)
+    market = SteamMarket(session=client.session)
+    market.was_login_executed = True
+    tracer = RecordingTracer()
+    tracing.set_tracer(tracer)
+    try:
+        market.get_my_market_listings(delay=0, concurrency=4)
+    finally:
+        tracing.set_tracer(None)
+    root = 'steamcom.market.get_my_market_listings'
+    assert tracer.spans[0] == (root, None, None)
+    assert ('steamcom.market.get_market_page', root, None) in tracer.spans
+    assert ('steamcom.market.parse_market_page', root, None) in tracer.spans
+    pages = [span for span in tracer.spans
+             if span[0] == 'steamcom.market.listings_page']
+    assert len(pages) == 13
+    assert all(parent == root for _, parent, _ in pages)
+    assert sorted(attributes['start'] for _, _, attributes in pages) == \
+        list(range(3, 1250, 100))
+    assert tracer.spans.count(('steamcom.market.listings_page.parse',
+                               'steamcom.market.listings_page', None)) == 13
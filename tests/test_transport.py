@@ -0,0 +1,48 @@
+import pytest
+
+from steamcom.client import SteamClient
+from steamcom.market import SteamMarket
+from steamcom.transport import (FakeTransport, Http2Transport, create_retry,
+                                get_backoff_time)
+
+
+def test_fake_transport_answers_every_request_of_the_client():
+    transport = FakeTransport()
+    transport.add('GET', 'https://steamcommunity.com/market/',
+                  status_code=500)
+    transport.add('GET', 'https://steamcommunity.com/market/pricehistory/',
+                  {'success': True, 'prices': [['Oct 05 2022 21: +0', 1, '2']]},
+                  headers={'Set-Cookie': 'steamCountry=RU; Path=/'})
+    client = SteamClient(transport=transport)
+    market = SteamMarket(session=client.session)
+    market.was_login_executed = True
+    assert market.get_price_history('730', 'Snakebite Case', raw=True) == \
+        [['Oct 05 2022 21: +0', 1, '2']]
+    assert client.session.cookies.get('steamCountry') == 'RU'
+    assert transport.requests[0].url.startswith(
+        'https://steamcommunity.com/market/pricehistory/?appid=730')
+    assert client.session.get(
+        'https://steamcommunity.com/market/mylistings').status_code == 500
+
+
+def test_only_idempotent_requests_are_retried():
+    retry = create_retry(retries=3, backoff_factor=1)
+    assert retry.is_retry('GET', 503)
+    assert not retry.is_retry('POST', 503)
+    assert get_backoff_time(0, 1) == 0
+    assert all(2 <= get_backoff_time(3, 1) <= 6 for _ in range(100))
+
+
+def test_http2_transport_retries_get():
+    httpx = pytest.importorskip('httpx')
+    statuses = {'GET': [502, 200], 'POST': [502, 200]}
+
+    def handle(request):
+        return httpx.Response(statuses[request.method].pop(0), json={})
+
+    client = SteamClient(transport=Http2Transport(
+        retries=2, backoff_factor=0, transport=httpx.MockTransport(handle)))
+    assert client.session.get('https://steamcommunity.com/market')\
+        .status_code == 200
+    assert client.session.post('https://steamcommunity.com/market')\
+        .status_code == 502
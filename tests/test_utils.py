@@ -0,0 +1,48 @@
+import pytest
+
+from steamcom.models import Asset, DescriptionTable
+from steamcom.utils import merge_items_with_descriptions_from_inventory
+
+
+def make_inventory_response(asset_ids: list) -> dict:
+    return {
+        'assets': [{'appid': 730, 'contextid': '2', 'assetid': asset_id,
+                    'classid': '3604678661', 'instanceid': '0',
+                    'amount': '1'} for asset_id in asset_ids],
+        'descriptions': [{'appid': 730, 'classid': '3604678661',
+                          'instanceid': '0', 'marketable': 1,
+                          'market_hash_name': 'Snakebite Case'}]
+    }
+
+
+def test_inventory_assets_share_description():
+    description_table = DescriptionTable()
+    first_page = merge_items_with_descriptions_from_inventory(
+        make_inventory_response(['1', '2']), '2', description_table)
+    second_page = merge_items_with_descriptions_from_inventory(
+        make_inventory_response(['3']), '2', description_table)
+    assert len(description_table) == 1
+    assert first_page['1'].description is second_page['3'].description
+    asset = first_page['2']
+    assert isinstance(asset, Asset)
+    assert asset == {'appid': 730, 'classid': '3604678661',
+                     'instanceid': '0', 'marketable': 1,
+                     'market_hash_name': 'Snakebite Case',
+                     'contextid': '2', 'id': '2', 'amount': '1'}
+    assert asset['market_hash_name'] == 'Snakebite Case'
+    assert asset.get('tradable') is None
+    assert len(asset) == 8
+    assert not hasattr(asset, '__dict__')
+
+
+def test_asset_to_dict_is_mutable_copy():
+    assets = merge_items_with_descriptions_from_inventory(
+        make_inventory_response(['1', '2']), '2')
+    asset_dict = assets['1'].to_dict()
+    assert type(asset_dict) is dict and asset_dict == assets['1']
+    asset_dict['market_hash_name'] = 'Changed'
+    asset_dict['description'] = 'Own'
+    assert assets['2']['market_hash_name'] == 'Snakebite Case'
+    assert 'description' not in assets['1']
+    with pytest.raises(TypeError):
+        assets['1']['amount'] = '2'